@@ -3,262 +3,334 @@
 import argparse
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Research Engine — AI-assisted research infrastructure",
-        prog="research_engine",
-    )
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
-
-    # extract command
-    extract_parser = subparsers.add_parser(
+def _build_extract(subparsers) -> None:
+    p = subparsers.add_parser(
         "extract", help="Extract citations from a LaTeX project"
     )
-    extract_parser.add_argument(
+    p.add_argument(
         "project_root",
         type=Path,
         help="Root directory of the LaTeX project",
     )
-    extract_parser.add_argument(
+    p.add_argument(
         "--output", "-o",
         type=Path,
         default=None,
         help="Output path for bibliography.json (default: <project_root>/literature/bibliography.json)",
     )
-    extract_parser.add_argument(
+    p.add_argument(
         "--stats-only",
         action="store_true",
         help="Only print stats, don't write output",
     )
 
-    # resolve command
-    resolve_parser = subparsers.add_parser(
+
+def _build_resolve(subparsers) -> None:
+    p = subparsers.add_parser(
         "resolve", help="Resolve missing DOIs via CrossRef"
     )
-    resolve_parser.add_argument(
+    p.add_argument(
         "bibliography",
         type=Path,
         help="Path to bibliography.json",
     )
-    resolve_parser.add_argument(
+    p.add_argument(
         "--dry-run",
         action="store_true",
         help="Preview without saving changes",
     )
-    resolve_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max references to resolve (0 = all)",
     )
-    resolve_parser.add_argument(
+    p.add_argument(
         "--quiet",
         action="store_true",
         help="Suppress progress output",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the CrossRef response cache",
+    )
 
-    # verify command
-    verify_parser = subparsers.add_parser(
+
+def _build_verify(subparsers) -> None:
+    p = subparsers.add_parser(
         "verify", help="Verify DOIs against CrossRef metadata"
     )
-    verify_parser.add_argument(
+    p.add_argument(
         "bibliography",
         type=Path,
         help="Path to bibliography.json",
     )
-    verify_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max references to verify (0 = all)",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the CrossRef record cache (records are reused for up to a day)",
+    )
+
 
-    # harvest command
-    harvest_parser = subparsers.add_parser(
+def _build_harvest(subparsers) -> None:
+    p = subparsers.add_parser(
         "harvest", help="Discover new papers"
     )
-    harvest_parser.add_argument(
+    p.add_argument(
         "--config",
         type=Path,
         default=None,
         help="Path to config.yaml",
     )
 
-    # pre-submit command
-    presubmit_parser = subparsers.add_parser(
+
+def _build_pre_submit(subparsers) -> None:
+    p = subparsers.add_parser(
         "pre-submit", help="Pre-submission citation check"
     )
-    presubmit_parser.add_argument(
+    p.add_argument(
         "tex_file",
         type=Path,
         help="Path to main .tex file",
     )
-    presubmit_parser.add_argument(
+    p.add_argument(
         "--bib",
         type=Path,
         default=None,
         help="Path to bibliography.json",
     )
 
-    # ingest command
-    ingest_parser = subparsers.add_parser(
+
+def _build_ingest(subparsers) -> None:
+    p = subparsers.add_parser(
         "ingest", help="Acquire OA PDFs and extract text"
     )
-    ingest_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory (contains bibliography.json)",
     )
-    ingest_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max references to process (0 = all)",
     )
-    ingest_parser.add_argument(
+    p.add_argument(
         "--paper",
         type=str,
         default=None,
         help="Filter to refs from a specific paper folder (e.g. 'biosystems/40_simulated_geometry')",
     )
-    ingest_parser.add_argument(
+    p.add_argument(
         "--skip-download",
         action="store_true",
         help="Skip OA download, only extract text from existing PDFs",
     )
-    ingest_parser.add_argument(
+    p.add_argument(
         "--upload-b2",
         action="store_true",
         help="Upload acquired PDFs to Backblaze B2",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Text extraction processes (default: one per CPU)",
+    )
+
 
-    # depth2 command
-    depth2_parser = subparsers.add_parser(
+def _build_depth2(subparsers) -> None:
+    p = subparsers.add_parser(
         "depth2", help="Harvest depth-2 references from CrossRef"
     )
-    depth2_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory (contains bibliography.json)",
     )
-    depth2_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max depth-1 refs to harvest from (0 = all)",
     )
+    p.add_argument(
+        "--finalize",
+        action="store_true",
+        help="Merge harvested refs from depth2_refs.jsonl into bibliography.json",
+    )
+
 
-    # enrich command
-    enrich_parser = subparsers.add_parser(
+def _build_enrich(subparsers) -> None:
+    p = subparsers.add_parser(
         "enrich", help="Enrich bibliography with abstracts from OpenAlex"
     )
-    enrich_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory",
     )
-    enrich_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max refs to process (0 = all)",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-query DOIs OpenAlex recently had no abstract for",
+    )
+
 
-    # queue command
-    queue_parser = subparsers.add_parser(
+def _build_queue(subparsers) -> None:
+    p = subparsers.add_parser(
         "queue", help="Generate browser download queue"
     )
-    queue_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory",
     )
-    queue_parser.add_argument(
+    p.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Max entries in queue (0 = all)",
     )
-    queue_parser.add_argument(
+    p.add_argument(
         "--output", "-o",
         type=Path,
         default=None,
         help="Output path for queue JSON (default: data_dir/browser_queue.json)",
     )
 
-    # embed command
-    embed_parser = subparsers.add_parser(
+
+def _build_embed(subparsers) -> None:
+    p = subparsers.add_parser(
         "embed", help="Embed references into vector index"
     )
-    embed_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory",
     )
-    embed_parser.add_argument(
+    p.add_argument(
         "--model",
         type=str,
         default="all-MiniLM-L6-v2",
         help="sentence-transformers model name (default: all-MiniLM-L6-v2)",
     )
-    embed_parser.add_argument(
+    p.add_argument(
         "--batch-size",
         type=int,
         default=256,
         help="Batch size for encoding (default: 256)",
     )
 
-    # search command
-    search_parser = subparsers.add_parser(
+
+def _build_search(subparsers) -> None:
+    p = subparsers.add_parser(
         "search", help="Semantic search over reference embeddings"
     )
-    search_parser.add_argument(
+    p.add_argument(
         "query",
         type=str,
         help="Search query text",
     )
-    search_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory",
     )
-    search_parser.add_argument(
+    p.add_argument(
         "-k",
         type=int,
         default=20,
         help="Number of results (default: 20)",
     )
-    search_parser.add_argument(
+    p.add_argument(
         "--depth",
         type=int,
         default=None,
         help="Filter by depth (1 or 2)",
     )
-    search_parser.add_argument(
+    p.add_argument(
         "--model",
         type=str,
         default="all-MiniLM-L6-v2",
         help="sentence-transformers model name (must match embed model)",
     )
 
-    # status command
-    status_parser = subparsers.add_parser(
+
+def _build_status(subparsers) -> None:
+    p = subparsers.add_parser(
         "status", help="Show pipeline status"
     )
-    status_parser.add_argument(
+    p.add_argument(
         "data_dir",
         type=Path,
         help="Path to literature-data directory",
     )
-    status_parser.add_argument(
+    p.add_argument(
         "--by-paper",
         action="store_true",
         help="Show breakdown by paper",
     )
 
-    args = parser.parse_args()
+
+SUBCOMMANDS = {
+    "extract": _build_extract,
+    "resolve": _build_resolve,
+    "verify": _build_verify,
+    "harvest": _build_harvest,
+    "pre-submit": _build_pre_submit,
+    "ingest": _build_ingest,
+    "depth2": _build_depth2,
+    "enrich": _build_enrich,
+    "queue": _build_queue,
+    "embed": _build_embed,
+    "search": _build_search,
+    "status": _build_status,
+}
+
+
+def _build_parser(commands) -> argparse.ArgumentParser:
+    """Build the top-level parser with subparsers for only the given commands."""
+    parser = argparse.ArgumentParser(
+        description="Research Engine — AI-assisted research infrastructure",
+        prog="research_engine",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    for name in commands:
+        SUBCOMMANDS[name](subparsers)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Only build the requested subcommand's parser; fall back to the full
+    # set for --help, unknown commands, and no-argument invocations.
+    command = argv[0] if argv else None
+    if command in SUBCOMMANDS:
+        parser = _build_parser([command])
+    else:
+        parser = _build_parser(SUBCOMMANDS)
+
+    args = parser.parse_args(argv)
 
     if args.command == "extract":
         from .bib.extract import extract_all, write_output
@@ -276,11 +348,16 @@ def main() -> int:
             dry_run=args.dry_run,
             limit=args.limit,
             verbose=not args.quiet,
+            use_cache=not args.no_cache,
         )
 
     elif args.command == "verify":
         from .bib.verify import verify_main
-        return verify_main(args.bibliography.resolve(), limit=args.limit)
+        return verify_main(
+            args.bibliography.resolve(),
+            limit=args.limit,
+            use_cache=not args.no_cache,
+        )
 
     elif args.command == "harvest":
         from .harvest.cli import discover
@@ -298,9 +375,13 @@ def main() -> int:
             paper_filter=args.paper,
             skip_download=args.skip_download,
             upload_b2=args.upload_b2,
+            workers=args.workers,
         )
 
     elif args.command == "depth2":
+        if args.finalize:
+            from .bib.depth2 import finalize_depth2
+            return finalize_depth2(data_dir=args.data_dir.resolve())
         from .bib.depth2 import harvest_depth2
         return harvest_depth2(
             data_dir=args.data_dir.resolve(),
@@ -313,6 +394,7 @@ def main() -> int:
         enrich_bibliography(
             data_dir=args.data_dir.resolve(),
             limit=args.limit,
+            use_cache=not args.no_cache,
         )
         return 0
 
@@ -0,0 +1,66 @@
+"""On-disk cache for CrossRef responses.
+
+resolve and verify send the same queries on every run: query strings and
+DOIs only change when the bibliography does. Responses are kept in a
+SQLite file next to bibliography.json, so a re-run answers repeat queries
+locally and skips both the network and the rate-limit wait.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from ..jsonio import dumps_line, loads
+
+CACHE_FILE = "crossref_cache.sqlite"
+CACHE_TTL_DAYS = 90
+
+
+def cache_key(*parts: str) -> str:
+    """SHA-1 hex digest of the "|"-joined request parts."""
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """JSON values keyed by cache_key(), expiring after `ttl_days`.
+
+    Safe to share across the worker threads of one process.
+    """
+
+    def __init__(self, path: Path, ttl_days: float = CACHE_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v BLOB, ts INTEGER)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT v, ts FROM cache WHERE k = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value (anything JSON-serializable) under key."""
+        data = dumps_line(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
+                (key, data, int(time.time())),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,23 +1,67 @@
 """Depth-2 reference harvesting via CrossRef.
 
-For each reference with a DOI, queries CrossRef works/{doi} to get
-its cited references. Adds new refs to the bibliography as depth-2 entries.
+For each reference with a DOI, queries CrossRef works (batched via the
+doi filter) to get its cited references. New refs are appended to a
+depth2_refs.jsonl sidecar as they are found (cheap, crash-safe); run with
+finalize to merge them into bibliography.json as depth-2 entries.
 """
 
 import json
 import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-try:
-    import requests
-except ImportError:
-    raise ImportError("'requests' package required. Install with: pip install requests")
+from ..jsonio import dump_json, dumps_line, iter_references, load_json, loads
+from ..net import RateLimiter, get_with_retry, http_errors, make_client
+from .keys import dedup_keys, strip_dedup_keys, title_key
 
 CROSSREF_API = "https://api.crossref.org/works"
 MAILTO = "itod2305@uni.sydney.edu.au"
+USER_AGENT = f"research-engine/0.1.0 (mailto:{MAILTO})"
 RATE_LIMIT_DELAY = 0.12  # ~8 req/sec, stay in polite pool
+BATCH_SIZE = 30  # DOIs per filter query; more risks HTTP 414 (URI too long)
+MAX_WORKERS = 8  # concurrent batch requests, throttled by the shared limiter
+
+DEPTH2_SIDECAR = "depth2_refs.jsonl"
+HARVESTED_LOG = "depth2_harvested.txt"  # one depth-1 DOI per line, append-only
+STATS_FILE = "depth2_stats.json"
+LEGACY_HARVEST_LOG = "depth2_harvest_log.json"
+
+_NON_LOWER = re.compile(r"[^a-z]")
+_NON_ALPHA = re.compile(r"[^a-zA-Z]")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+class _Progress:
+    """Progress line throttled to one write per `interval` seconds.
+
+    Keeps long runs from flushing stdout on every batch when it is piped
+    to a log file.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._next = 0.0
+
+    def update(self, message: str) -> None:
+        now = time.monotonic()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        sys.stdout.write(f"{message}\n")
+        sys.stdout.flush()
+
+
+def _is_ascii_alpha(s: str) -> bool:
+    """True if s is already pure [a-zA-Z], so the regex strip can be skipped.
+
+    Most surnames are; this check runs in C and is several times cheaper
+    than a regex substitution on these short strings.
+    """
+    return s.isascii() and s.isalpha()
 
 
 def _make_cite_key(ref: dict) -> str:
@@ -30,7 +74,8 @@ def _make_cite_key(ref: dict) -> str:
     if author:
         # "Family, Given" or "Family"
         surname = author.split(",")[0].strip().split()[-1].lower()
-        surname = re.sub(r"[^a-z]", "", surname)
+        if not _is_ascii_alpha(surname):
+            surname = _NON_LOWER.sub("", surname)
 
     if not surname:
         # Try from unstructured field
@@ -38,8 +83,10 @@ def _make_cite_key(ref: dict) -> str:
         if unstructured:
             words = unstructured.split()
             for w in words:
-                clean = re.sub(r"[^a-zA-Z]", "", w)
-                if clean and clean[0].isupper() and len(clean) > 2:
+                if len(w) < 3:  # can't clean to a >2-letter surname
+                    continue
+                clean = w if _is_ascii_alpha(w) else _NON_ALPHA.sub("", w)
+                if len(clean) > 2 and clean[0].isupper():
                     surname = clean.lower()
                     break
 
@@ -48,7 +95,7 @@ def _make_cite_key(ref: dict) -> str:
 
     # Extract year
     if not year:
-        year_match = re.search(r"\b(19|20)\d{2}\b", ref.get("unstructured", ""))
+        year_match = _YEAR_RE.search(ref.get("unstructured", ""))
         if year_match:
             year = year_match.group()
 
@@ -72,7 +119,7 @@ def _parse_crossref_reference(ref: dict) -> dict:
         title = unstructured[:200]
 
     if not year:
-        year_match = re.search(r"\b(19|20)\d{2}\b", unstructured)
+        year_match = _YEAR_RE.search(unstructured)
         if year_match:
             year = year_match.group()
 
@@ -103,25 +150,31 @@ def _parse_crossref_reference(ref: dict) -> dict:
 
 def fetch_cited_references(
     doi: str,
-    session: Optional[requests.Session] = None,
+    session: Optional[Any] = None,
+    limiter: Optional[RateLimiter] = None,
 ) -> List[dict]:
     """Fetch references cited by a paper via CrossRef.
 
+    `session` is an httpx Client or requests Session (see net.make_client).
+    Retries 429/5xx responses with backoff before giving up.
+
     Returns list of parsed reference dicts.
     """
-    s = session or requests.Session()
+    s = session or make_client(USER_AGENT)
 
     try:
-        resp = s.get(
+        resp = get_with_retry(
+            s,
             f"{CROSSREF_API}/{doi}",
+            limiter=limiter,
             params={"mailto": MAILTO},
             timeout=15,
         )
         if resp.status_code == 404:
             return []
         resp.raise_for_status()
-        data = resp.json()
-    except (requests.RequestException, json.JSONDecodeError):
+        data = loads(resp.content)
+    except (*http_errors(), json.JSONDecodeError):
         return []
 
     item = data.get("message", {})
@@ -134,6 +187,56 @@ def fetch_cited_references(
     return parsed
 
 
+def fetch_cited_references_batch(
+    dois: List[str],
+    session: Optional[Any] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> Optional[Dict[str, List[dict]]]:
+    """Fetch cited references for up to BATCH_SIZE DOIs in one CrossRef query.
+
+    Uses the works filter endpoint (filter=doi:A,doi:B,...) with
+    select=DOI,reference so one round trip covers the whole batch.
+
+    Returns dict mapping DOI (lowercase) -> list of parsed reference dicts.
+    DOIs unknown to CrossRef are absent from the result. 429/5xx responses
+    are retried with backoff; returns None if the request still failed, so
+    callers can fall back to per-DOI fetch_cited_references().
+    """
+    s = session or make_client(USER_AGENT)
+
+    if not dois:
+        return {}
+    batch = dois[:BATCH_SIZE]
+
+    try:
+        resp = get_with_retry(
+            s,
+            CROSSREF_API,
+            limiter=limiter,
+            params={
+                "filter": ",".join(f"doi:{d}" for d in batch),
+                "select": "DOI,reference",
+                "rows": len(batch),
+                "mailto": MAILTO,
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        data = loads(resp.content)
+    except (*http_errors(), json.JSONDecodeError):
+        return None
+
+    results = {}
+    for item in data.get("message", {}).get("items", []):
+        doi = item.get("DOI", "").lower()
+        if doi:
+            results[doi] = [
+                _parse_crossref_reference(ref) for ref in item.get("reference", [])
+            ]
+
+    return results
+
+
 def harvest_depth2(
     data_dir: Path,
     limit: int = 0,
@@ -141,27 +244,58 @@ def harvest_depth2(
 ) -> int:
     """Harvest depth-2 references for all DOI-resolved refs.
 
+    New refs are appended to depth2_refs.jsonl, not written into
+    bibliography.json; see finalize_depth2().
+
     Args:
         data_dir: Path to literature-data directory
         limit: Max depth-1 refs to process (0 = all)
         verbose: Print progress
     """
     bib_path = data_dir / "bibliography.json"
-    with open(bib_path) as f:
-        data = json.load(f)
 
-    refs = data["references"]
-    depth1_with_doi = [r for r in refs if r.get("doi") and r.get("depth", 1) == 1]
+    # Streaming pass: keep only the dedup keys and the depth-1 refs to
+    # harvest, not every reference dict. bibliography.json itself is only
+    # rewritten by finalize_depth2().
+    #
+    # The DOI/title sets hold hash(key) rather than the key strings: an int
+    # is ~32 bytes against ~100 for a 50-char str, which matters once the
+    # bibliography reaches hundreds of thousands of refs. With 64-bit
+    # hashes a false "duplicate" is vanishingly unlikely (~1e-8 at 1M keys).
+    depth1_with_doi = []
+    existing_dois: Set[int] = set()
+    existing_titles: Set[int] = set()
+    existing_keys = set()
+    # Bound methods hoisted out of the per-ref loop
+    add_key, add_doi, add_title = existing_keys.add, existing_dois.add, existing_titles.add
+    add_depth1 = depth1_with_doi.append
+    for r in iter_references(bib_path):
+        cite_key = r["cite_key"]
+        add_key(cite_key)
+        d_key, t_key = dedup_keys(r)
+        if d_key:
+            add_doi(hash(d_key))
+            if r.get("depth", 1) == 1:
+                add_depth1({"cite_key": cite_key, "doi": r["doi"]})
+        if t_key:
+            add_title(hash(t_key))
+
+    # Refs harvested on earlier runs but not yet finalized count as existing
+    sidecar_path = data_dir / DEPTH2_SIDECAR
+    pending = 0
+    for r in _iter_sidecar(sidecar_path):
+        pending += 1
+        add_key(r["cite_key"])
+        d_key, t_key = dedup_keys(r)
+        if d_key:
+            add_doi(hash(d_key))
+        if t_key:
+            add_title(hash(t_key))
 
     # Track which depth-1 refs we've already harvested
-    harvest_log_path = data_dir / "depth2_harvest_log.json"
-    if harvest_log_path.exists():
-        with open(harvest_log_path) as f:
-            harvest_log = json.load(f)
-    else:
-        harvest_log = {"harvested_dois": [], "stats": {}}
-
-    already_harvested = set(harvest_log["harvested_dois"])
+    harvest_log_path = data_dir / HARVESTED_LOG
+    stats_path = data_dir / STATS_FILE
+    already_harvested = _load_harvested(data_dir)
     to_harvest = [r for r in depth1_with_doi if r["doi"] not in already_harvested]
 
     if limit > 0:
@@ -173,95 +307,214 @@ def harvest_depth2(
         print(f"{'='*60}")
         print(f"  Depth-1 refs with DOI:   {len(depth1_with_doi)}")
         print(f"  Already harvested:       {len(already_harvested)}")
+        print(f"  Pending finalize:        {pending}")
         print(f"  To harvest this run:     {len(to_harvest)}")
 
-    # Build set of existing DOIs for dedup
-    existing_dois = {r["doi"].lower() for r in refs if r.get("doi")}
-    existing_titles = {r.get("title", "").lower()[:50] for r in refs if r.get("title")}
-
-    session = requests.Session()
-    session.headers["User-Agent"] = f"research-engine/0.1.0 (mailto:{MAILTO})"
+    session = make_client(USER_AGENT, pool_size=MAX_WORKERS)
+    limiter = RateLimiter(1 / RATE_LIMIT_DELAY)
 
-    # Use a set for O(1) cite_key uniqueness checks
-    existing_keys = {r["cite_key"] for r in refs}
-
-    new_refs = []
+    def fetch(batch: List[dict]) -> Tuple[Dict[str, List[dict]], bool]:
+        """(cited refs by lowercase DOI, whether the batch query failed)"""
+        cited = fetch_cited_references_batch(
+            [r["doi"] for r in batch], session=session, limiter=limiter,
+        )
+        if cited is not None:
+            return cited, False
+        # One malformed DOI can fail the whole filter query. Per-DOI
+        # requests isolate it; a DOI whose own request fails gets no refs
+        # and is logged like the rest, so it can't stall later runs.
+        return {
+            r["doi"].lower(): fetch_cited_references(r["doi"], session=session, limiter=limiter)
+            for r in batch
+        }, True
+
+    # existing_keys gives O(1) cite_key uniqueness checks; also remember the
+    # next free suffix per base key so common keys (d2_unknown, d2_smith2010)
+    # don't rescan _1, _2, ... on every collision
+    next_suffix: Dict[str, int] = {}
+
+    new_count = 0
+    new_with_doi = 0
     total_raw = 0
     dupes_skipped = 0
+    fallback_batches = 0
+
+    batches = [to_harvest[i:i + BATCH_SIZE] for i in range(0, len(to_harvest), BATCH_SIZE)]
+
+    # A crash mid-write can leave a torn last line; start on a fresh one
+    if sidecar_path.exists() and sidecar_path.stat().st_size:
+        with open(sidecar_path, "rb") as f:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                with open(sidecar_path, "ab") as out:
+                    out.write(b"\n")
+
+    # Requests run concurrently; results are merged here in submission
+    # order so dedup and cite-key suffixes stay deterministic
+    done = 0
+    progress = _Progress()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+            open(sidecar_path, "ab") as sidecar, \
+            open(harvest_log_path, "a", encoding="utf-8") as harvest_log:
+        for batch, (cited_by_doi, fell_back) in zip(batches, executor.map(fetch, batches)):
+            if verbose and done > 0:
+                progress.update(f"  [{done}/{len(to_harvest)}] new refs: {new_count}, "
+                                f"dupes skipped: {dupes_skipped}")
+            done += len(batch)
+
+            fallback_batches += fell_back
+
+            for ref in batch:
+                cited = cited_by_doi.get(ref["doi"].lower(), [])
+                total_raw += len(cited)
+
+                for c in cited:
+                    d_key = c["doi"].lower()
+                    t_key = title_key(c["title"])
+
+                    # Skip if already in bibliography. A DOI is authoritative,
+                    # so the title-prefix check only covers refs without one
+                    if d_key:
+                        if hash(d_key) in existing_dois:
+                            dupes_skipped += 1
+                            continue
+                    elif t_key and hash(t_key) in existing_titles:
+                        dupes_skipped += 1
+                        continue
+
+                    # Make cite key unique (O(1) set lookup instead of O(n) scan)
+                    base_key = c["cite_key"]
+                    if base_key in existing_keys:
+                        counter = next_suffix.get(base_key, 1)
+                        while f"{base_key}_{counter}" in existing_keys:
+                            counter += 1
+                        c["cite_key"] = f"{base_key}_{counter}"
+                        next_suffix[base_key] = counter + 1
+                    add_key(c["cite_key"])
+
+                    # Track the parent ref
+                    c["cited_by"] = ref["cite_key"]
+
+                    sidecar.write(dumps_line(c))
+                    new_count += 1
+
+                    # Update tracking sets (titles too, so later DOI-less
+                    # refs still dedup against this one)
+                    if d_key:
+                        new_with_doi += 1
+                        add_doi(hash(d_key))
+                    if t_key:
+                        add_title(hash(t_key))
+
+            # Log DOIs only once their refs are on disk, so a crash never
+            # marks a DOI harvested without its refs in the sidecar
+            sidecar.flush()
+            for ref in batch:
+                if ref["doi"] not in already_harvested:
+                    already_harvested.add(ref["doi"])
+                    harvest_log.write(ref["doi"] + "\n")
+            harvest_log.flush()
+
+    session.close()
+
+    if not (pending or new_count):
+        sidecar_path.unlink()
 
-    for i, ref in enumerate(to_harvest):
-        if verbose and (i + 1) % 10 == 0:
-            print(f"  [{i+1}/{len(to_harvest)}] new refs: {len(new_refs)}, "
-                  f"dupes skipped: {dupes_skipped}")
+    if verbose:
+        print(f"\n  Total raw references found:    {total_raw}")
+        print(f"  Duplicates skipped:            {dupes_skipped}")
+        print(f"  New depth-2 refs found:        {new_count}")
+        print(f"  With DOIs:                     {new_with_doi}")
+        if fallback_batches:
+            print(f"  Batches fetched per DOI:       {fallback_batches}")
 
-        time.sleep(RATE_LIMIT_DELAY)
+    dump_json({
+        "total_harvested": len(already_harvested),
+        "total_raw_refs": total_raw,
+        "total_new_refs": new_count,
+        "dupes_skipped": dupes_skipped,
+    }, stats_path)
 
-        cited = fetch_cited_references(ref["doi"], session=session)
-        total_raw += len(cited)
+    if verbose:
+        print(f"\n  {pending + new_count} depth-2 refs pending in {sidecar_path}")
+        print(f"  Harvest log at {harvest_log_path}")
+        print("  Run with --finalize to merge them into bibliography.json")
 
-        for c in cited:
-            # Skip if already in bibliography
-            if c.get("doi") and c["doi"].lower() in existing_dois:
-                dupes_skipped += 1
-                continue
-            if c.get("title") and c["title"].lower()[:50] in existing_titles:
-                dupes_skipped += 1
-                continue
+    return 0
 
-            # Make cite key unique (O(1) set lookup instead of O(n) scan)
-            base_key = c["cite_key"]
-            counter = 1
-            while c["cite_key"] in existing_keys:
-                c["cite_key"] = f"{base_key}_{counter}"
-                counter += 1
-            existing_keys.add(c["cite_key"])
 
-            # Track the parent ref
-            c["cited_by"] = ref["cite_key"]
+def _load_harvested(data_dir: Path) -> Set[str]:
+    """Load the set of already-harvested depth-1 DOIs.
 
-            new_refs.append(c)
+    Migrates the old depth2_harvest_log.json (a JSON list rewritten every
+    run) to the append-only depth2_harvested.txt on first use.
+    """
+    log_path = data_dir / HARVESTED_LOG
+    if log_path.exists():
+        return set(log_path.read_text(encoding="utf-8").split())
+
+    legacy_path = data_dir / LEGACY_HARVEST_LOG
+    if not legacy_path.exists():
+        return set()
+    legacy = load_json(legacy_path)
+    harvested = set(legacy.get("harvested_dois", []))
+    log_path.write_text("".join(f"{d}\n" for d in sorted(harvested)), encoding="utf-8")
+    if legacy.get("stats"):
+        dump_json(legacy["stats"], data_dir / STATS_FILE)
+    legacy_path.unlink()
+    return harvested
+
+
+def _iter_sidecar(sidecar_path: Path):
+    """Yield refs from the depth-2 sidecar, skipping a torn final line."""
+    if not sidecar_path.exists():
+        return
+    with open(sidecar_path, "rb") as f:
+        for line in f:
+            try:
+                yield loads(line)
+            except json.JSONDecodeError:
+                continue
 
-            # Update tracking sets
-            if c.get("doi"):
-                existing_dois.add(c["doi"].lower())
-            if c.get("title"):
-                existing_titles.add(c["title"].lower()[:50])
 
-        harvest_log["harvested_dois"].append(ref["doi"])
+def finalize_depth2(data_dir: Path, verbose: bool = True) -> int:
+    """Merge depth2_refs.jsonl into bibliography.json and clear the sidecar.
 
-    if verbose:
-        print(f"\n  Total raw references found:    {total_raw}")
-        print(f"  Duplicates skipped:            {dupes_skipped}")
-        print(f"  New depth-2 refs added:        {len(new_refs)}")
-        print(f"  With DOIs:                     {sum(1 for r in new_refs if r.get('doi'))}")
+    This is the only step that rewrites the full bibliography.
+    """
+    bib_path = data_dir / "bibliography.json"
+    sidecar_path = data_dir / DEPTH2_SIDECAR
+
+    new_refs = list(_iter_sidecar(sidecar_path))
+    if not new_refs:
+        if verbose:
+            print("No pending depth-2 refs to finalize.")
+        return 0
+
+    data = load_json(bib_path)
+    refs = data["references"]
 
     # Add new refs to bibliography
-    # Mark existing refs as depth 1 if not already marked
+    # Mark existing refs as depth 1 if not already marked, and drop the
+    # dedup keys older versions stored on refs
     for r in refs:
         if "depth" not in r:
             r["depth"] = 1
+        strip_dedup_keys(r)
+    for r in new_refs:
+        strip_dedup_keys(r)
 
     refs.extend(new_refs)
     data["references"] = refs
     data["metadata"]["total_references"] = len(refs)
     data["metadata"]["depth2_references"] = sum(1 for r in refs if r.get("depth") == 2)
 
-    # Save
-    with open(bib_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    harvest_log["stats"] = {
-        "total_harvested": len(harvest_log["harvested_dois"]),
-        "total_raw_refs": total_raw,
-        "total_new_refs": len(new_refs),
-        "dupes_skipped": dupes_skipped,
-    }
-    with open(harvest_log_path, "w", encoding="utf-8") as f:
-        json.dump(harvest_log, f, indent=2, ensure_ascii=False)
+    # Save (serialized in one go, then written with a single write call)
+    dump_json(data, bib_path)
+    sidecar_path.unlink()
 
     if verbose:
-        print(f"\n  Bibliography now has {len(refs)} total references")
-        print(f"  Saved to {bib_path}")
-        print(f"  Harvest log at {harvest_log_path}")
+        print(f"Merged {len(new_refs)} depth-2 refs into {bib_path}")
+        print(f"Bibliography now has {len(refs)} total references")
 
     return 0
@@ -9,16 +9,119 @@ Handles two citation formats:
 2. External: .bib files with @article{key, ...}, @book{key, ...}, etc.
 """
 
-import json
+import mmap
 import os
 import re
-from dataclasses import asdict, dataclass, field
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
 from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
 
+from ..jsonio import dump_json
 
-@dataclass
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+# google-re2 (linear-time DFA) for the patterns run over whole files, where
+# a non-greedy DOTALL scan can backtrack badly on big inputs. Those patterns
+# use inline flags, which both engines accept.
+try:
+    import re2 as _file_re
+except ImportError:
+    _file_re = re
+
+# ---------------------------------------------------------------------------
+# Patterns (compiled once; the parsers run them per ref)
+# ---------------------------------------------------------------------------
+
+_RE_WS = re.compile(r"\s+")
+
+# LaTeX stripping: one alternation per call site, applied in a single pass.
+# Unwrapping \textit{X} to X and then deleting all braces comes to the same
+# thing as deleting the command name, so wrappers match just the command;
+# the lookahead leaves a \textit with no braced argument alone.
+_WRAPPER = r"\\(?:textit|textbf|emph)(?=\{[^}]*\})"
+_HREF = r"\\href\{[^}]*\}\{[^}]*\}"
+_MARKUP_REPL = {"\\&": "&", "~": " "}
+
+# normalized_title(): drop every command and markup character
+_RE_TITLE_MARKUP = re.compile(r"\\[a-zA-Z]+|[{}$\\]")
+# _parse_bibitem_body(): drop links and wrappers, unescape \& and ~
+_RE_BIBITEM_MARKUP = re.compile(
+    rf"{_HREF}|\\url\{{[^}}]*\}}|{_WRAPPER}|\\&|~|[{{}}]"
+)
+# Author list before a ``quoted title'': italics are dropped with their text
+_RE_AUTHORS_MARKUP = re.compile(r"\\textit\{[^}]*\}|~|[{}]")
+# Venue after a ``quoted title''
+_RE_VENUE_MARKUP = re.compile(
+    rf"{_HREF}|\\(?:textit|textbf)(?=\{{[^}}]*\}})|[{{}}]"
+)
+
+# .bib parsing
+_RE_BIB_ENTRY = _file_re.compile(r"(?i)@(\w+)\s*\{([^,\s]+)\s*,")
+_RE_BIB_ENTRY_BYTES = _file_re.compile(rb"(?i)@(\w+)\s*\{([^,\s]+)\s*,")
+_RE_BIB_FIELD = re.compile(r"(\w+)\s*=\s*")
+_RE_BRACE_CHAR = re.compile(r"(\{)|\}")
+_RE_BRACE_CHAR_BYTES = re.compile(rb"(\{)|\}")
+_RE_BIB_BARE_END = re.compile(r"[,\s}]")
+_RE_OUTER_BRACES = re.compile(r"^\{(.*)\}$")
+_RE_ARXIV_NOTE = re.compile(r"arXiv[:\s]*(\d{4}\.\d{4,5})")
+
+# \bibitem parsing
+_RE_THEBIBLIOGRAPHY = _file_re.compile(
+    r"(?s)\\begin\{thebibliography\}.*?\n(.*?)\\end\{thebibliography\}"
+)
+_RE_BIBITEM = re.compile(r"\\bibitem\{([^}]+)\}")
+_RE_END_BIBLIOGRAPHY = re.compile(r"\\end\{thebibliography\}.*", re.DOTALL)
+# DOI, URL and arXiv ID in one scan. Each alternative is a lookahead, so
+# matches never consume text another kind needs (a DOI inside \href{...})
+# and the first hit of each kind is exactly what a separate search finds.
+# They start with different characters, so only one can match at a position.
+_RE_METADATA = re.compile(
+    r"(?=[dDhH\\aA])(?:"
+    r"(?=(?i:doi[:\s]*|https?://doi\.org/)(?P<doi>[0-9]+\.[^\s}]+))"
+    r"|(?=\\(?:url|href)\{(?P<url>[^}]+)\})"
+    r"|(?=(?i:arXiv[:\s]*(?:preprint\s*)?(?:arXiv:)?(?P<arxiv>\d{4}\.\d{4,5}|[a-z-]+/\d{7})))"
+    r")"
+)
+_RE_BACKTICK_TITLE = re.compile(r"``(.*?)(?:,\s*)?''")
+_RE_JVPY = re.compile(r"^(.*?)\s+(\d+),\s*([\d\-\u2013]+)\s*\((\d{4})\)")
+_RE_PAREN_YEAR = re.compile(r"\((\d{4})\)")
+_RE_APA = re.compile(r"^(.*?)\s*\((\d{4}(?:,\s*in press)?)\)\.\s*(.*?)$", re.DOTALL)
+_RE_MED = re.compile(
+    r"^(.*?)\.\s+(.*?)\.\s+(.*?)\s+((?:19|20)\d{2})\s*;\s*(\d+)\s*:\s*([\d\-\u2013]+)"
+)
+_RE_MED_BOOK = re.compile(r"^(.*?)\.\s+(.*?)\.\s+(.*?):\s*(.*?);\s*((?:19|20)\d{2})\.")
+_RE_PHYSICS = re.compile(r"\((\d{4})\)\s*\.?\s*$")
+_RE_PHYSICS_AUTHORS = re.compile(
+    r"^((?:[A-Z]\.\s*(?:[A-Z]\.\s*)?[A-Za-z\-\']+(?:\s+(?:et\s+al\.?|and\s+[A-Z]\.))?(?:,\s*)?)+),\s*(.*)"
+)
+_RE_MID_YEAR = re.compile(r",\s*((?:19|20)\d{2})\b")
+_RE_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+_RE_ITALIC = re.compile(r"\\(?:textit|emph)\{([^}]+)\}")
+_RE_INITIALS = re.compile(r"[A-Z]\.\s*[A-Z]")
+_RE_CAPITALIZED = re.compile(r"[A-Z][a-z]+")
+_RE_SENTENCE_END = re.compile(r"\.\s+")
+_RE_JOURNAL_VOL_PAGES = re.compile(r"^(.*?),\s*(\d+)(?:\((\d+)\))?,\s*([\d\-\u2013]+)")
+_RE_JOURNAL_PAGES = re.compile(r"^(.*?),\s*([\d\-\u2013]+)\s*$")
+_RE_TRAILING_VOL_PAGES = re.compile(r",\s*(\d+),\s*([\d\-\u2013]+)\s*$")
+
+# .tex scanning
+_RE_BIBLIOGRAPHY_CMD = _file_re.compile(r"\\bibliography\{([^}]+)\}")
+_RE_CITE = _file_re.compile(r"\\(?:cite[tp]?|nocite)\{([^}]+)\}")
+
+
+# __slots__ (Python 3.10+) drops the per-instance __dict__ on the thousands
+# of Reference objects a large project produces
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Reference:
     """A single bibliographic reference extracted from .tex or .bib."""
 
@@ -40,18 +143,24 @@ class Reference:
     arxiv_id: str = ""
     alternate_keys: List[str] = field(default_factory=list)
     source_files: List[str] = field(default_factory=list)
+    # (title, normalized title) memo for normalized_title; not serialized
+    _normalized: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def normalized_title(self) -> str:
-        """Title stripped of LaTeX markup and lowercased for dedup."""
-        t = self.title
-        t = re.sub(r"\\textit\{([^}]*)\}", r"\1", t)
-        t = re.sub(r"\\textbf\{([^}]*)\}", r"\1", t)
-        t = re.sub(r"\\emph\{([^}]*)\}", r"\1", t)
-        t = re.sub(r"\{([^}]*)\}", r"\1", t)
-        t = re.sub(r"\\[a-zA-Z]+", "", t)
-        t = re.sub(r"[{}$\\]", "", t)
-        t = re.sub(r"\s+", " ", t).strip().lower()
+        """Title stripped of LaTeX markup and lowercased for dedup.
+
+        Memoized against the title it was computed from, so a title set
+        later (by the parsers or merge_from()) is picked up automatically.
+        """
+        cached = self._normalized
+        if cached is not None and cached[0] is self.title:
+            return cached[1]
+        t = _RE_TITLE_MARKUP.sub("", self.title)
+        t = _RE_WS.sub(" ", t).strip().lower()
+        self._normalized = (self.title, t)
         return t
 
     def merge_from(self, other: "Reference") -> None:
@@ -72,28 +181,73 @@ class Reference:
                 setattr(self, f, theirs)
 
 
+def read_source(path: Path) -> str:
+    """Read a .tex/.bib file as text, like read_text(errors="replace").
+
+    read_bytes() skips the TextIOWrapper and its incremental decoder; the
+    newline translation read_text() would do is applied only when needed.
+    """
+    text = path.read_bytes().decode("utf-8", "replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+_REF_FIELDS = tuple(f.name for f in fields(Reference) if not f.name.startswith("_"))
+
+
 # ---------------------------------------------------------------------------
 # BibTeX (.bib) parser
 # ---------------------------------------------------------------------------
 
 
-def parse_bib_file(path: Path) -> List[Reference]:
-    """Parse a .bib file into Reference objects."""
-    text = path.read_text(encoding="utf-8", errors="replace")
-    refs = []
+# .bib files at least this large are scanned through mmap
+MMAP_MIN_BYTES = 256 * 1024
 
-    entry_starts = list(
-        re.finditer(r"@(\w+)\s*\{([^,\s]+)\s*,", text, re.IGNORECASE)
-    )
 
-    for match in entry_starts:
-        entry_type = match.group(1).lower()
-        cite_key = match.group(2).strip()
+def _decode_source(data: bytes) -> str:
+    """Decode a slice of a source file the way read_source() would."""
+    text = data.decode("utf-8", "replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
-        body = _extract_braced_body(text, match.start())
-        if body is None:
-            continue
 
+def _iter_bib_entries(path: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (entry_type, cite_key, body) for each entry in a .bib file.
+
+    Large files are mapped and scanned with bytes patterns, so only the
+    entry bodies are decoded rather than the whole file.
+    """
+    size = path.stat().st_size
+    if size < MMAP_MIN_BYTES:
+        text = read_source(path)
+        if "@" not in text:
+            return
+        for match in _RE_BIB_ENTRY.finditer(text):
+            body = _extract_braced_body(text, match.start())
+            if body is not None:
+                yield match.group(1).lower(), match.group(2).strip(), body
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in _RE_BIB_ENTRY_BYTES.finditer(mm):
+            brace_pos = mm.find(b"{", match.start())
+            end = _matching_brace(mm, brace_pos, _RE_BRACE_CHAR_BYTES)
+            if end == -1:
+                continue
+            yield (
+                _decode_source(match.group(1)).lower(),
+                _decode_source(match.group(2)).strip(),
+                _decode_source(mm[brace_pos + 1 : end]),
+            )
+
+
+def parse_bib_file(path: Path) -> List[Reference]:
+    """Parse a .bib file into Reference objects."""
+    refs = []
+
+    for entry_type, cite_key, body in _iter_bib_entries(path):
         ref = Reference(
             cite_key=cite_key,
             entry_type=entry_type,
@@ -119,7 +273,7 @@ def parse_bib_file(path: Path) -> List[Reference]:
             ref.arxiv_id = eprint
         elif not ref.arxiv_id:
             note = fields.get("note", "")
-            arxiv_match = re.search(r"arXiv[:\s]*(\d{4}\.\d{4,5})", note)
+            arxiv_match = _RE_ARXIV_NOTE.search(note)
             if arxiv_match:
                 ref.arxiv_id = arxiv_match.group(1)
 
@@ -128,67 +282,78 @@ def parse_bib_file(path: Path) -> List[Reference]:
     return refs
 
 
+def _matching_brace(text, open_pos: int, brace_re=_RE_BRACE_CHAR) -> int:
+    """Index of the "}" closing the "{" at open_pos, or -1 if unbalanced.
+
+    Jumps between brace characters with a compiled regex instead of
+    stepping through every character in Python. Pass _RE_BRACE_CHAR_BYTES
+    to scan bytes or an mmap.
+    """
+    depth = 0
+    for m in brace_re.finditer(text, open_pos):
+        if m.lastindex:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return m.start()
+    return -1
+
+
 def _extract_braced_body(text: str, start: int) -> Optional[str]:
     """Extract content between matched braces starting from position."""
     brace_pos = text.find("{", start)
     if brace_pos == -1:
         return None
 
-    depth = 0
-    for i in range(brace_pos, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                return text[brace_pos + 1 : i]
-    return None
+    end = _matching_brace(text, brace_pos)
+    if end == -1:
+        return None
+    return text[brace_pos + 1 : end]
 
 
 def _parse_bib_fields(body: str) -> Dict[str, str]:
-    """Parse field = {value} or field = "value" or field = number from bib body."""
+    """Parse field = {value} or field = "value" or field = number from bib body.
+
+    Searches run at absolute offsets into body, so no suffix copy is made
+    per field.
+    """
     fields: Dict[str, str] = {}
+    n = len(body)
 
     pos = 0
-    while pos < len(body):
-        field_match = re.search(r"(\w+)\s*=\s*", body[pos:])
+    while pos < n:
+        field_match = _RE_BIB_FIELD.search(body, pos)
         if not field_match:
             break
 
         field_name = field_match.group(1).lower()
-        value_start = pos + field_match.end()
+        value_start = field_match.end()
 
-        if value_start >= len(body):
+        if value_start >= n:
             break
 
         char = body[value_start]
         if char == "{":
-            depth = 0
-            end = value_start
-            for i in range(value_start, len(body)):
-                if body[i] == "{":
-                    depth += 1
-                elif body[i] == "}":
-                    depth -= 1
-                    if depth == 0:
-                        end = i
-                        break
+            end = _matching_brace(body, value_start)
+            if end == -1:
+                end = value_start
             value = body[value_start + 1 : end]
             pos = end + 1
         elif char == '"':
             end = body.find('"', value_start + 1)
             if end == -1:
-                end = len(body)
+                end = n
             value = body[value_start + 1 : end]
             pos = end + 1
         else:
-            end_match = re.search(r"[,\s}]", body[value_start:])
+            end_match = _RE_BIB_BARE_END.search(body, value_start)
             if end_match:
-                value = body[value_start : value_start + end_match.start()]
-                pos = value_start + end_match.start()
+                value = body[value_start : end_match.start()]
+                pos = end_match.start()
             else:
                 value = body[value_start:]
-                pos = len(body)
+                pos = n
 
         fields[field_name] = value.strip()
         pos = max(pos, value_start + 1)
@@ -200,8 +365,8 @@ def _clean_bib_value(value: str) -> str:
     """Clean a BibTeX field value."""
     if not value:
         return ""
-    value = re.sub(r"^\{(.*)\}$", r"\1", value.strip())
-    value = re.sub(r"\s+", " ", value).strip()
+    value = _RE_OUTER_BRACES.sub(r"\1", value.strip())
+    value = _RE_WS.sub(" ", value).strip()
     return value
 
 
@@ -212,23 +377,27 @@ def _clean_bib_value(value: str) -> str:
 
 def parse_bibitem_block(tex_path: Path) -> List[Reference]:
     """Extract references from \\begin{thebibliography} blocks in a .tex file."""
-    text = tex_path.read_text(encoding="utf-8", errors="replace")
+    return parse_bibitem_text(read_source(tex_path), tex_path)
+
+
+def parse_bibitem_text(text: str, tex_path: Path) -> List[Reference]:
+    """parse_bibitem_block() on already-read file contents."""
     refs = []
+    # Plain substring search is far cheaper than the DOTALL block regex,
+    # and most .tex files in a project have no embedded bibliography
+    if "\\begin{thebibliography}" not in text:
+        return refs
 
-    bib_blocks = re.findall(
-        r"\\begin\{thebibliography\}.*?\n(.*?)\\end\{thebibliography\}",
-        text,
-        re.DOTALL,
-    )
+    bib_blocks = _RE_THEBIBLIOGRAPHY.findall(text)
 
     for block in bib_blocks:
-        items = re.split(r"\\bibitem\{([^}]+)\}", block)
+        items = _RE_BIBITEM.split(block)
 
         for i in range(1, len(items) - 1, 2):
             cite_key = items[i].strip()
             body = items[i + 1].strip()
 
-            body = re.sub(r"\\end\{thebibliography\}.*", "", body, flags=re.DOTALL)
+            body = _RE_END_BIBLIOGRAPHY.sub("", body)
             body = body.strip()
 
             ref = Reference(
@@ -246,74 +415,48 @@ def parse_bibitem_block(tex_path: Path) -> List[Reference]:
 
 def _parse_bibitem_body(ref: Reference, body: str) -> None:
     """Parse an unstructured bibitem text into structured fields."""
-    # Extract DOI
-    doi_match = re.search(
-        r"(?:doi[:\s]*|https?://doi\.org/)([0-9]+\.[^\s}]+)", body, re.IGNORECASE
-    )
-    if doi_match:
-        ref.doi = doi_match.group(1).rstrip(".")
-
-    # Extract URL
-    url_match = re.search(r"\\(?:url|href)\{([^}]+)\}", body)
-    if url_match:
-        ref.url = url_match.group(1)
-
-    # Extract arXiv ID
-    arxiv_match = re.search(
-        r"arXiv[:\s]*(?:preprint\s*)?(?:arXiv:)?(\d{4}\.\d{4,5}|[a-z-]+/\d{7})",
-        body,
-        re.IGNORECASE,
-    )
-    if arxiv_match:
-        ref.arxiv_id = arxiv_match.group(1)
+    # Extract DOI, URL and arXiv ID (first of each)
+    found: Dict[str, str] = {}
+    for m in _RE_METADATA.finditer(body):
+        kind = m.lastgroup
+        if kind not in found:
+            found[kind] = m.group(kind)
+            if len(found) == 3:
+                break
+    if "doi" in found:
+        ref.doi = found["doi"].rstrip(".")
+    if "url" in found:
+        ref.url = found["url"]
+    if "arxiv" in found:
+        ref.arxiv_id = found["arxiv"]
 
     # Backtick-quoted title (PRL/physics style)
-    backtick_match = re.search(r"``(.*?)(?:,\s*)?''", body)
+    backtick_match = _RE_BACKTICK_TITLE.search(body)
     if backtick_match:
         ref.title = backtick_match.group(1).strip()
         before_title = body[: backtick_match.start()].strip().rstrip(",").strip()
-        before_title = re.sub(r"~", " ", before_title)
-        before_title = re.sub(r"\\textit\{[^}]*\}", "", before_title)
-        before_title = re.sub(r"[{}]", "", before_title)
-        before_title = re.sub(r"\s+", " ", before_title).strip()
+        before_title = _strip_authors_markup(before_title)
         if before_title:
             ref.authors = before_title
         after_title = body[backtick_match.end() :].strip()
-        after_clean = re.sub(r"\\textit\{([^}]*)\}", r"\1", after_title)
-        after_clean = re.sub(r"\\textbf\{([^}]*)\}", r"\1", after_clean)
-        after_clean = re.sub(r"\\href\{[^}]*\}\{[^}]*\}", "", after_clean)
-        after_clean = re.sub(r"[{}]", "", after_clean)
-        after_clean = re.sub(r"\s+", " ", after_clean).strip()
-        jvpy = re.match(
-            r"^(.*?)\s+(\d+),\s*([\d\-\u2013]+)\s*\((\d{4})\)", after_clean
-        )
+        after_clean = _strip_venue_markup(after_title)
+        jvpy = _RE_JVPY.match(after_clean)
         if jvpy:
             ref.journal = jvpy.group(1).strip().rstrip(",")
             ref.volume = jvpy.group(2)
             ref.pages = jvpy.group(3).replace("\u2013", "--")
             ref.year = jvpy.group(4)
         else:
-            year_m = re.search(r"\((\d{4})\)", after_clean)
+            year_m = _RE_PAREN_YEAR.search(after_clean)
             if year_m:
                 ref.year = year_m.group(1)
         return
 
     # Strip LaTeX for parsing
-    clean = body
-    clean = re.sub(r"\\href\{[^}]*\}\{[^}]*\}", "", clean)
-    clean = re.sub(r"\\url\{[^}]*\}", "", clean)
-    clean = re.sub(r"\\textit\{([^}]*)\}", r"\1", clean)
-    clean = re.sub(r"\\textbf\{([^}]*)\}", r"\1", clean)
-    clean = re.sub(r"\\emph\{([^}]*)\}", r"\1", clean)
-    clean = re.sub(r"\\&", "&", clean)
-    clean = re.sub(r"~", " ", clean)
-    clean = re.sub(r"[{}]", "", clean)
-    clean = re.sub(r"\s+", " ", clean).strip()
+    clean = _strip_bibitem_markup(body)
 
     # APA style: Author(s) (year). Title. Journal...
-    apa = re.match(
-        r"^(.*?)\s*\((\d{4}(?:,\s*in press)?)\)\.\s*(.*?)$", clean, re.DOTALL
-    )
+    apa = _RE_APA.match(clean)
     if apa:
         ref.authors = apa.group(1).strip().rstrip(",").rstrip(".")
         ref.year = apa.group(2).strip()
@@ -321,10 +464,7 @@ def _parse_bibitem_body(ref: Reference, body: str) -> None:
         return
 
     # Medical style: Author. Title. Journal year;vol:pages.
-    med_match = re.match(
-        r"^(.*?)\.\s+(.*?)\.\s+(.*?)\s+((?:19|20)\d{2})\s*;\s*(\d+)\s*:\s*([\d\-\u2013]+)",
-        clean,
-    )
+    med_match = _RE_MED.match(clean)
     if med_match:
         ref.authors = med_match.group(1).strip()
         ref.title = med_match.group(2).strip()
@@ -335,10 +475,7 @@ def _parse_bibitem_body(ref: Reference, body: str) -> None:
         return
 
     # Medical book style
-    med_book = re.match(
-        r"^(.*?)\.\s+(.*?)\.\s+(.*?):\s*(.*?);\s*((?:19|20)\d{2})\.",
-        clean,
-    )
+    med_book = _RE_MED_BOOK.match(clean)
     if med_book:
         ref.authors = med_book.group(1).strip()
         ref.title = med_book.group(2).strip()
@@ -347,15 +484,12 @@ def _parse_bibitem_body(ref: Reference, body: str) -> None:
         return
 
     # Physics style: Author, Title, Journal vol, pages (year).
-    physics = re.search(r"\((\d{4})\)\s*\.?\s*$", clean)
+    physics = _RE_PHYSICS.search(clean)
     if physics:
         ref.year = physics.group(1)
         before_year = clean[: physics.start()].strip().rstrip(",").rstrip(".")
 
-        author_title_split = re.match(
-            r"^((?:[A-Z]\.\s*(?:[A-Z]\.\s*)?[A-Za-z\-\']+(?:\s+(?:et\s+al\.?|and\s+[A-Z]\.))?(?:,\s*)?)+),\s*(.*)",
-            before_year,
-        )
+        author_title_split = _RE_PHYSICS_AUTHORS.match(before_year)
         if author_title_split:
             ref.authors = author_title_split.group(1).strip().rstrip(",")
             _parse_title_and_journal(ref, author_title_split.group(2).strip())
@@ -373,7 +507,7 @@ def _parse_bibitem_body(ref: Reference, body: str) -> None:
         return
 
     # Physics math style: year in middle
-    mid_year = re.search(r",\s*((?:19|20)\d{2})\b", clean)
+    mid_year = _RE_MID_YEAR.search(clean)
     if mid_year:
         ref.year = mid_year.group(1)
         before_year = clean[: mid_year.start()].strip()
@@ -384,43 +518,60 @@ def _parse_bibitem_body(ref: Reference, body: str) -> None:
         return
 
     # Fallback
-    year_match = re.search(r"\b(19|20)\d{2}\b", clean)
+    year_match = _RE_YEAR.search(clean)
     if year_match:
         ref.year = year_match.group(0)
 
-    italic_match = re.search(r"\\(?:textit|emph)\{([^}]+)\}", body)
+    italic_match = _RE_ITALIC.search(body)
     if italic_match:
         candidate = italic_match.group(1)
         if len(candidate) > 10:
             ref.title = candidate
 
 
+def _markup_repl(match: "re.Match[str]") -> str:
+    return _MARKUP_REPL.get(match.group(), "")
+
+
+def _strip_bibitem_markup(text: str) -> str:
+    """Strip LaTeX from a bibitem body in one pass, collapsing whitespace."""
+    return _RE_WS.sub(" ", _RE_BIBITEM_MARKUP.sub(_markup_repl, text)).strip()
+
+
+def _strip_authors_markup(text: str) -> str:
+    return _RE_WS.sub(" ", _RE_AUTHORS_MARKUP.sub(_markup_repl, text)).strip()
+
+
+def _strip_venue_markup(text: str) -> str:
+    return _RE_WS.sub(" ", _RE_VENUE_MARKUP.sub("", text)).strip()
+
+
 def _looks_like_author(text: str) -> bool:
     """Heuristic: does this look like author name(s)?"""
-    if re.search(r"[A-Z]\.\s*[A-Z]", text):
+    if _RE_INITIALS.search(text):
         return True
     if "et al" in text.lower():
         return True
-    if len(text) < 80 and re.search(r"[A-Z][a-z]+", text):
+    if len(text) < 80 and _RE_CAPITALIZED.search(text):
         return True
     return False
 
 
 def _parse_title_and_journal(ref: Reference, text: str) -> None:
     """Split remainder into title and journal/publication info."""
-    parts = re.split(r"\.\s+", text, maxsplit=1)
+    parts = _RE_SENTENCE_END.split(text, maxsplit=1)
     if len(parts) == 2:
         ref.title = parts[0].strip()
         journal_part = parts[1].strip()
 
-        jvp = re.match(r"^(.*?),\s*(\d+)(?:\((\d+)\))?,\s*([\d\-\u2013]+)", journal_part)
+        jvp = _RE_JOURNAL_VOL_PAGES.match(journal_part)
         if jvp:
             ref.journal = jvp.group(1).strip()
             ref.volume = jvp.group(2)
             ref.number = jvp.group(3) or ""
             ref.pages = jvp.group(4).replace("\u2013", "--")
         else:
-            jp = re.match(r"^(.*?),\s*([\d\-\u2013]+)\s*$", journal_part)
+            jp = _RE_JOURNAL_PAGES.match(journal_part)
             if jp:
                 ref.journal = jp.group(1).strip()
                 ref.pages = jp.group(2).replace("\u2013", "--")
@@ -429,7 +580,7 @@ def _parse_title_and_journal(ref: Reference, text: str) -> None:
     elif len(parts) == 1:
         ref.title = text.strip()
 
-    vol_match = re.search(r",\s*(\d+),\s*([\d\-\u2013]+)\s*$", ref.title)
+    vol_match = _RE_TRAILING_VOL_PAGES.search(ref.title)
     if vol_match:
         ref.volume = vol_match.group(1)
         ref.pages = vol_match.group(2).replace("\u2013", "--")
@@ -443,10 +594,16 @@ def _parse_title_and_journal(ref: Reference, text: str) -> None:
 
 def find_bib_references(tex_path: Path) -> List[Path]:
     """Find .bib files referenced by \\bibliography{} commands in a .tex file."""
-    text = tex_path.read_text(encoding="utf-8", errors="replace")
+    return find_bib_references_text(read_source(tex_path), tex_path)
+
+
+def find_bib_references_text(text: str, tex_path: Path) -> List[Path]:
+    """find_bib_references() on already-read file contents."""
     bib_paths = []
+    if "\\bibliography{" not in text:
+        return bib_paths
 
-    for match in re.finditer(r"\\bibliography\{([^}]+)\}", text):
+    for match in _RE_BIBLIOGRAPHY_CMD.finditer(text):
         names = match.group(1).split(",")
         for name in names:
             name = name.strip()
@@ -461,10 +618,12 @@ def find_bib_references(tex_path: Path) -> List[Path]:
 
 def extract_cite_keys(tex_path: Path) -> Set[str]:
     """Extract all citation keys used in a .tex file."""
-    text = tex_path.read_text(encoding="utf-8", errors="replace")
+    text = read_source(tex_path)
     keys: Set[str] = set()
+    if "cite" not in text:  # \cite, \citet, \citep, \nocite
+        return keys
 
-    for match in re.finditer(r"\\(?:cite[tp]?|nocite)\{([^}]+)\}", text):
+    for match in _RE_CITE.finditer(text):
         for key in match.group(1).split(","):
             key = key.strip()
             if key and key != "*":
@@ -478,10 +637,91 @@ def extract_cite_keys(tex_path: Path) -> Set[str]:
 # ---------------------------------------------------------------------------
 
 
-def _title_similarity(a: str, b: str) -> float:
+TITLE_SIMILARITY_THRESHOLD = 0.85
+
+
+def _titles_similar(a: str, b: str) -> bool:
+    """True if the titles' similarity ratio exceeds the threshold.
+
+    Uses rapidfuzz (C++, bails out once the cutoff is unreachable) when
+    installed. Otherwise SequenceMatcher: real_quick_ratio() and
+    quick_ratio() are cheap upper bounds on ratio(), so most non-matching
+    pairs are rejected without the full diff.
+    """
     if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+        return False
+    if a == b:  # common (same work under two keys); SequenceMatcher won't shortcut it
+        return True
+    if fuzz is not None:
+        cutoff = TITLE_SIMILARITY_THRESHOLD * 100
+        return fuzz.ratio(a, b, score_cutoff=cutoff) > cutoff
+    sm = SequenceMatcher(None, a, b, autojunk=True)
+    return (
+        sm.real_quick_ratio() > TITLE_SIMILARITY_THRESHOLD
+        and sm.quick_ratio() > TITLE_SIMILARITY_THRESHOLD
+        and sm.ratio() > TITLE_SIMILARITY_THRESHOLD
+    )
+
+
+# Year buckets with more groups than this switch from a linear probe to
+# MinHash LSH candidate lookup (when datasketch is installed)
+LSH_MIN_GROUPS = 2000
+LSH_NUM_PERM = 128
+LSH_BANDS = (32, 4)  # 32 bands x 4 rows: catches 3-gram Jaccard >~0.4
+
+
+@lru_cache(maxsize=None)
+def _datasketch():
+    """Import datasketch on first use (it pulls in scipy), or None."""
+    try:
+        import datasketch
+    except ImportError:
+        return None
+    return datasketch
+
+
+def _title_minhash(title: str):
+    mh = _datasketch().MinHash(num_perm=LSH_NUM_PERM)
+    shingles = {title[i : i + 3] for i in range(max(len(title) - 2, 1))}
+    mh.update_batch([s.encode("utf-8") for s in shingles])
+    return mh
+
+
+class _TitleIndex:
+    """Title groups for one year, searched in creation order.
+
+    Small indexes compare a title against every group. Past LSH_MIN_GROUPS
+    they switch to MinHash LSH, which returns a short candidate list whose
+    members are then checked with _titles_similar() as before; the earliest
+    matching group still wins.
+    """
+
+    def __init__(self) -> None:
+        self.groups: List[Tuple[str, str]] = []  # (normalized title, group key)
+        self._lsh = None
+
+    def place(self, title: str, new_key: str) -> str:
+        """Return the key of the group `title` belongs to, creating one if needed."""
+        if self._lsh is None:
+            for existing_title, group_key in self.groups:
+                if _titles_similar(title, existing_title):
+                    return group_key
+            mh = None
+        else:
+            mh = _title_minhash(title)
+            for i in sorted(self._lsh.query(mh)):
+                existing_title, group_key = self.groups[i]
+                if _titles_similar(title, existing_title):
+                    return group_key
+
+        self.groups.append((title, new_key))
+        if self._lsh is not None:
+            self._lsh.insert(len(self.groups) - 1, mh)
+        elif len(self.groups) > LSH_MIN_GROUPS and _datasketch() is not None:
+            self._lsh = _datasketch().MinHashLSH(num_perm=LSH_NUM_PERM, params=LSH_BANDS)
+            for i, (existing_title, _) in enumerate(self.groups):
+                self._lsh.insert(i, _title_minhash(existing_title))
+        return new_key
 
 
 def _merge_group(group: List[Reference]) -> Reference:
@@ -512,29 +752,23 @@ def deduplicate(refs: List[Reference]) -> List[Reference]:
     for group in key_groups.values():
         pass1.append(_merge_group(group))
 
-    # Pass 2: group by fuzzy title + year
+    # Pass 2: group by fuzzy title + year. Groups only ever match within the
+    # same year, so each ref is compared against that year's groups only
     title_groups: Dict[str, List[Reference]] = {}
+    indexes: Dict[str, _TitleIndex] = {}
     ungrouped: List[Reference] = []
 
     for ref in pass1:
-        if not ref.normalized_title:
+        title = ref.normalized_title
+        if not title:
             ungrouped.append(ref)
             continue
 
-        key = f"{ref.normalized_title}|{ref.year}"
-        placed = False
-
-        for group_key in list(title_groups.keys()):
-            existing_title, existing_year = group_key.rsplit("|", 1)
-            if ref.year == existing_year and _title_similarity(
-                ref.normalized_title, existing_title
-            ) > 0.85:
-                title_groups[group_key].append(ref)
-                placed = True
-                break
-
-        if not placed:
-            title_groups[key] = [ref]
+        index = indexes.get(ref.year)
+        if index is None:
+            index = indexes[ref.year] = _TitleIndex()
+        group_key = index.place(title, f"{title}|{ref.year}")
+        title_groups.setdefault(group_key, []).append(ref)
 
     merged: List[Reference] = []
     for group in title_groups.values():
@@ -559,6 +793,71 @@ def deduplicate(refs: List[Reference]) -> List[Reference]:
 # Main extraction pipeline
 # ---------------------------------------------------------------------------
 
+PARALLEL_MIN_FILES = 8  # below this, process startup costs more than it saves
+
+_T = TypeVar("_T")
+
+
+def _map_files(func: Callable[[Path], _T], paths: List[Path]) -> List[_T]:
+    """Apply a per-file parser to paths, in order, across processes if worth it.
+
+    The parsers are regex-bound pure Python, so threads would serialize on
+    the GIL.
+    """
+    if len(paths) < PARALLEL_MIN_FILES:
+        return [func(p) for p in paths]
+    with ProcessPoolExecutor() as executor:
+        chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+        return list(executor.map(func, paths, chunksize=chunksize))
+
+
+
+SKIP_DIRS = {
+    ".git", "__pycache__", "node_modules", ".devcontainer", "archive", "tools",
+}
+
+
+def _find_sources(project_root: Path) -> Tuple[List[Path], List[Path]]:
+    """Collect (.tex files, .bib files) under project_root in one walk.
+
+    Uses os.scandir directly so file/dir classification comes from the
+    cached DirEntry. Files come out in os.walk order (a directory's files,
+    then its subdirectories); like os.walk, symlinked dirs aren't entered.
+    """
+    tex_files: List[Path] = []
+    bib_files: List[Path] = []
+
+    def visit(dir_path: str) -> None:
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            return
+        subdirs = []
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in SKIP_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".tex"):
+                    tex_files.append(Path(entry.path))
+                elif entry.name.endswith(".bib"):
+                    bib_files.append(Path(entry.path))
+        for subdir in subdirs:
+            visit(subdir)
+
+    visit(str(project_root))
+    return tex_files, bib_files
+
+
+def _scan_tex(tex_path: Path) -> Tuple[List[Reference], List[Path]]:
+    """Read a .tex file once; return its bibitem refs and linked .bib files."""
+    text = read_source(tex_path)
+    return parse_bibitem_text(text, tex_path), find_bib_references_text(text, tex_path)
+
 
 def extract_all(project_root: Path) -> Tuple[List[Reference], Dict]:
     """Walk a project tree and extract all references.
@@ -567,7 +866,6 @@ def extract_all(project_root: Path) -> Tuple[List[Reference], Dict]:
         (references, stats)
     """
     all_refs: List[Reference] = []
-    tex_files: List[Path] = []
     bib_files_seen: Set[str] = set()
     stats = {
         "tex_files_scanned": 0,
@@ -582,66 +880,87 @@ def extract_all(project_root: Path) -> Tuple[List[Reference], Dict]:
         "papers_with_refs": {},
     }
 
-    skip_dirs = {
-        ".git", "__pycache__", "node_modules", ".devcontainer", "archive", "tools",
-    }
+    tex_files, all_bibs = _find_sources(project_root)
+    tex_files.sort()
 
-    for root, dirs, files in os.walk(project_root):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fname in files:
-            if fname.endswith(".tex"):
-                tex_files.append(Path(root) / fname)
+    # Each .tex file is read once, by a worker, for both its bibitem refs and
+    # its \bibliography links. The .bib files then get a second fan-out.
+    # Results are assembled in the same order as a serial scan, which dedup
+    # relies on.
+    tex_results = _map_files(_scan_tex, tex_files)
 
-    for tex_path in sorted(tex_files):
+    linked_bibs: List[List[Path]] = []  # per tex file, first sighting only
+    for _, bib_paths in tex_results:
+        new_bibs = []
+        for bib_path in bib_paths:
+            bib_key = str(bib_path.resolve())
+            if bib_key not in bib_files_seen:
+                bib_files_seen.add(bib_key)
+                new_bibs.append(bib_path)
+        linked_bibs.append(new_bibs)
+
+    # Also scan orphan .bib files
+    orphan_bibs: List[Path] = []
+    for bib_path in all_bibs:
+        bib_key = str(bib_path.resolve())
+        if bib_key not in bib_files_seen:
+            bib_files_seen.add(bib_key)
+            orphan_bibs.append(bib_path)
+
+    bib_files = [b for bibs in linked_bibs for b in bibs] + orphan_bibs
+    bibtex_results = dict(zip(bib_files, _map_files(parse_bib_file, bib_files)))
+
+    for tex_path, (bibitem_refs, _), new_bibs in zip(tex_files, tex_results, linked_bibs):
         stats["tex_files_scanned"] += 1
         rel_path = tex_path.relative_to(project_root)
 
-        bibitem_refs = parse_bibitem_block(tex_path)
         if bibitem_refs:
             all_refs.extend(bibitem_refs)
             stats["bibitem_refs_found"] += len(bibitem_refs)
             stats["papers_with_refs"][str(rel_path)] = len(bibitem_refs)
 
-        for bib_path in find_bib_references(tex_path):
-            bib_key = str(bib_path.resolve())
-            if bib_key not in bib_files_seen:
-                bib_files_seen.add(bib_key)
-                bibtex_refs = parse_bib_file(bib_path)
-                all_refs.extend(bibtex_refs)
-                stats["bib_files_scanned"] += 1
-                stats["bibtex_refs_found"] += len(bibtex_refs)
-                rel_bib = bib_path.relative_to(project_root)
-                stats["papers_with_refs"][str(rel_bib)] = len(bibtex_refs)
+        for bib_path in new_bibs:
+            bibtex_refs = bibtex_results[bib_path]
+            all_refs.extend(bibtex_refs)
+            stats["bib_files_scanned"] += 1
+            stats["bibtex_refs_found"] += len(bibtex_refs)
+            rel_bib = bib_path.relative_to(project_root)
+            stats["papers_with_refs"][str(rel_bib)] = len(bibtex_refs)
 
-    # Also scan orphan .bib files
-    for root, dirs, files in os.walk(project_root):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fname in files:
-            if fname.endswith(".bib"):
-                bib_path = Path(root) / fname
-                bib_key = str(bib_path.resolve())
-                if bib_key not in bib_files_seen:
-                    bib_files_seen.add(bib_key)
-                    bibtex_refs = parse_bib_file(bib_path)
-                    all_refs.extend(bibtex_refs)
-                    stats["bib_files_scanned"] += 1
-                    stats["bibtex_refs_found"] += len(bibtex_refs)
+    for bib_path in orphan_bibs:
+        bibtex_refs = bibtex_results[bib_path]
+        all_refs.extend(bibtex_refs)
+        stats["bib_files_scanned"] += 1
+        stats["bibtex_refs_found"] += len(bibtex_refs)
 
     stats["total_before_dedup"] = len(all_refs)
     all_refs = deduplicate(all_refs)
     stats["total_after_dedup"] = len(all_refs)
 
+    with_doi = with_arxiv = with_title = 0
     for ref in all_refs:
         if ref.doi:
-            stats["with_doi"] += 1
+            with_doi += 1
         if ref.arxiv_id:
-            stats["with_arxiv"] += 1
+            with_arxiv += 1
         if ref.title:
-            stats["with_title"] += 1
+            with_title += 1
+    stats["with_doi"] = with_doi
+    stats["with_arxiv"] = with_arxiv
+    stats["with_title"] = with_title
 
     return all_refs, stats
 
 
+def _ref_to_dict(ref: Reference) -> dict:
+    """Shallow field dict for JSON output.
+
+    dataclasses.asdict() deep-copies every field; nothing here is nested
+    and the dict is serialized straight away, so a shallow copy will do.
+    """
+    return {name: getattr(ref, name) for name in _REF_FIELDS}
+
+
 def write_output(refs: List[Reference], stats: Dict, output_path: Path) -> None:
     """Write bibliography.json and missing_dois.json."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -655,11 +974,12 @@ def write_output(refs: List[Reference], stats: Dict, output_path: Path) -> None:
             "tex_files_scanned": stats["tex_files_scanned"],
             "bib_files_scanned": stats["bib_files_scanned"],
         },
-        "references": [asdict(r) for r in sorted(refs, key=lambda r: r.cite_key)],
+        "references": [
+            _ref_to_dict(r) for r in sorted(refs, key=lambda r: r.cite_key)
+        ],
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    dump_json(output_data, output_path)
 
     print(f"\nWrote {len(refs)} references to {output_path}")
 
@@ -670,6 +990,5 @@ def write_output(refs: List[Reference], stats: Dict, output_path: Path) -> None:
         for r in refs
         if not r.doi and r.title
     ]
-    with open(missing_doi_path, "w", encoding="utf-8") as f:
-        json.dump(missing, f, indent=2, ensure_ascii=False)
+    dump_json(missing, missing_doi_path)
     print(f"Wrote {len(missing)} refs needing DOI resolution to {missing_doi_path}")
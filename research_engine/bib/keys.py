@@ -0,0 +1,32 @@
+"""Normalized DOI/title keys used to dedup references.
+
+Keys are always derived from a ref's current `doi` and `title`. Lowering a
+DOI and a 50-char title prefix is cheap, and a stored copy goes stale as
+soon as anything else edits bibliography.json. Older versions stored them
+as `_doi_lc` / `_title_key`; strip_dedup_keys() removes those fields when
+the bibliography is rewritten.
+"""
+
+from typing import Tuple
+
+STORED_KEY_FIELDS = ("_doi_lc", "_title_key")  # written by older versions
+
+
+def title_key(title: str) -> str:
+    """Dedup key for a title: first 50 chars, lowercased.
+
+    Slicing before lowering avoids lowercasing 200-char unstructured blobs.
+    """
+    return title[:50].lower()
+
+
+def dedup_keys(ref: dict) -> Tuple[str, str]:
+    """Return (doi_lc, title_key) for a ref dict."""
+    return (ref.get("doi") or "").lower(), title_key(ref.get("title") or "")
+
+
+def strip_dedup_keys(ref: dict) -> dict:
+    """Remove dedup keys stored by older versions from a ref dict (in place)."""
+    for field in STORED_KEY_FIELDS:
+        ref.pop(field, None)
+    return ref
@@ -5,9 +5,10 @@ Checks DOI coverage, broken references, duplicate citations, missing fields.
 """
 
 import json
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional
+
+from .extract import extract_cite_keys
 
 
 def pre_submit_main(tex_path: Path, bib_path: Optional[Path] = None) -> int:
@@ -40,28 +41,34 @@ def pre_submit_main(tex_path: Path, bib_path: Optional[Path] = None) -> int:
                 refs_by_key[alt_key] = ref
 
     # Extract cite keys from .tex file
-    text = tex_path.read_text(encoding="utf-8", errors="replace")
-    cited_keys: Set[str] = set()
-    for match in re.finditer(r"\\(?:cite[tp]?|nocite)\{([^}]+)\}", text):
-        for key in match.group(1).split(","):
-            key = key.strip()
-            if key and key != "*":
-                cited_keys.add(key)
+    cited_keys = extract_cite_keys(tex_path)
 
     issues: List[str] = []
     warnings: List[str] = []
 
     # Check 1: Missing references (cited but not in bibliography)
-    missing = cited_keys - set(refs_by_key.keys())
+    missing = cited_keys - refs_by_key.keys()
     if missing:
         issues.append(f"MISSING REFERENCES ({len(missing)}):")
         for key in sorted(missing):
             issues.append(f"  \\cite{{{key}}} — not found in bibliography")
 
+    # One pass over the cited refs collects what checks 2-4 need
+    cited_refs = list(map(refs_by_key.__getitem__, cited_keys & refs_by_key.keys()))
+    without_doi: List[Dict] = []
+    no_title: List[Dict] = []
+    doi_to_keys: Dict[str, List[str]] = {}
+    for r in cited_refs:
+        doi = r.get("doi")
+        if doi:
+            doi_to_keys.setdefault(doi, []).append(r["cite_key"])
+        else:
+            without_doi.append(r)
+        if not r.get("title"):
+            no_title.append(r)
+    with_doi = len(cited_refs) - len(without_doi)
+
     # Check 2: DOI coverage for cited references
-    cited_refs = [refs_by_key[k] for k in cited_keys if k in refs_by_key]
-    with_doi = sum(1 for r in cited_refs if r.get("doi"))
-    without_doi = [r for r in cited_refs if not r.get("doi")]
 
     if without_doi:
         pct = 100 * with_doi // max(len(cited_refs), 1)
@@ -74,17 +81,12 @@ def pre_submit_main(tex_path: Path, bib_path: Optional[Path] = None) -> int:
             warnings.append(f"  ... and {len(without_doi) - 10} more")
 
     # Check 3: Missing titles
-    no_title = [r for r in cited_refs if not r.get("title")]
     if no_title:
         issues.append(f"MISSING TITLES ({len(no_title)}):")
         for r in no_title:
             issues.append(f"  {r['cite_key']}")
 
     # Check 4: Duplicate citations (same DOI cited with different keys)
-    doi_to_keys: Dict[str, List[str]] = {}
-    for r in cited_refs:
-        if r.get("doi"):
-            doi_to_keys.setdefault(r["doi"], []).append(r["cite_key"])
     duplicates = {doi: keys for doi, keys in doi_to_keys.items() if len(keys) > 1}
     if duplicates:
         warnings.append(f"DUPLICATE CITATIONS ({len(duplicates)}):")
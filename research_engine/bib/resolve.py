@@ -3,46 +3,109 @@ DOI resolver for bibliography databases.
 
 Queries CrossRef API to find DOIs for references that don't have them.
 Rate-limited to the "polite pool" (50 req/sec with mailto header).
+Queries run concurrently on a thread pool sharing one rate limiter.
 """
 
+import functools
 import json
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from ..jsonio import dump_json, dumps_line, iter_references, load_json, loads
+from ..net import RateLimiter, get_with_retry, http_errors, make_client
+from .cache import CACHE_FILE, ResponseCache, cache_key
+from .keys import strip_dedup_keys
 
 try:
-    import requests
+    from rapidfuzz import fuzz
 except ImportError:
-    raise ImportError("'requests' package required. Install with: pip install requests")
+    fuzz = None
 
 CROSSREF_API = "https://api.crossref.org/works"
 MAILTO = "itod2305@uni.sydney.edu.au"
-RATE_LIMIT_DELAY = 0.1  # 10 req/sec
+USER_AGENT = f"research-engine/0.1.0 (mailto:{MAILTO})"
+RATE_LIMIT = 45  # req/sec, just under the polite pool's 50
+MAX_WORKERS = 20  # queries in flight at once, throttled by the shared limiter
+RESOLUTION_JOURNAL = "doi_resolution.jsonl"  # resolved DOIs not yet merged
+
+_RE_TEX_CMD = re.compile(r"\\[a-zA-Z]+\{([^}]*)\}")
+_RE_TEX_CHARS = re.compile(r"[{}$\\]")
+_RE_WS = re.compile(r"\s+")
+_RE_INITIALS_FIRST = re.compile(r"[A-Z]\.\s")
+_RE_INITIAL = re.compile(r"^[A-Z]\.$")
 
 
 def clean_for_query(text: str) -> str:
     """Clean a string for use in CrossRef API queries."""
-    text = re.sub(r"\\[a-zA-Z]+\{([^}]*)\}", r"\1", text)
-    text = re.sub(r"[{}$\\]", "", text)
-    text = re.sub(r"--", "-", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _RE_TEX_CMD.sub(r"\1", text)
+    text = _RE_TEX_CHARS.sub("", text)
+    text = text.replace("--", "-")
+    text = _RE_WS.sub(" ", text).strip()
     return text
 
 
+def title_similarity(a: str, b: str, cutoff: float = 0.0) -> float:
+    """Similarity of two titles in [0, 1], or 0.0 if below `cutoff`.
+
+    rapidfuzz's ratio (C++) when installed, else SequenceMatcher.ratio().
+    Identical titles return 1.0 without a diff. With a cutoff, pairs that
+    can't reach it are rejected early: rapidfuzz stops once the cutoff is
+    unreachable, and SequenceMatcher checks its cheap upper bounds
+    (length-based real_quick_ratio(), then quick_ratio()) first.
+    """
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return fuzz.ratio(a, b, score_cutoff=cutoff * 100) / 100.0
+    sm = SequenceMatcher(None, a, b)
+    if cutoff and (sm.real_quick_ratio() < cutoff or sm.quick_ratio() < cutoff):
+        return 0.0
+    return sm.ratio()
+
+
+@functools.lru_cache(maxsize=8192)
+def _extract_surname(authors: str) -> str:
+    """First author's surname from a BibTeX author string, or "" if unusable.
+
+    Cached: the same author strings recur across many refs.
+    """
+    clean_auth = clean_for_query(authors)
+    surname = ""
+    if "," in clean_auth:
+        surname = clean_auth.split(",")[0].strip()
+    elif _RE_INITIALS_FIRST.match(clean_auth):
+        parts = clean_auth.split()
+        for p in parts:
+            if not _RE_INITIAL.match(p) and len(p) > 2:
+                surname = p
+                break
+    else:
+        surname = clean_auth.split()[0] if clean_auth else ""
+
+    return surname if len(surname) > 2 else ""
+
+
 def query_crossref(
     title: str,
     authors: str = "",
     year: str = "",
-    session: Optional[requests.Session] = None,
+    session: Optional[Any] = None,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    surname: Optional[str] = None,
 ) -> Optional[Dict]:
     """Query CrossRef for a reference and return the best match.
 
+    `session` is an httpx Client or requests Session (see net.make_client).
+    429/5xx responses are retried with backoff. With a `cache`, a query
+    seen before is answered from disk without a request. `surname` skips
+    extracting it from `authors` when the caller already has it.
+
     Returns dict with: doi, cr_title, cr_year, score, cr_authors, or None.
     """
-    s = session or requests.Session()
-
     clean_title = clean_for_query(title)
     if not clean_title:
         return None
@@ -53,31 +116,28 @@ def query_crossref(
         "mailto": MAILTO,
     }
 
-    if authors:
-        clean_auth = clean_for_query(authors)
-        surname = ""
-        if "," in clean_auth:
-            surname = clean_auth.split(",")[0].strip()
-        elif re.match(r"[A-Z]\.\s", clean_auth):
-            parts = clean_auth.split()
-            for p in parts:
-                if not re.match(r"^[A-Z]\.$", p) and len(p) > 2:
-                    surname = p
-                    break
-        else:
-            surname = clean_auth.split()[0] if clean_auth else ""
-
-        if surname and len(surname) > 2:
-            params["query.author"] = surname
-
-    try:
-        resp = s.get(CROSSREF_API, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-    except (requests.RequestException, json.JSONDecodeError):
-        return None
+    if surname is None:
+        surname = _extract_surname(authors) if authors else ""
+    if surname:
+        params["query.author"] = surname
+
+    key = cache_key("query", clean_title, params.get("query.author", ""))
+    items = cache.get(key) if cache else None
+    if items is None:
+        s = session or make_client(USER_AGENT)
+        try:
+            resp = get_with_retry(
+                s, CROSSREF_API, limiter=limiter, params=params, timeout=15
+            )
+            resp.raise_for_status()
+            data = loads(resp.content)
+        except (*http_errors(), json.JSONDecodeError):
+            return None
+
+        items = data.get("message", {}).get("items", [])[:3]
+        if cache:
+            cache.put(key, items)
 
-    items = data.get("message", {}).get("items", [])
     if not items:
         return None
 
@@ -92,9 +152,10 @@ def query_crossref(
         )
         cr_doi = item.get("DOI", "")
 
-        title_sim = SequenceMatcher(
-            None, clean_title.lower(), cr_title.lower()
-        ).ratio()
+        # Below 0.65 even the year bonus can't lift a match to 0.80
+        title_sim = title_similarity(
+            clean_title.lower(), cr_title.lower(), cutoff=0.65
+        )
 
         year_bonus = 0.15 if year and cr_year == year else 0.0
         score = title_sim + year_bonus
@@ -134,12 +195,20 @@ def _extract_cr_authors(item: Dict) -> str:
 
 def resolve_batch(
     refs: List[Dict],
-    session: requests.Session,
+    session: Any,
     limit: int = 0,
     verbose: bool = True,
+    cache: Optional[ResponseCache] = None,
+    journal: Optional[IO[bytes]] = None,
 ) -> Tuple[Dict, Dict]:
     """Resolve DOIs for a batch of references.
 
+    Each resolution is appended to `journal` (one JSON line, flushed) as
+    soon as it is known, so an interrupted run can be resumed.
+
+    Up to MAX_WORKERS queries are in flight at once; all of them share one
+    RateLimiter, so the batch as a whole stays under RATE_LIMIT.
+
     Returns:
         (resolved_keys, stats) where resolved_keys maps cite_key -> {doi, confidence, score}
     """
@@ -172,44 +241,55 @@ def resolve_batch(
               f"{stats['skipped_no_title']} have no title)")
 
     resolved_keys = {}
+    limiter = RateLimiter(RATE_LIMIT)
 
-    for i, ref in enumerate(to_resolve):
-        stats["attempted"] += 1
-
-        if verbose and (i + 1) % 25 == 0:
-            print(f"  [{i+1}/{total}] resolved: {stats['resolved']}, "
-                  f"not found: {stats['not_found']}")
+    surnames = [_extract_surname(ref.get("authors", "")) for ref in to_resolve]
 
-        time.sleep(RATE_LIMIT_DELAY)
-
-        result = query_crossref(
+    def query(ref: Dict, surname: str) -> Optional[Dict]:
+        return query_crossref(
             title=ref["title"],
             authors=ref.get("authors", ""),
             year=ref.get("year", ""),
             session=session,
+            limiter=limiter,
+            cache=cache,
+            surname=surname,
         )
 
-        if result is None:
-            stats["not_found"] += 1
-            continue
-
-        if result["score"] >= 0.90:
-            resolved_keys[ref["cite_key"]] = {
+    # Queries run concurrently; results are consumed in submission order
+    # so stats and progress lines match a serial run
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(query, to_resolve, surnames)
+        for i, (ref, result) in enumerate(zip(to_resolve, results)):
+            stats["attempted"] += 1
+
+            if verbose and (i + 1) % 25 == 0:
+                print(f"  [{i+1}/{total}] resolved: {stats['resolved']}, "
+                      f"not found: {stats['not_found']}")
+
+            if result is None:
+                stats["not_found"] += 1
+                continue
+
+            if result["score"] >= 0.90:
+                confidence = "high"
+            elif result["score"] >= 0.80:
+                confidence = "medium"
+                stats["ambiguous"] += 1
+            else:
+                stats["not_found"] += 1
+                continue
+
+            info = {
                 "doi": result["doi"],
-                "confidence": "high",
+                "confidence": confidence,
                 "score": result["score"],
             }
+            resolved_keys[ref["cite_key"]] = info
             stats["resolved"] += 1
-        elif result["score"] >= 0.80:
-            resolved_keys[ref["cite_key"]] = {
-                "doi": result["doi"],
-                "confidence": "medium",
-                "score": result["score"],
-            }
-            stats["resolved"] += 1
-            stats["ambiguous"] += 1
-        else:
-            stats["not_found"] += 1
+            if journal is not None:
+                journal.write(dumps_line({"cite_key": ref["cite_key"], **info}))
+                journal.flush()
 
     return resolved_keys, stats
 
@@ -219,24 +299,61 @@ def resolve_main(
     dry_run: bool = False,
     limit: int = 0,
     verbose: bool = True,
+    use_cache: bool = True,
 ) -> int:
-    """Main entry point for DOI resolution."""
+    """Main entry point for DOI resolution.
+
+    CrossRef responses are cached in CACHE_FILE next to the bibliography
+    unless use_cache is False.
+
+    Resolutions are journaled to RESOLUTION_JOURNAL while queries run and
+    merged into bibliography.json at the end. A run that was interrupted
+    leaves the journal behind; the next run applies it first and only
+    queries what is still unresolved. The full bibliography is loaded only
+    for the final merge; the query phase streams just the fields it needs.
+    """
     if not bibliography_path.exists():
         print(f"Error: {bibliography_path} not found. Run extract first.")
         return 1
 
-    with open(bibliography_path) as f:
-        data = json.load(f)
-
+    journal_path = bibliography_path.parent / RESOLUTION_JOURNAL
+    resumed = _load_journal(journal_path)
+    if verbose and resumed:
+        print(f"Resuming: {len(resumed)} DOIs from an interrupted run ({journal_path.name})")
+
+    query_refs = []
+    for r in iter_references(bibliography_path):
+        key = r["cite_key"]
+        query_refs.append({
+            "cite_key": key,
+            "title": r.get("title", ""),
+            "authors": r.get("authors", ""),
+            "year": r.get("year", ""),
+            "doi": resumed[key]["doi"] if key in resumed else r.get("doi", ""),
+        })
+
+    session = make_client(USER_AGENT, pool_size=MAX_WORKERS)
+    cache = ResponseCache(bibliography_path.parent / CACHE_FILE) if use_cache else None
+    if dry_run:
+        resolved_keys, stats = resolve_batch(
+            query_refs, session, limit=limit, verbose=verbose, cache=cache
+        )
+    else:
+        _end_with_newline(journal_path)
+        with open(journal_path, "ab") as journal:
+            resolved_keys, stats = resolve_batch(
+                query_refs, session, limit=limit, verbose=verbose, cache=cache,
+                journal=journal,
+            )
+    session.close()
+    if cache:
+        cache.close()
+    del query_refs
+    resolved_keys = {**resumed, **resolved_keys}
+
+    data = load_json(bibliography_path)
     refs = data["references"]
 
-    session = requests.Session()
-    session.headers["User-Agent"] = f"research-engine/0.1.0 (mailto:{MAILTO})"
-
-    resolved_keys, stats = resolve_batch(
-        refs, session, limit=limit, verbose=verbose
-    )
-
     # Apply resolved DOIs
     updated = 0
     for ref in refs:
@@ -244,6 +361,7 @@ def resolve_main(
         if key in resolved_keys:
             ref["doi"] = resolved_keys[key]["doi"]
             updated += 1
+        strip_dedup_keys(ref)
 
     data["metadata"]["with_doi"] = sum(1 for r in refs if r.get("doi"))
     data["metadata"]["doi_resolution"] = {
@@ -276,13 +394,12 @@ def resolve_main(
             print(f"  ... and {len(resolved_keys) - 20} more")
         return 0
 
-    with open(bibliography_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    dump_json(data, bibliography_path)
+    journal_path.unlink()
     print(f"\nUpdated {updated} references in {bibliography_path}")
 
     log_path = bibliography_path.parent / "doi_resolution_log.json"
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(resolved_keys, f, indent=2, ensure_ascii=False)
+    dump_json(resolved_keys, log_path)
     print(f"Resolution log saved to {log_path}")
 
     missing_path = bibliography_path.parent / "missing_dois.json"
@@ -292,8 +409,31 @@ def resolve_main(
         for r in refs
         if not r.get("doi") and r.get("title")
     ]
-    with open(missing_path, "w", encoding="utf-8") as f:
-        json.dump(missing, f, indent=2, ensure_ascii=False)
+    dump_json(missing, missing_path)
     print(f"Updated {missing_path} ({len(missing)} refs still need DOIs)")
 
     return 0
+
+
+def _load_journal(journal_path: Path) -> Dict[str, Dict]:
+    """Read resolutions journaled by an earlier run, skipping a torn last line."""
+    resolved: Dict[str, Dict] = {}
+    if not journal_path.exists():
+        return resolved
+    with open(journal_path, "rb") as f:
+        for line in f:
+            try:
+                entry = loads(line)
+            except json.JSONDecodeError:
+                continue
+            resolved[entry.pop("cite_key")] = entry
+    return resolved
+
+
+def _end_with_newline(path: Path) -> None:
+    """Start appends on a fresh line if a crash left a torn final line."""
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb+") as f:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
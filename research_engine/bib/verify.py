@@ -2,55 +2,125 @@
 Verification of resolved DOIs against CrossRef metadata.
 
 Checks for title mismatches, year discrepancies, and retracted papers.
+DOIs are looked up in batches via the works doi filter; only DOIs missing
+from a batch response fall back to a per-DOI request.
 """
 
 import json
 import re
-import time
-from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
-try:
-    import requests
-except ImportError:
-    raise ImportError("'requests' package required. Install with: pip install requests")
+from ..jsonio import dump_json, load_json, loads
+from ..net import RateLimiter, get_with_retry, http_errors, make_client
+from .cache import CACHE_FILE, ResponseCache, cache_key
+from .resolve import title_similarity
 
 CROSSREF_API = "https://api.crossref.org/works"
 MAILTO = "itod2305@uni.sydney.edu.au"
+USER_AGENT = f"research-engine/0.1.0 (mailto:{MAILTO})"
 RATE_LIMIT_DELAY = 0.15
+BATCH_SIZE = 30  # DOIs per filter query; more risks HTTP 414 (URI too long)
+SELECT_FIELDS = "DOI,title,published-print,published-online,update-to"
+CACHE_TTL_DAYS = 1  # retractions must show up on the next day's run
 
+_RE_TEX_CHARS = re.compile(r"[{}\\$]")
 
-def verify_doi(doi: str, ref: Dict, session: requests.Session) -> Dict:
+
+def _work_key(doi: str) -> str:
+    """Cache key for a CrossRef work record."""
+    return cache_key("work", doi.lower())
+
+
+def verify_doi(
+    doi: str,
+    ref: Dict,
+    session: Any,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Dict:
     """Verify a single DOI against CrossRef metadata.
 
     Returns a verification result dict with:
         - status: "ok", "mismatch", "retracted", "not_found"
         - details: description of any issues
     """
+    key = _work_key(doi)
+    item = cache.get(key) if cache else None
+    if item is not None:
+        return check_item(item, ref)
+
     try:
-        resp = session.get(
+        resp = get_with_retry(
+            session,
             f"{CROSSREF_API}/{doi}",
+            limiter=limiter,
             params={"mailto": MAILTO},
             timeout=15,
         )
         if resp.status_code == 404:
             return {"status": "not_found", "details": f"DOI {doi} not found in CrossRef"}
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        data = loads(resp.content)
+    except (*http_errors(), json.JSONDecodeError) as e:
         return {"status": "error", "details": str(e)}
 
     item = data.get("message", {})
+    if cache:
+        cache.put(key, item)
+    return check_item(item, ref)
+
+
+def fetch_works_batch(
+    dois: List[str],
+    session: Any,
+    limiter: Optional[RateLimiter] = None,
+) -> Optional[Dict[str, Dict]]:
+    """Fetch CrossRef metadata for up to BATCH_SIZE DOIs in one query.
+
+    Returns dict mapping DOI (lowercase) -> work item. DOIs unknown to
+    CrossRef are absent from the result; returns None if the request failed.
+    """
+    if not dois:
+        return {}
+    batch = dois[:BATCH_SIZE]
+
+    try:
+        resp = get_with_retry(
+            session,
+            CROSSREF_API,
+            limiter=limiter,
+            params={
+                "filter": ",".join(f"doi:{d}" for d in batch),
+                "select": SELECT_FIELDS,
+                "rows": len(batch),
+                "mailto": MAILTO,
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        data = loads(resp.content)
+    except (*http_errors(), json.JSONDecodeError):
+        return None
+
+    return {
+        item["DOI"].lower(): item
+        for item in data.get("message", {}).get("items", [])
+        if item.get("DOI")
+    }
+
+
+def check_item(item: Dict, ref: Dict) -> Dict:
+    """Compare a CrossRef work item with our reference (no network)."""
     issues = []
 
     # Check title match
     cr_title = " ".join(item.get("title", [""]))
     ref_title = ref.get("title", "")
     if ref_title and cr_title:
-        clean_ref = re.sub(r"[{}\\$]", "", ref_title).lower().strip()
+        clean_ref = _RE_TEX_CHARS.sub("", ref_title).lower().strip()
         clean_cr = cr_title.lower().strip()
-        sim = SequenceMatcher(None, clean_ref, clean_cr).ratio()
+        sim = title_similarity(clean_ref, clean_cr)
         if sim < 0.70:
             issues.append(f"title mismatch (similarity={sim:.2f}): "
                          f"ours='{ref_title[:60]}' vs cr='{cr_title[:60]}'")
@@ -75,35 +145,79 @@ def verify_doi(doi: str, ref: Dict, session: requests.Session) -> Dict:
     return {"status": "ok", "details": "verified"}
 
 
-def verify_main(bibliography_path: Path, limit: int = 0) -> int:
-    """Main entry point for DOI verification."""
+def fetch_works_cached(
+    dois: List[str],
+    session: Any,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Dict[str, Dict]:
+    """Like fetch_works_batch(), but only queries DOIs not in `cache`."""
+    if cache is None:
+        return fetch_works_batch(dois, session, limiter) or {}
+
+    by_doi: Dict[str, Dict] = {}
+    misses = []
+    for doi in dois:
+        item = cache.get(_work_key(doi))
+        if item is None:
+            misses.append(doi)
+        else:
+            by_doi[doi.lower()] = item
+
+    fetched = fetch_works_batch(misses, session, limiter) or {}
+    for doi, item in fetched.items():
+        cache.put(_work_key(doi), item)
+    by_doi.update(fetched)
+    return by_doi
+
+
+def verify_main(bibliography_path: Path, limit: int = 0, use_cache: bool = True) -> int:
+    """Main entry point for DOI verification.
+
+    CrossRef records are cached in CACHE_FILE next to the bibliography for
+    CACHE_TTL_DAYS, so a rerun the same day skips the network, unless
+    use_cache is False. The short TTL keeps retraction status current;
+    resolve's lookups in the same file keep their longer TTL.
+    """
     if not bibliography_path.exists():
         print(f"Error: {bibliography_path} not found.")
         return 1
 
-    with open(bibliography_path) as f:
-        data = json.load(f)
+    data = load_json(bibliography_path)
 
     refs_with_doi = [r for r in data["references"] if r.get("doi")]
     if limit > 0:
         refs_with_doi = refs_with_doi[:limit]
 
-    session = requests.Session()
-    session.headers["User-Agent"] = f"research-engine/0.1.0 (mailto:{MAILTO})"
+    session = make_client(USER_AGENT)
+    limiter = RateLimiter(1 / RATE_LIMIT_DELAY)
+    cache = (
+        ResponseCache(bibliography_path.parent / CACHE_FILE, ttl_days=CACHE_TTL_DAYS)
+        if use_cache else None
+    )
 
     results = {"ok": 0, "mismatch": 0, "retracted": 0, "not_found": 0, "error": 0}
     issues: List[Dict] = []
 
     print(f"Verifying {len(refs_with_doi)} DOIs against CrossRef...")
 
+    by_doi: Dict[str, Dict] = {}
     for i, ref in enumerate(refs_with_doi):
         if (i + 1) % 25 == 0:
             print(f"  [{i+1}/{len(refs_with_doi)}] verified: {results['ok']}, "
                   f"issues: {results['mismatch']}")
 
-        time.sleep(RATE_LIMIT_DELAY)
-
-        result = verify_doi(ref["doi"], ref, session)
+        if i % BATCH_SIZE == 0:
+            batch = [r["doi"] for r in refs_with_doi[i:i + BATCH_SIZE]]
+            by_doi = fetch_works_cached(batch, session, limiter, cache)
+
+        item = by_doi.get(ref["doi"].lower())
+        if item is not None:
+            result = check_item(item, ref)
+        else:
+            # Not in the batch response (or the batch failed): the per-DOI
+            # lookup tells a 404 apart from a transient error
+            result = verify_doi(ref["doi"], ref, session, limiter, cache)
         status = result["status"]
         results[status] = results.get(status, 0) + 1
 
@@ -129,10 +243,13 @@ def verify_main(bibliography_path: Path, limit: int = 0) -> int:
         for issue in issues:
             print(f"  {issue['cite_key']}: {issue['details']}")
 
+    session.close()
+    if cache:
+        cache.close()
+
     # Save issues report
     report_path = bibliography_path.parent / "verification_report.json"
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump({"summary": results, "issues": issues}, f, indent=2)
+    dump_json({"summary": results, "issues": issues}, report_path)
     print(f"\nReport saved to {report_path}")
 
     return 0
@@ -1,11 +1,12 @@
 """Encode claims as vectors using sentence-transformers."""
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import numpy as np
 
+from ..jsonio import dump_json, load_json
+
 
 def load_model(model_name: str = "all-MiniLM-L6-v2"):
     """Load a sentence-transformers model."""
@@ -32,13 +33,17 @@ def embed_claims(
         model_name: Model to load if model not provided
 
     Returns:
-        numpy array of shape (n_claims, embedding_dim)
+        numpy array of shape (n_claims, embedding_dim), rows unit-normalized
     """
     if model is None:
         model = load_model(model_name)
 
     texts = [c["text"] for c in claims]
-    embeddings = model.encode(texts, show_progress_bar=True)
+    embeddings = model.encode(
+        texts,
+        show_progress_bar=True,
+        normalize_embeddings=True,  # Pre-normalize for cosine similarity
+    )
 
     return np.array(embeddings)
 
@@ -49,7 +54,12 @@ def save_embeddings(
     embeddings_path: Path,
     index_path: Path,
 ) -> None:
-    """Save embeddings and their index."""
+    """Save embeddings and their index.
+
+    The index records "normalized" when every row has unit length, as
+    embed_claims() output does, so queries can skip renormalizing them.
+    Any other array is renormalized at query time.
+    """
     embeddings_path.parent.mkdir(parents=True, exist_ok=True)
     np.save(str(embeddings_path), embeddings)
 
@@ -57,10 +67,10 @@ def save_embeddings(
         "model": "all-MiniLM-L6-v2",
         "n_claims": len(claims),
         "embedding_dim": embeddings.shape[1],
+        "normalized": bool(np.allclose(np.linalg.norm(embeddings, axis=1), 1, atol=1e-3)),
         "claims": claims,
     }
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2, ensure_ascii=False)
+    dump_json(index, index_path)
 
 
 def load_embeddings(
@@ -73,6 +83,5 @@ def load_embeddings(
         (embeddings array, index dict)
     """
     embeddings = np.load(str(embeddings_path))
-    with open(index_path) as f:
-        index = json.load(f)
+    index = load_json(index_path)
     return embeddings, index
@@ -8,31 +8,87 @@ Embedding strategy:
   - Abstract only: embed the abstract directly (fast, good for search)
   - Full text: chunk into ~500-word passages, embed each, store all
   - Title only: fallback for refs with no abstract or text
+
+Vectors are stored as float16 (half the disk and memory of float32; the
+rounding is far below what changes a cosine ranking). When faiss is
+installed, an HNSW index over them is saved alongside so unfiltered
+searches don't scan every vector.
 """
 
-import json
+import os
 import sqlite3
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from ..jsonio import dump_json, load_json
+from .query import top_k_indices
+
+ENCODE_CHUNK_BATCHES = 32  # model batches encoded per write to refs.npy
+FAISS_INDEX = "refs.faiss"
+HNSW_NEIGHBORS = 32  # graph degree (faiss default range is 16-64)
+SCAN_BLOCK = 65536  # rows of refs.npy upcast to float32 at a time
+FULL_TEXT_CHARS = 2000  # leading full text used when a ref has no abstract
+
+# Full text is only read where there is no abstract, and only its first
+# FULL_TEXT_CHARS, so SQLite never hands whole papers to Python
+REF_QUERY = (
+    "SELECT cite_key, doi, title, abstract, "
+    "CASE WHEN abstract IS NULL OR abstract = '' "
+    f"THEN substr(full_text, 1, {FULL_TEXT_CHARS}) END, depth FROM refs "
+    "WHERE abstract != '' OR full_text != '' OR length(title) > 20"
+)
+
+
+def _import_faiss():
+    """The faiss module, or None if it is not installed."""
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+def _build_faiss_index(npy_path: Path, index_path: Path) -> bool:
+    """Build an inner-product HNSW index over refs.npy, if faiss is installed.
+
+    Removes any stale index when faiss is missing, so search never pairs
+    an old index with new vectors. Returns True if an index was written.
+    """
+    faiss = _import_faiss()
+    if faiss is None:
+        if index_path.exists():
+            index_path.unlink()
+        return False
+
+    embeddings = np.load(str(npy_path), mmap_mode="r")
+    ann = faiss.IndexHNSWFlat(
+        embeddings.shape[1], HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT
+    )
+    for start in range(0, len(embeddings), SCAN_BLOCK):
+        ann.add(np.ascontiguousarray(embeddings[start:start + SCAN_BLOCK], dtype=np.float32))
+    faiss.write_index(ann, str(index_path))
+    return True
+
 
 def _get_embeddable_text(row: tuple) -> Optional[str]:
     """Extract the best available text for embedding from a DB row.
 
-    Row columns: cite_key, doi, title, abstract, full_text, depth
+    Row columns: cite_key, doi, title, abstract, text_head, depth, where
+    text_head is the first FULL_TEXT_CHARS of full_text, selected only
+    for rows without an abstract (see REF_QUERY).
     Returns text to embed, or None if nothing useful.
     """
-    cite_key, doi, title, abstract, full_text, depth = row
+    cite_key, doi, title, abstract, text_head, depth = row
 
     if abstract:
         # Abstract is the best single-vector representation
         return abstract
 
-    if full_text:
-        # Use first ~2000 chars of full text as pseudo-abstract
-        return full_text[:2000]
+    if text_head:
+        # Start of the full text as pseudo-abstract
+        return text_head
 
     if title and len(title) > 20:
         # Title-only embedding (low quality but better than nothing)
@@ -41,6 +97,89 @@ def _get_embeddable_text(row: tuple) -> Optional[str]:
     return None
 
 
+def _encode_chunks(
+    model,
+    texts: List[str],
+    path: Path,
+    batch_size: int,
+    verbose: bool = True,
+) -> int:
+    """Encode texts chunk by chunk straight into a float16 .npy at `path`.
+
+    The output is a memory-mapped file, so peak memory is one chunk of
+    vectors rather than the whole (n, dim) matrix. Returns the dimension.
+    """
+    n = len(texts)
+    chunk = batch_size * ENCODE_CHUNK_BATCHES
+    out = None
+
+    for start in range(0, n, chunk):
+        vecs = model.encode(
+            texts[start:start + chunk],
+            batch_size=batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=True,  # Pre-normalize for cosine similarity
+        )
+        if out is None:
+            out = np.lib.format.open_memmap(
+                str(path), mode="w+", dtype=np.float16, shape=(n, vecs.shape[1])
+            )
+        out[start:start + len(vecs)] = vecs
+        if verbose:
+            print(f"    [{min(start + chunk, n)}/{n}] encoded")
+
+    out.flush()
+    return out.shape[1]
+
+
+def _encode_to_npy(
+    model,
+    texts: List[str],
+    path: Path,
+    batch_size: int,
+    verbose: bool = True,
+) -> Tuple[int, int]:
+    """Encode texts into a float16 .npy at `path`, one row per text.
+
+    Duplicate texts (preprint/published pairs, re-imported records) are
+    encoded once and their vector copied to every row that uses it. Writes
+    go to temporary files; `path` is replaced only once complete.
+
+    Returns the array shape.
+    """
+    n = len(texts)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    unique: Dict[str, int] = {}
+    positions = np.fromiter(
+        (unique.setdefault(t, len(unique)) for t in texts), dtype=np.intp, count=n
+    )
+
+    if len(unique) == n:
+        dim = _encode_chunks(model, texts, tmp_path, batch_size, verbose=verbose)
+    else:
+        if verbose:
+            print(f"    {n - len(unique)} duplicate texts; encoding {len(unique)} unique")
+        unique_path = path.with_name(path.name + ".unique.tmp")
+        dim = _encode_chunks(
+            model, list(unique), unique_path, batch_size, verbose=verbose
+        )
+
+        vecs = np.load(str(unique_path), mmap_mode="r")
+        out = np.lib.format.open_memmap(
+            str(tmp_path), mode="w+", dtype=np.float16, shape=(n, dim)
+        )
+        step = batch_size * ENCODE_CHUNK_BATCHES
+        for start in range(0, n, step):
+            out[start:start + step] = vecs[positions[start:start + step]]
+        out.flush()
+        del out, vecs
+        unique_path.unlink()
+
+    os.replace(tmp_path, path)
+    return n, dim
+
+
 def embed_refs(
     data_dir: Path,
     model_name: str = "all-MiniLM-L6-v2",
@@ -75,20 +214,17 @@ def embed_refs(
         print(f"{'='*60}")
         print(f"  Model: {model_name}")
 
-    # Load refs from DB
+    # Stream refs from the DB; rows with nothing to embed are filtered in
+    # SQL, and each row's text is taken before the next row is fetched
     conn = sqlite3.connect(str(db_path))
-    cursor = conn.execute(
-        "SELECT cite_key, doi, title, abstract, full_text, depth FROM refs"
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    total_refs = conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
 
     if verbose:
-        print(f"  Total refs in DB: {len(rows)}")
+        print(f"  Total refs in DB: {total_refs}")
 
-    # Filter to embeddable refs
     embeddable = []
     texts = []
+    rows = conn.execute(REF_QUERY)
     for row in rows:
         text = _get_embeddable_text(row)
         if text:
@@ -100,6 +236,7 @@ def embed_refs(
                 "source": "abstract" if row[3] else ("text" if row[4] else "title"),
             })
             texts.append(text)
+    conn.close()
 
     if verbose:
         sources = {"abstract": 0, "text": 0, "title": 0}
@@ -118,38 +255,36 @@ def embed_refs(
     if verbose:
         print(f"\n  Loading model...")
     model = SentenceTransformer(model_name)
+    if model.device.type == "cuda":
+        # Half precision roughly doubles GPU encoding throughput
+        model.half()
 
     if verbose:
         print(f"  Encoding {len(texts)} texts...")
-    embeddings = model.encode(
-        texts,
-        batch_size=batch_size,
-        show_progress_bar=verbose,
-        normalize_embeddings=True,  # Pre-normalize for cosine similarity
-    )
-    embeddings = np.array(embeddings)
-
-    # Save
     embed_dir = data_dir / "embeddings"
     embed_dir.mkdir(parents=True, exist_ok=True)
-
-    np.save(str(embed_dir / "refs.npy"), embeddings)
+    shape = _encode_to_npy(
+        model, texts, embed_dir / "refs.npy", batch_size, verbose=verbose
+    )
+    has_ann = _build_faiss_index(embed_dir / "refs.npy", embed_dir / FAISS_INDEX)
 
     index = {
         "model": model_name,
         "n_refs": len(embeddable),
-        "embedding_dim": int(embeddings.shape[1]),
+        "embedding_dim": int(shape[1]),
+        "dtype": "float16",
         "refs": embeddable,
     }
-    with open(embed_dir / "ref_index.json", "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2, ensure_ascii=False)
+    dump_json(index, embed_dir / "ref_index.json")
 
     if verbose:
         print(f"\n  Saved {len(embeddable)} embeddings to {embed_dir}")
-        print(f"  Embedding shape: {embeddings.shape}")
+        print(f"  Embedding shape: {shape}")
         print(f"  Index: {embed_dir / 'ref_index.json'}")
         file_size = (embed_dir / "refs.npy").stat().st_size / 1024 / 1024
         print(f"  File size: {file_size:.1f} MB")
+        if has_ann:
+            print(f"  HNSW index: {embed_dir / FAISS_INDEX}")
 
     return len(embeddable)
 
@@ -170,38 +305,69 @@ def search_refs(
         model_name: Must match the model used for embedding
         depth_filter: Only return refs at this depth (1 or 2)
 
+    Unfiltered searches use the faiss HNSW index when it and faiss are
+    available (approximate); otherwise every vector is scored exactly.
+
     Returns:
         List of dicts with cite_key, title, doi, similarity, source, depth
     """
     from sentence_transformers import SentenceTransformer
 
     embed_dir = data_dir / "embeddings"
-    embeddings = np.load(str(embed_dir / "refs.npy"))
-    with open(embed_dir / "ref_index.json") as f:
-        index = json.load(f)
+    index = load_json(embed_dir / "ref_index.json")
+
+    ann = None
+    faiss = _import_faiss()
+    if faiss is not None and depth_filter is None and (embed_dir / FAISS_INDEX).exists():
+        ann = faiss.read_index(str(embed_dir / FAISS_INDEX))
+        if ann.ntotal != len(index["refs"]):
+            ann = None
 
     model = SentenceTransformer(model_name)
     query_emb = model.encode([query], normalize_embeddings=True)[0]
 
-    # Cosine similarity (embeddings already normalized)
-    similarities = embeddings @ query_emb
-
-    # Apply depth filter
-    if depth_filter is not None:
-        for i, ref in enumerate(index["refs"]):
-            if ref["depth"] != depth_filter:
-                similarities[i] = -1
-
-    top_k = np.argsort(similarities)[-k:][::-1]
+    if ann is not None:
+        scores, ids = ann.search(query_emb[None, :].astype(np.float32), k)
+        hits = [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+    else:
+        # Memory-mapped: repeat queries read from the OS page cache
+        embeddings = np.load(str(embed_dir / "refs.npy"), mmap_mode="r")
+
+        # Apply the depth filter first, so only matching rows are scored
+        ids = None
+        if depth_filter is not None:
+            refs = index["refs"]
+            depths = np.fromiter(
+                (-1 if r["depth"] is None else r["depth"] for r in refs),
+                dtype=np.int64,
+                count=len(refs),
+            )
+            ids = np.flatnonzero(depths == depth_filter)
+            embeddings = embeddings[ids]
+
+        # Cosine similarity (embeddings already normalized), upcasting
+        # float16 rows one block at a time
+        similarities = np.empty(len(embeddings), dtype=np.float32)
+        for start in range(0, len(embeddings), SCAN_BLOCK):
+            block = embeddings[start:start + SCAN_BLOCK]
+            similarities[start:start + len(block)] = (
+                block.astype(np.float32, copy=False) @ query_emb
+            )
+
+        top_k = top_k_indices(similarities, k)
+        if ids is None:
+            hits = [(int(j), float(similarities[j])) for j in top_k]
+        else:
+            hits = [(int(ids[j]), float(similarities[j])) for j in top_k]
 
     results = []
-    for idx in top_k:
-        if similarities[idx] < 0:
+    for idx, sim in hits:
+        if sim < 0:
             continue
         ref = index["refs"][idx]
         results.append({
             **ref,
-            "similarity": float(similarities[idx]),
+            "similarity": sim,
         })
 
     return results
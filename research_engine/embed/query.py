@@ -5,6 +5,27 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+SIMILARITY_BLOCK = 1024  # rows per block in find_similar_claims
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first.
+
+    argpartition selects the k in O(n); only those k are then sorted.
+    """
+    if 0 < k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+def _unit_rows(embeddings: np.ndarray, index: Dict) -> np.ndarray:
+    """Row-normalized embeddings; free if the index says they already are."""
+    if index.get("normalized"):
+        return embeddings
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
 
 def find_nearest(
     query_embedding: np.ndarray,
@@ -25,10 +46,10 @@ def find_nearest(
     """
     # Cosine similarity
     query_norm = query_embedding / np.linalg.norm(query_embedding)
-    emb_norms = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    emb_norms = _unit_rows(embeddings, index)
     similarities = emb_norms @ query_norm
 
-    top_k = np.argsort(similarities)[-k:][::-1]
+    top_k = top_k_indices(similarities, k)
 
     results = []
     claims = index["claims"]
@@ -56,23 +77,22 @@ def find_similar_claims(
     Returns:
         List of (claim_a, claim_b, similarity) tuples
     """
-    emb_norms = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
-    sim_matrix = emb_norms @ emb_norms.T
-
-    # Zero diagonal and below
-    np.fill_diagonal(sim_matrix, 0)
-    sim_matrix = np.triu(sim_matrix)
-
-    pairs = np.argwhere(sim_matrix >= threshold)
+    emb_norms = _unit_rows(embeddings, index)
     claims = index["claims"]
 
+    # Score SIMILARITY_BLOCK rows at a time against the claims after them,
+    # so memory is O(n * block) rather than a full n x n matrix
     results = []
-    for i, j in pairs:
-        results.append((
-            claims[i],
-            claims[j],
-            float(sim_matrix[i, j]),
-        ))
+    for start in range(0, len(emb_norms), SIMILARITY_BLOCK):
+        block = emb_norms[start:start + SIMILARITY_BLOCK] @ emb_norms[start:].T
+        # Upper triangle only: each pair once, no self-matches
+        rows, cols = np.nonzero(np.triu(block >= threshold, k=1))
+        for r, c in zip(rows, cols):
+            results.append((
+                claims[start + r],
+                claims[start + c],
+                float(block[r, c]),
+            ))
 
     return sorted(results, key=lambda x: x[2], reverse=True)
 
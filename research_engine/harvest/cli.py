@@ -1,14 +1,15 @@
 """Command-line interface for paper harvesting."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .config import Config
 from .sources.base import Paper
 from .sources.openalex import OpenAlexSource
 from .sources.arxiv import ArxivSource
 from .sources.biorxiv import BiorxivSource
-from .output.digest import generate_digest, update_seen_papers, get_unseen_papers
+from .output.digest import generate_digest, update_seen_papers, load_seen_ids
 from .download.open_access import download_papers
 
 
@@ -29,58 +30,65 @@ def discover(config_path: Optional[Path] = None) -> int:
 
     all_papers: List[Paper] = []
 
-    # OpenAlex (primary)
-    print("Searching OpenAlex...")
-    openalex = OpenAlexSource(email="itod2305@uni.sydney.edu.au")
-    oa_papers = openalex.search(
-        keywords=profile.keywords,
-        authors=profile.authors,
-        max_results=config.discovery.max_papers_per_run,
-        lookback_days=config.discovery.lookback_days,
-    )
-    print(f"  Found {len(oa_papers)} papers")
-    all_papers.extend(oa_papers)
-    print()
+    # Loaded once: sources skip seen papers before parsing them, and the
+    # same set filters the merged results and is updated at the end
+    seen_ids = load_seen_ids(output_dir)
 
-    # arXiv
-    print("Searching arXiv...")
+    # The sources are independent and network-bound, so query them in
+    # parallel; each keeps its own session and rate limiting. Results are
+    # merged in a fixed order (OpenAlex first, as the primary source).
+    openalex = OpenAlexSource(email="itod2305@uni.sydney.edu.au")
     arxiv = ArxivSource()
-    arxiv_papers = arxiv.search(
-        keywords=profile.keywords[:5],
-        authors=profile.authors,
-        max_results=config.discovery.max_papers_per_run // 2,
-        lookback_days=config.discovery.lookback_days,
-        categories=profile.arxiv_categories,
-    )
-    print(f"  Found {len(arxiv_papers)} papers")
-    all_papers.extend(arxiv_papers)
-    print()
-
-    # bioRxiv
-    print("Searching bioRxiv...")
     biorxiv = BiorxivSource(server="biorxiv")
-    biorxiv_papers = biorxiv.search(
-        keywords=profile.keywords,
-        authors=profile.authors,
-        max_results=config.discovery.max_papers_per_run // 2,
-        lookback_days=config.discovery.lookback_days,
-    )
-    print(f"  Found {len(biorxiv_papers)} papers")
-    all_papers.extend(biorxiv_papers)
+    searches = [
+        ("OpenAlex", openalex.search, dict(
+            keywords=profile.keywords,
+            authors=profile.authors,
+            max_results=config.discovery.max_papers_per_run,
+            lookback_days=config.discovery.lookback_days,
+            skip_ids=seen_ids,
+        )),
+        ("arXiv", arxiv.search, dict(
+            keywords=profile.keywords[:5],
+            authors=profile.authors,
+            max_results=config.discovery.max_papers_per_run // 2,
+            lookback_days=config.discovery.lookback_days,
+            categories=profile.arxiv_categories,
+            skip_ids=seen_ids,
+        )),
+        ("bioRxiv", biorxiv.search, dict(
+            keywords=profile.keywords,
+            authors=profile.authors,
+            max_results=config.discovery.max_papers_per_run // 2,
+            lookback_days=config.discovery.lookback_days,
+            skip_ids=seen_ids,
+        )),
+    ]
+
+    print(f"Searching {', '.join(name for name, _, _ in searches)}...")
+    with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+        futures = [
+            (name, executor.submit(search, **kwargs))
+            for name, search, kwargs in searches
+        ]
+    print()
+    for name, future in futures:
+        papers = future.result()
+        print(f"  {name}: found {len(papers)} papers")
+        all_papers.extend(papers)
     print()
 
-    # Deduplicate
-    seen_ids = set()
-    unique_papers = []
+    # Deduplicate (first occurrence wins, so OpenAlex records take precedence;
+    # dicts keep insertion order)
+    by_id: Dict[str, Paper] = {}
     for paper in all_papers:
-        if paper.id not in seen_ids:
-            seen_ids.add(paper.id)
-            unique_papers.append(paper)
+        by_id.setdefault(paper.id, paper)
+    unique_papers = list(by_id.values())
 
     print(f"Total unique papers: {len(unique_papers)}")
 
     # Filter unseen
-    new_papers = get_unseen_papers(unique_papers, output_dir)
+    new_papers = [p for p in unique_papers if p.id not in seen_ids]
     print(f"New papers (not seen before): {len(new_papers)}")
 
     if not new_papers:
@@ -100,7 +108,7 @@ def discover(config_path: Optional[Path] = None) -> int:
         print(f"  Downloaded {len(downloaded)} PDFs")
 
     # Update seen
-    update_seen_papers(new_papers, output_dir)
+    update_seen_papers(new_papers, output_dir, seen_ids=seen_ids)
 
     print()
     print("=" * 40)
@@ -1,12 +1,17 @@
 """Generate markdown digest of discovered papers."""
 
+import io
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Set
 
+from ...jsonio import dumps_line, load_json, loads
 from ..sources.base import Paper
 
+SEEN_FILE = "seen.jsonl"  # one {"id", "first_seen", "title", "status"} per line
+LEGACY_SEEN_FILE = "seen.json"
+
 
 def generate_digest(papers: List[Paper], output_dir: Path) -> Path:
     """Generate a markdown digest of papers."""
@@ -16,82 +21,116 @@ def generate_digest(papers: List[Paper], output_dir: Path) -> Path:
 
     digest_path = day_dir / "digest.md"
 
-    lines = [
-        f"# Paper Digest: {today}",
-        "",
-        f"Found **{len(papers)} papers** matching your research profile.",
-        "",
-        "---",
-        "",
-    ]
+    # Every line is written with its newline; the final one is dropped,
+    # matching the original "\n".join() of a line list
+    buf = io.StringIO()
+    buf.write(
+        f"# Paper Digest: {today}\n"
+        "\n"
+        f"Found **{len(papers)} papers** matching your research profile.\n"
+        "\n"
+        "---\n"
+        "\n"
+    )
 
     for i, paper in enumerate(papers, 1):
-        lines.extend([
-            f"## {i}. {paper.title}",
-            f"**Authors:** {paper.first_author}",
-            f"**Source:** {paper.display_id}",
-        ])
+        buf.write(
+            f"## {i}. {paper.title}\n"
+            f"**Authors:** {paper.first_author}\n"
+            f"**Source:** {paper.display_id}\n"
+        )
 
         if paper.published_date:
-            lines.append(f"**Published:** {paper.published_date.strftime('%Y-%m-%d')}")
+            buf.write(f"**Published:** {paper.published_date.strftime('%Y-%m-%d')}\n")
 
         if paper.pdf_url:
-            lines.append(f"**PDF:** [Link]({paper.pdf_url})")
+            buf.write(f"**PDF:** [Link]({paper.pdf_url})\n")
 
-        lines.append("")
+        buf.write("\n")
 
         if paper.abstract:
-            lines.append("**Abstract:**")
-            lines.append(paper.abstract[:1000] + ("..." if len(paper.abstract) > 1000 else ""))
-            lines.append("")
+            ellipsis = "..." if len(paper.abstract) > 1000 else ""
+            buf.write(f"**Abstract:**\n{paper.abstract[:1000]}{ellipsis}\n\n")
 
         if paper.matched_keywords:
-            lines.append(f"**Matched keywords:** {', '.join(paper.matched_keywords)}")
+            buf.write(f"**Matched keywords:** {', '.join(paper.matched_keywords)}\n")
 
         if paper.matched_authors:
-            lines.append(f"**Matched authors:** {', '.join(paper.matched_authors)}")
+            buf.write(f"**Matched authors:** {', '.join(paper.matched_authors)}\n")
 
-        lines.extend(["", "---", ""])
+        buf.write("\n---\n\n")
 
     with open(digest_path, "w") as f:
-        f.write("\n".join(lines))
+        f.write(buf.getvalue()[:-1])
 
     return digest_path
 
 
-def update_seen_papers(papers: List[Paper], output_dir: Path) -> None:
-    """Update seen.json with newly discovered papers."""
-    seen_path = output_dir / "seen.json"
+def load_seen_ids(output_dir: Path) -> Set[str]:
+    """IDs of every paper recorded in seen.jsonl.
 
-    if seen_path.exists():
-        with open(seen_path) as f:
-            data = json.load(f)
-    else:
-        data = {"papers": {}}
+    Migrates the old seen.json (one JSON object rewritten every run) to the
+    append-only seen.jsonl on first use.
+    """
+    seen_path = output_dir / SEEN_FILE
+    if not seen_path.exists():
+        _migrate_seen_json(output_dir)
+    if not seen_path.exists():
+        return set()
+
+    seen_ids = set()
+    with open(seen_path, "rb") as f:
+        for line in f:
+            try:
+                seen_ids.add(loads(line)["id"])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue  # torn final line from an interrupted run
+    return seen_ids
+
+
+def _migrate_seen_json(output_dir: Path) -> None:
+    legacy_path = output_dir / LEGACY_SEEN_FILE
+    if not legacy_path.exists():
+        return
+    data = load_json(legacy_path)
+    with open(output_dir / SEEN_FILE, "wb") as f:
+        for paper_id, entry in data.get("papers", {}).items():
+            f.write(dumps_line({"id": paper_id, **entry}))
+    legacy_path.unlink()
+
+
+def update_seen_papers(
+    papers: List[Paper], output_dir: Path, seen_ids: Optional[Set[str]] = None
+) -> None:
+    """Append newly discovered papers to seen.jsonl.
+
+    Pass `seen_ids` from load_seen_ids() to skip re-reading the file; it is
+    updated in place.
+    """
+    seen_path = output_dir / SEEN_FILE
+    if seen_ids is None:
+        seen_ids = load_seen_ids(output_dir)
 
     today = datetime.now().strftime("%Y-%m-%d")
 
-    for paper in papers:
-        if paper.id not in data["papers"]:
-            data["papers"][paper.id] = {
-                "first_seen": today,
-                "title": paper.title,
-                "status": "inbox",
-            }
-
-    with open(seen_path, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(seen_path, "ab+") as f:
+        # Start on a fresh line if a crash left a torn final line
+        if f.tell():
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        for paper in papers:
+            if paper.id not in seen_ids:
+                seen_ids.add(paper.id)
+                f.write(dumps_line({
+                    "id": paper.id,
+                    "first_seen": today,
+                    "title": paper.title,
+                    "status": "inbox",
+                }))
 
 
 def get_unseen_papers(papers: List[Paper], output_dir: Path) -> List[Paper]:
     """Filter papers to only those we haven't seen before."""
-    seen_path = output_dir / "seen.json"
-
-    if not seen_path.exists():
-        return papers
-
-    with open(seen_path) as f:
-        data = json.load(f)
-
-    seen_ids = set(data.get("papers", {}).keys())
+    seen_ids = load_seen_ids(output_dir)
     return [p for p in papers if p.id not in seen_ids]
@@ -1,12 +1,27 @@
 """arXiv API client for paper discovery."""
 
-import time
+import io
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List
+from typing import Iterator, List, Optional, Set
 import requests
 
-from .base import DiscoverySource, Paper
+from ...net import RateLimiter, get_with_retry
+from .base import DiscoverySource, KeywordMatcher, Paper, shared_session
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+# Qualified tag names, built once rather than per entry
+_ENTRY = f"{ATOM_NS}entry"
+_ID = f"{ATOM_NS}id"
+_TITLE = f"{ATOM_NS}title"
+_SUMMARY = f"{ATOM_NS}summary"
+_AUTHOR = f"{ATOM_NS}author"
+_NAME = f"{ATOM_NS}name"
+_PUBLISHED = f"{ATOM_NS}published"
+_CATEGORY = f"{ATOM_NS}category"
+_LINK = f"{ATOM_NS}link"
 
 
 class ArxivSource(DiscoverySource):
@@ -14,30 +29,20 @@ class ArxivSource(DiscoverySource):
 
     BASE_URL = "http://export.arxiv.org/api/query"
     RATE_LIMIT_DELAY = 3.0  # arXiv asks for 3 seconds between requests
-
-    ATOM_NS = "{http://www.w3.org/2005/Atom}"
-    ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+    MAX_WORKERS = 2  # enough to overlap one response with the next wait
+    MAX_QUERY_CHARS = 1000  # arXiv rejects search_query much past ~1024 chars
+    RESULTS_PER_KEYWORD = 30
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "ResearchEngine/0.1 (academic research tool)"
-        })
-        self._last_request_time = 0.0
+        self.session = shared_session()
+        self._limiter = RateLimiter(1 / self.RATE_LIMIT_DELAY)
 
     @property
     def name(self) -> str:
         return "arxiv"
 
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
-
-    def _search(self, query: str, max_results: int = 50) -> List[dict]:
-        self._rate_limit()
-
+    def _search(self, query: str, max_results: int = 50) -> Iterator[dict]:
+        """Fetch one page of results; entries are parsed as they are consumed."""
         params = {
             "search_query": query,
             "start": 0,
@@ -47,67 +52,82 @@ class ArxivSource(DiscoverySource):
         }
 
         try:
-            response = self.session.get(self.BASE_URL, params=params, timeout=30)
+            response = get_with_retry(
+                self.session, self.BASE_URL, limiter=self._limiter, params=params, timeout=30
+            )
             response.raise_for_status()
-            return self._parse_response(response.text)
+            return self._parse_response(response.content)
         except requests.RequestException as e:
             print(f"  Warning: arXiv search failed: {e}")
-            return []
+            return iter(())
+
+    def _parse_response(self, content: bytes) -> Iterator[dict]:
+        """Parse an Atom feed incrementally, yielding one <entry> at a time.
 
-    def _parse_response(self, xml_text: str) -> List[dict]:
-        results = []
+        Each entry's children are read in a single pass and the entry is
+        cleared once parsed, so the tree never holds the whole feed. A
+        malformed feed ends the iteration at the first bad element.
+        """
         try:
-            root = ET.fromstring(xml_text)
+            for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+                if elem.tag == _ENTRY:
+                    yield self._parse_entry(elem)
+                    elem.clear()
         except ET.ParseError:
-            return []
-
-        for entry in root.findall(f"{self.ATOM_NS}entry"):
-            entry_id = entry.findtext(f"{self.ATOM_NS}id", "")
-            arxiv_id = entry_id.split("/abs/")[-1] if "/abs/" in entry_id else ""
-
-            title = entry.findtext(f"{self.ATOM_NS}title", "").strip()
-            title = " ".join(title.split())
-
-            abstract = entry.findtext(f"{self.ATOM_NS}summary", "").strip()
-
-            authors = []
-            for author in entry.findall(f"{self.ATOM_NS}author"):
-                name = author.findtext(f"{self.ATOM_NS}name", "")
+            return
+
+    def _parse_entry(self, entry: ET.Element) -> dict:
+        text = {}  # first child's text per tag, as findtext() returns
+        authors = []
+        categories = []
+        pdf_url = None
+        for child in entry:
+            tag = child.tag
+            if tag == _AUTHOR:
+                name = child.findtext(_NAME, "")
                 if name:
                     authors.append(name)
-
-            published = entry.findtext(f"{self.ATOM_NS}published", "")
-            pub_date = None
-            if published:
-                try:
-                    pub_date = datetime.fromisoformat(published.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-
-            categories = []
-            for cat in entry.findall(f"{self.ATOM_NS}category"):
-                term = cat.get("term", "")
+            elif tag == _CATEGORY:
+                term = child.get("term", "")
                 if term:
                     categories.append(term)
+            elif tag == _LINK:
+                if pdf_url is None and child.get("type") == "application/pdf":
+                    pdf_url = child.get("href")
+            elif tag not in text:
+                text[tag] = child.text or ""
+
+        entry_id = text.get(_ID, "")
+        arxiv_id = entry_id.split("/abs/")[-1] if "/abs/" in entry_id else ""
+
+        title = " ".join(text.get(_TITLE, "").split())
+        abstract = text.get(_SUMMARY, "").strip()
+
+        published = text.get(_PUBLISHED, "")
+        pub_date = None
+        if published:
+            try:
+                pub_date = datetime.fromisoformat(published.replace("Z", "+00:00"))
+            except ValueError:
+                pass
+
+        return {
+            "arxiv_id": arxiv_id,
+            "title": title,
+            "abstract": abstract,
+            "authors": authors,
+            "published_date": pub_date,
+            "categories": categories,
+            "pdf_url": pdf_url,
+            "url": entry_id,
+        }
 
-            pdf_url = None
-            for link in entry.findall(f"{self.ATOM_NS}link"):
-                if link.get("type") == "application/pdf":
-                    pdf_url = link.get("href")
-                    break
-
-            results.append({
-                "arxiv_id": arxiv_id,
-                "title": title,
-                "abstract": abstract,
-                "authors": authors,
-                "published_date": pub_date,
-                "categories": categories,
-                "pdf_url": pdf_url,
-                "url": entry_id,
-            })
-
-        return results
+    @staticmethod
+    def _chunk_query(keywords: List[str], cat_query: Optional[str]) -> str:
+        query = " OR ".join(f'all:"{keyword}"' for keyword in keywords)
+        if cat_query:
+            return f"({query}) AND ({cat_query})"
+        return query
 
     def search(
         self,
@@ -116,8 +136,11 @@ class ArxivSource(DiscoverySource):
         max_results: int = 30,
         lookback_days: int = 7,
         categories: List[str] = None,
+        skip_ids: Optional[Set[str]] = None,
     ) -> List[Paper]:
         cutoff_date = datetime.now() - timedelta(days=lookback_days)
+        skip_ids = skip_ids or set()
+        authors_lower = [auth.lower() for auth in authors]
         seen_ids: set = set()
         papers: List[Paper] = []
 
@@ -126,20 +149,34 @@ class ArxivSource(DiscoverySource):
         else:
             cat_query = None
 
+        # Keywords are OR-ed into as few queries as fit MAX_QUERY_CHARS, so
+        # the 3s rate limit is paid per chunk rather than per keyword.
+        # Which keywords a result matched is worked out from its text.
+        chunks: List[List[str]] = []
         for keyword in keywords:
-            query_parts = [f'all:"{keyword}"']
-            if cat_query:
-                query_parts.append(f"({cat_query})")
-
-            query = " AND ".join(query_parts)
-            print(f"  Searching arXiv for: {keyword}")
-
-            results = self._search(query, max_results=30)
+            if chunks and len(self._chunk_query(chunks[-1] + [keyword], cat_query)) <= self.MAX_QUERY_CHARS:
+                chunks[-1].append(keyword)
+            else:
+                chunks.append([keyword])
+        matcher = KeywordMatcher(keywords)
+
+        responses = self._map(
+            lambda chunk: self._search(
+                self._chunk_query(chunk, cat_query),
+                max_results=len(chunk) * self.RESULTS_PER_KEYWORD,
+            ),
+            chunks,
+        )
+        for chunk, results in zip(chunks, responses):
+            print(f"  Searching arXiv for: {', '.join(chunk)}")
 
             for result in results:
                 arxiv_id = result["arxiv_id"]
                 if not arxiv_id or arxiv_id in seen_ids:
                     continue
+                paper_id = f"arXiv:{arxiv_id}"
+                if paper_id in skip_ids:
+                    continue
 
                 pub_date = result["published_date"]
                 if pub_date and pub_date.replace(tzinfo=None) < cutoff_date:
@@ -147,16 +184,14 @@ class ArxivSource(DiscoverySource):
 
                 seen_ids.add(arxiv_id)
 
-                matched_authors = []
-                for auth in authors:
-                    auth_lower = auth.lower()
-                    for name in result["authors"]:
-                        if auth_lower in name.lower():
-                            matched_authors.append(auth)
-                            break
+                names_lower = [name.lower() for name in result["authors"]]
+                matched_authors = [
+                    auth for auth, auth_lower in zip(authors, authors_lower)
+                    if any(auth_lower in name for name in names_lower)
+                ]
 
                 paper = Paper(
-                    id=f"arXiv:{arxiv_id}",
+                    id=paper_id,
                     title=result["title"],
                     authors=result["authors"],
                     abstract=result["abstract"],
@@ -164,7 +199,7 @@ class ArxivSource(DiscoverySource):
                     source=self.name,
                     source_url=result["url"],
                     pdf_url=result["pdf_url"],
-                    matched_keywords=[keyword],
+                    matched_keywords=matcher.match(f"{result['title']} {result['abstract']}"),
                     matched_authors=matched_authors,
                 )
                 papers.append(paper)
@@ -1,14 +1,82 @@
 """Base class for paper discovery sources."""
 
+import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Set, TypeVar
 
+from ...net import make_session
 
-@dataclass
+try:
+    import ahocorasick_rs
+except ImportError:
+    ahocorasick_rs = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+USER_AGENT = "ResearchEngine/0.1 (academic research tool)"
+POOL_SIZE = 32  # keep-alive connections per host
+
+
+@lru_cache(maxsize=None)
+def shared_session():
+    """The requests Session used by every source and the PDF downloader.
+
+    One pool means connections to a host (arxiv.org serves both the API and
+    the PDFs) are reused across sources and across download_papers() calls.
+    """
+    return make_session(USER_AGENT, pool_size=POOL_SIZE)
+
+
+class KeywordMatcher:
+    """Which of a fixed set of labels occur in a text (case-insensitive).
+
+    A label matches when any of its terms is a substring of the text; by
+    default each label is its own single term. With ahocorasick_rs
+    installed, one pass over the text finds every term at once; otherwise
+    each term is checked with `in`. Matches are returned in label order.
+    """
+
+    def __init__(self, labels: List[str], terms: Optional[List[List[str]]] = None):
+        self.labels = labels
+        if terms is None:
+            terms = [[label] for label in labels]
+        self._terms = [[t.lower() for t in group if t] for group in terms]
+        self._owner = [i for i, group in enumerate(self._terms) for _ in group]
+        patterns = [t for group in self._terms for t in group]
+        self._automaton = None
+        if ahocorasick_rs is not None and patterns:
+            self._automaton = ahocorasick_rs.AhoCorasick(patterns)
+
+    def match(self, text: str) -> List[str]:
+        text = text.lower()
+        if self._automaton is None:
+            return [
+                label for label, group in zip(self.labels, self._terms)
+                if any(t in text for t in group)
+            ]
+        hits = {
+            self._owner[i]
+            for i, _, _ in self._automaton.find_matches_as_indexes(text, overlapping=True)
+        }
+        return [self.labels[i] for i in sorted(hits)]
+
+
+# Slotted dataclasses need Python 3.10; older interpreters get a plain one
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Paper:
-    """Represents a discovered paper."""
+    """Represents a discovered paper.
+
+    Uses __slots__ where supported: thousands are held per harvest, and a
+    slotted instance has no per-object __dict__.
+    """
     id: str  # DOI or arXiv ID
     title: str
     authors: List[str]
@@ -40,6 +108,25 @@ class Paper:
 class DiscoverySource(ABC):
     """Abstract base class for paper discovery sources."""
 
+    MAX_WORKERS = 4  # queries in flight at once; the rate limiter spaces their starts
+
+    def _map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Run fn over items on a thread pool, yielding results in input order.
+
+        Requests overlap each other's round trips instead of running back to
+        back. Calls that haven't started are cancelled if the caller stops
+        iterating early (e.g. once max_results is reached).
+        """
+        executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+        futures = [executor.submit(fn, item) for item in items]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -52,5 +139,11 @@ class DiscoverySource(ABC):
         authors: List[str],
         max_results: int = 30,
         lookback_days: int = 7,
+        skip_ids: Optional[Set[str]] = None,
     ) -> List[Paper]:
+        """Find recent papers matching the profile.
+
+        Results whose Paper.id is in `skip_ids` (e.g. already in seen.jsonl)
+        are dropped before any parsing and don't count towards max_results.
+        """
         pass
@@ -3,12 +3,14 @@
 bioRxiv API docs: https://api.biorxiv.org/
 """
 
-import time
+import json
 from datetime import datetime, timedelta
-from typing import List
+from typing import Iterator, List, Optional, Set
 import requests
 
-from .base import DiscoverySource, Paper
+from ...jsonio import loads
+from ...net import RateLimiter, get_with_retry
+from .base import DiscoverySource, KeywordMatcher, Paper, shared_session
 
 
 class BiorxivSource(DiscoverySource):
@@ -19,44 +21,35 @@ class BiorxivSource(DiscoverySource):
 
     def __init__(self, server: str = "biorxiv"):
         self.server = server
-        self.session = requests.Session()
-        self._last_request_time = 0.0
+        self.session = shared_session()
+        self._limiter = RateLimiter(1 / self.RATE_LIMIT_DELAY)
 
     @property
     def name(self) -> str:
         return self.server
 
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
-
     def _fetch_recent(self, from_date: datetime, to_date: datetime, cursor: int = 0) -> List[dict]:
-        self._rate_limit()
         url = f"{self.BASE_URL}/{self.server}/{from_date.strftime('%Y-%m-%d')}/{to_date.strftime('%Y-%m-%d')}/{cursor}"
 
         try:
-            response = self.session.get(url, timeout=30)
+            response = get_with_retry(
+                self.session, url, limiter=self._limiter, timeout=30
+            )
             response.raise_for_status()
-            return response.json().get("collection", [])
-        except requests.RequestException as e:
+            return loads(response.content).get("collection", [])
+        except (requests.RequestException, json.JSONDecodeError) as e:
             print(f"  Warning: {self.server} fetch failed: {e}")
             return []
 
-    def _keyword_match(self, text: str, keywords: List[str]) -> List[str]:
-        text_lower = text.lower()
-        return [kw for kw in keywords if kw.lower() in text_lower]
-
-    def _author_match(self, authors_str: str, target_authors: List[str]) -> List[str]:
-        authors_lower = authors_str.lower()
-        matched = []
-        for author in target_authors:
-            parts = author.lower().split()
-            last_name = parts[-1] if parts else author.lower()
-            if last_name in authors_lower or author.lower() in authors_lower:
-                matched.append(author)
-        return matched
+    def _iter_recent(self, from_date: datetime, to_date: datetime) -> Iterator[dict]:
+        """Yield preprints page by page, fetching the next page only when needed."""
+        cursor = 0
+        while cursor < 500:
+            batch = self._fetch_recent(from_date, to_date, cursor)
+            yield from batch
+            if len(batch) < 100:
+                break
+            cursor += 100
 
     def search(
         self,
@@ -64,41 +57,40 @@ class BiorxivSource(DiscoverySource):
         authors: List[str],
         max_results: int = 30,
         lookback_days: int = 30,
+        skip_ids: Optional[Set[str]] = None,
     ) -> List[Paper]:
         to_date = datetime.now()
         from_date = to_date - timedelta(days=lookback_days)
 
         print(f"  Fetching recent {self.server} preprints...")
-        all_preprints = []
-        cursor = 0
-
-        while True:
-            batch = self._fetch_recent(from_date, to_date, cursor)
-            if not batch:
-                break
-            all_preprints.extend(batch)
-            if len(batch) < 100:
-                break
-            cursor += 100
-            if cursor >= 500:
-                break
-
-        print(f"  Found {len(all_preprints)} total preprints, filtering...")
-
         papers = []
         seen_ids = set()
-
-        for preprint in all_preprints:
+        skip_ids = skip_ids or set()
+
+        # An author matches on their last name or their full name
+        keyword_matcher = KeywordMatcher(keywords)
+        author_matcher = KeywordMatcher(
+            authors, [[(author.split() or [author])[-1], author] for author in authors]
+        )
+
+        # Preprints are matched as they are yielded, so pagination stops
+        # once max_results papers have matched
+        scanned = 0
+        for preprint in self._iter_recent(from_date, to_date):
+            scanned += 1
             doi = preprint.get("doi", "")
             if not doi or doi in seen_ids:
                 continue
+            paper_id = f"doi:{doi}"
+            if paper_id in skip_ids:
+                continue
 
             title = preprint.get("title", "")
             abstract = preprint.get("abstract", "")
             authors_str = preprint.get("authors", "")
 
-            matched_keywords = self._keyword_match(f"{title} {abstract}", keywords)
-            matched_authors = self._author_match(authors_str, authors)
+            matched_keywords = keyword_matcher.match(f"{title} {abstract}")
+            matched_authors = author_matcher.match(authors_str)
 
             if not matched_keywords and not matched_authors:
                 continue
@@ -116,7 +108,7 @@ class BiorxivSource(DiscoverySource):
             author_list = [a.strip() for a in authors_str.split(";") if a.strip()]
 
             paper = Paper(
-                id=f"doi:{doi}",
+                id=paper_id,
                 title=title,
                 authors=author_list,
                 abstract=abstract,
@@ -132,4 +124,5 @@ class BiorxivSource(DiscoverySource):
             if len(papers) >= max_results:
                 break
 
+        print(f"  Scanned {scanned} preprints, {len(papers)} matched")
         return papers
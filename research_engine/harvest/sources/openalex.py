@@ -4,12 +4,15 @@ OpenAlex is fully open, no auth required, generous rate limits (10 req/sec with
 https://docs.openalex.org/
 """
 
-import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Set, Tuple
 import requests
+import urllib3
 
-from .base import DiscoverySource, Paper
+from ...jsonio import iter_items
+from ...net import RateLimiter, get_with_retry
+from .base import DiscoverySource, Paper, shared_session
 
 
 class OpenAlexSource(DiscoverySource):
@@ -21,29 +24,24 @@ class OpenAlexSource(DiscoverySource):
     SKIP_SOURCES = {"zenodo", "ssrn", "osf preprints", "research square", "authorea", "preprints.org"}
 
     def __init__(self, email: Optional[str] = None):
-        self.session = requests.Session()
+        self.session = shared_session()
         self.email = email or "paper-harvester@example.com"
-        self._last_request_time = 0.0
+        self._limiter = RateLimiter(1 / self.RATE_LIMIT_DELAY)
+        # A /works query this source has already answered (e.g. on a second
+        # search() call) is served from memory instead of re-sent
+        self._cached_works = lru_cache(maxsize=256)(self._get_works)
 
     @property
     def name(self) -> str:
         return "openalex"
 
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
-
     def _search(
         self,
         query: str,
         from_date: Optional[datetime] = None,
         per_page: int = 50,
         require_abstract: bool = True,
-    ) -> List[dict]:
-        self._rate_limit()
-
+    ) -> Sequence[dict]:
         params = {
             "search": query,
             "per_page": per_page,
@@ -60,16 +58,12 @@ class OpenAlexSource(DiscoverySource):
             params["filter"] = ",".join(filters)
 
         try:
-            response = self.session.get(f"{self.BASE_URL}/works", params=params, timeout=30)
-            response.raise_for_status()
-            return response.json().get("results", [])
-        except requests.RequestException as e:
+            return self._fetch_works(params)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, ValueError) as e:
             print(f"  Warning: OpenAlex search failed for '{query}': {e}")
             return []
 
-    def _search_by_author(self, author_name: str, from_date: Optional[datetime] = None) -> List[dict]:
-        self._rate_limit()
-
+    def _search_by_author(self, author_name: str, from_date: Optional[datetime] = None) -> Sequence[dict]:
         params = {
             "search": author_name,
             "per_page": 25,
@@ -81,13 +75,54 @@ class OpenAlexSource(DiscoverySource):
             params["filter"] = f"from_publication_date:{from_date.strftime('%Y-%m-%d')}"
 
         try:
-            response = self.session.get(f"{self.BASE_URL}/works", params=params, timeout=30)
-            response.raise_for_status()
-            return response.json().get("results", [])
-        except requests.RequestException as e:
+            return self._fetch_works(params)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, ValueError) as e:
             print(f"  Warning: OpenAlex author search failed for '{author_name}': {e}")
             return []
 
+    def _fetch_works(self, params: dict) -> Tuple[dict, ...]:
+        """Results of GET /works for params, cached per source instance.
+
+        Failed requests raise and are not cached.
+        """
+        return self._cached_works(tuple(sorted(params.items())))
+
+    def _get_works(self, params_key: Tuple[Tuple[str, Any], ...]) -> Tuple[dict, ...]:
+        """GET /works and stream its results one work at a time.
+
+        Each work's abstract_inverted_index (by far its largest field) is
+        collapsed to an "abstract" string as soon as the work is parsed, so
+        only one inverted index is held in memory at a time.
+        """
+        response = get_with_retry(
+            self.session, f"{self.BASE_URL}/works",
+            limiter=self._limiter, params=dict(params_key), timeout=30, stream=True,
+        )
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            works = []
+            for work in iter_items(response.raw, "results.item"):
+                work["abstract"] = self._rebuild_abstract(work.pop("abstract_inverted_index", None))
+                works.append(work)
+            return tuple(works)
+        finally:
+            response.close()
+
+    @staticmethod
+    def _rebuild_abstract(abstract_index: Optional[dict]) -> str:
+        """Abstract text from OpenAlex's {word: [positions]} inverted index."""
+        if not abstract_index:
+            return ""
+        # Place each word at its positions directly instead of sorting
+        # (pos, word) pairs
+        size = max((max(ps) for ps in abstract_index.values() if ps), default=-1) + 1
+        slots: List[Optional[str]] = [None] * size
+        for word, positions in abstract_index.items():
+            for pos in positions:
+                slots[pos] = word
+        return " ".join(word for word in slots if word is not None)
+
     def _is_quality_source(self, work: dict) -> bool:
         primary = work.get("primary_location") or {}
         source = primary.get("source") or {}
@@ -109,10 +144,15 @@ class OpenAlexSource(DiscoverySource):
         in_abstract_early = keyword_lower in abstract_lower[:500]
         return in_title or count_in_abstract >= 2 or in_abstract_early
 
-    def _parse_work(self, work: dict, matched_keyword: str = "", matched_author: str = "") -> Optional[Paper]:
+    @staticmethod
+    def _work_id(work: dict) -> str:
+        """The Paper.id a work will get: its DOI, else its OpenAlex ID."""
         doi = work.get("doi", "").replace("https://doi.org/", "") if work.get("doi") else None
         openalex_id = work.get("id", "").split("/")[-1]
-        paper_id = doi or f"openalex:{openalex_id}"
+        return doi or f"openalex:{openalex_id}"
+
+    def _parse_work(self, work: dict, matched_keyword: str = "", matched_author: str = "") -> Optional[Paper]:
+        paper_id = self._work_id(work)
 
         title = work.get("title") or work.get("display_name") or "Untitled"
 
@@ -122,15 +162,9 @@ class OpenAlexSource(DiscoverySource):
             if name:
                 authors.append(name)
 
-        abstract = ""
-        abstract_index = work.get("abstract_inverted_index")
-        if abstract_index:
-            word_positions = []
-            for word, positions in abstract_index.items():
-                for pos in positions:
-                    word_positions.append((pos, word))
-            word_positions.sort()
-            abstract = " ".join(word for _, word in word_positions)
+        abstract = work.get("abstract")  # already rebuilt by _fetch_works
+        if abstract is None:
+            abstract = self._rebuild_abstract(work.get("abstract_inverted_index"))
 
         pub_date = None
         pub_date_str = work.get("publication_date")
@@ -167,20 +201,34 @@ class OpenAlexSource(DiscoverySource):
         authors: List[str],
         max_results: int = 50,
         lookback_days: int = 7,
+        skip_ids: Optional[Set[str]] = None,
     ) -> List[Paper]:
         cutoff_date = datetime.now() - timedelta(days=lookback_days)
         seen_ids: set = set()
+        skip_ids = skip_ids or set()
+        authors_lower = [auth.lower() for auth in authors]
         papers: List[Paper] = []
 
+        # Keyword and author queries all go out together; results are
+        # consumed keywords first, then authors, as before
+        queries = [
+            lambda kw=kw: self._search(kw, from_date=cutoff_date, per_page=30)
+            for kw in keywords
+        ] + [
+            lambda a=a: self._search_by_author(a, from_date=cutoff_date)
+            for a in authors
+        ]
+        responses = self._map(lambda query: query(), queries)
+
         for keyword in keywords:
             if len(papers) >= max_results:
                 break
 
             print(f"  Searching OpenAlex for: {keyword}")
-            results = self._search(keyword, from_date=cutoff_date, per_page=30)
+            results = next(responses)
 
             for work in results:
-                if not self._is_quality_source(work):
+                if self._work_id(work) in skip_ids or not self._is_quality_source(work):
                     continue
                 paper = self._parse_work(work, matched_keyword=keyword)
                 if not paper or paper.id in seen_ids:
@@ -190,12 +238,11 @@ class OpenAlexSource(DiscoverySource):
 
                 seen_ids.add(paper.id)
 
-                for auth in authors:
-                    auth_lower = auth.lower()
-                    for name in paper.authors:
-                        if auth_lower in name.lower():
-                            paper.matched_authors.append(auth)
-                            break
+                names_lower = [name.lower() for name in paper.authors]
+                paper.matched_authors.extend(
+                    auth for auth, auth_lower in zip(authors, authors_lower)
+                    if any(auth_lower in name for name in names_lower)
+                )
 
                 papers.append(paper)
                 if len(papers) >= max_results:
@@ -206,10 +253,10 @@ class OpenAlexSource(DiscoverySource):
                 break
 
             print(f"  Searching OpenAlex for author: {author}")
-            results = self._search_by_author(author, from_date=cutoff_date)
+            results = next(responses)
 
             for work in results:
-                if not self._is_quality_source(work):
+                if self._work_id(work) in skip_ids or not self._is_quality_source(work):
                     continue
                 paper = self._parse_work(work, matched_author=author)
                 if not paper or paper.id in seen_ids:
@@ -1,11 +1,15 @@
 """Semantic Scholar API client for paper discovery."""
 
-import time
+import json
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Set
 import requests
 
-from .base import DiscoverySource, Paper
+from ...jsonio import loads
+from ...net import RateLimiter, get_with_retry
+from .base import DiscoverySource, KeywordMatcher, Paper, shared_session
+
+FIELDS = "paperId,title,authors,abstract,year,publicationDate,openAccessPdf,externalIds,url"
 
 
 class SemanticScholarSource(DiscoverySource):
@@ -13,55 +17,88 @@ class SemanticScholarSource(DiscoverySource):
 
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
     RATE_LIMIT_DELAY = 3.5
+    MAX_WORKERS = 2
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "ResearchEngine/0.1 (academic research tool)"
-        })
-        self._last_request_time = 0.0
+        self.session = shared_session()
+        self._limiter = RateLimiter(1 / self.RATE_LIMIT_DELAY)
 
     @property
     def name(self) -> str:
         return "semantic_scholar"
 
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
-
     def _search_keyword(self, keyword: str, limit: int = 20) -> List[dict]:
-        self._rate_limit()
         url = f"{self.BASE_URL}/paper/search"
         params = {
             "query": keyword,
             "limit": limit,
-            "fields": "paperId,title,authors,abstract,year,publicationDate,openAccessPdf,externalIds,url",
+            "fields": FIELDS,
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = get_with_retry(
+                self.session, url, limiter=self._limiter, params=params, timeout=30
+            )
             response.raise_for_status()
-            return response.json().get("data", [])
-        except requests.RequestException as e:
+            return loads(response.content).get("data", [])
+        except (requests.RequestException, json.JSONDecodeError) as e:
             print(f"  Warning: Semantic Scholar search failed for '{keyword}': {e}")
             return []
 
+    def _search_bulk(self, keywords: List[str], from_date: datetime) -> List[dict]:
+        """All keywords as one OR query against /paper/search/bulk.
+
+        The bulk endpoint returns up to 1000 papers per call and filters by
+        publication date server-side, so one rate-limited request replaces
+        one per keyword.
+        """
+        url = f"{self.BASE_URL}/paper/search/bulk"
+        params = {
+            "query": " | ".join(f'"{kw.replace(chr(34), "")}"' for kw in keywords),
+            "fields": FIELDS,
+            "publicationDateOrYear": f"{from_date.strftime('%Y-%m-%d')}:",
+            "sort": "publicationDate:desc",
+        }
+
+        try:
+            response = get_with_retry(
+                self.session, url, limiter=self._limiter, params=params, timeout=30
+            )
+            response.raise_for_status()
+            return loads(response.content).get("data", [])
+        except (requests.RequestException, json.JSONDecodeError) as e:
+            print(f"  Warning: Semantic Scholar bulk search failed: {e}")
+            return []
+
     def search(
         self,
         keywords: List[str],
         authors: List[str],
         max_results: int = 30,
         lookback_days: int = 7,
+        skip_ids: Optional[Set[str]] = None,
     ) -> List[Paper]:
         cutoff_date = datetime.now() - timedelta(days=lookback_days)
         seen_ids: set = set()
+        skip_ids = skip_ids or set()
+        authors_lower = [auth.lower() for auth in authors]
         papers: List[Paper] = []
 
-        for keyword in keywords:
-            print(f"  Searching Semantic Scholar for: {keyword}")
-            results = self._search_keyword(keyword, limit=20)
+        # One bulk query, with keywords attributed client-side; fall back to
+        # a query per keyword if it fails or finds nothing
+        print(f"  Searching Semantic Scholar for {len(keywords)} keywords (bulk)")
+        bulk = self._search_bulk(keywords, cutoff_date) if keywords else []
+        if bulk:
+            matcher = KeywordMatcher(keywords)
+            batches = [(None, bulk)]
+        else:
+            batches = zip(
+                keywords, self._map(lambda kw: self._search_keyword(kw, limit=20), keywords)
+            )
+
+        for keyword, results in batches:
+            if keyword is not None:
+                print(f"  Searching Semantic Scholar for: {keyword}")
 
             for result in results:
                 paper_id = result.get("paperId")
@@ -83,7 +120,7 @@ class SemanticScholarSource(DiscoverySource):
                 arxiv_id = external_ids.get("ArXiv")
                 canonical_id = doi or (f"arXiv:{arxiv_id}" if arxiv_id else paper_id)
 
-                if canonical_id in seen_ids:
+                if canonical_id in seen_ids or canonical_id in skip_ids:
                     continue
                 seen_ids.add(canonical_id)
                 seen_ids.add(paper_id)
@@ -91,13 +128,11 @@ class SemanticScholarSource(DiscoverySource):
                 author_list = result.get("authors", [])
                 author_names = [a.get("name", "") for a in author_list if a.get("name")]
 
-                matched_authors = []
-                for auth in authors:
-                    auth_lower = auth.lower()
-                    for name in author_names:
-                        if auth_lower in name.lower():
-                            matched_authors.append(auth)
-                            break
+                names_lower = [name.lower() for name in author_names]
+                matched_authors = [
+                    auth for auth, auth_lower in zip(authors, authors_lower)
+                    if any(auth_lower in name for name in names_lower)
+                ]
 
                 pdf_url = None
                 oa_pdf = result.get("openAccessPdf")
@@ -113,7 +148,9 @@ class SemanticScholarSource(DiscoverySource):
                     source=self.name,
                     source_url=result.get("url", ""),
                     pdf_url=pdf_url,
-                    matched_keywords=[keyword],
+                    matched_keywords=[keyword] if keyword is not None else matcher.match(
+                        f"{result.get('title') or ''} {result.get('abstract') or ''}"
+                    ),
                     matched_authors=matched_authors,
                 )
                 papers.append(paper)
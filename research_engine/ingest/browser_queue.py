@@ -10,27 +10,36 @@ This module generates a prioritized queue of DOIs to download via browser,
 and provides utilities for processing the downloaded PDFs.
 """
 
-import json
+import hashlib
 import os
-from collections import Counter
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..jsonio import dump_json, iter_references, load_json
+from .cloud_store import save_manifest, upload_pdf
+from .extract_text import extract_many, extracted_keys, list_pdfs
+
 # USyd EZProxy prefix
 EZPROXY_PREFIX = "https://ezproxy.library.sydney.edu.au/login?url="
 
 # DOI prefixes that are directly downloadable (no browser needed)
-DIRECT_DOWNLOAD_PREFIXES = {"10.1371", "10.48550"}  # PLOS, arXiv
+DIRECT_DOWNLOAD_PREFIXES = frozenset({"10.1371", "10.48550"})  # PLOS, arXiv
+
+UPLOAD_WORKERS = 8  # concurrent B2 uploads
+UPLOAD_BACKLOG = 16  # extracted PDFs waiting on upload before extraction pauses
+MANIFEST_SAVE_EVERY = 50  # uploads between manifest saves
 
 
 def _needs_browser(doi: str) -> bool:
     """Check if a DOI requires browser automation to download."""
-    prefix = doi.split("/")[0] if "/" in doi else ""
-    if prefix in DIRECT_DOWNLOAD_PREFIXES:
+    prefix, slash, _ = doi.partition("/")
+    if slash and prefix in DIRECT_DOWNLOAD_PREFIXES:
         return False
-    if "arxiv" in doi.lower():
-        return False
-    return True
+    # arXiv identifiers put "arxiv" at the front ("arXiv:2101.00001",
+    # "10.48550/arXiv.2101.00001"), so only the head needs lowering
+    return "arxiv" not in doi[:20].lower()
 
 
 def generate_queue(
@@ -56,56 +65,60 @@ def generate_queue(
         The queue dict
     """
     bib_path = data_dir / "bibliography.json"
-    with open(bib_path) as f:
-        data = json.load(f)
-    refs = data["references"]
-
-    text_dir = data_dir / "text"
+    existing = extracted_keys(data_dir / "text")
 
-    # Filter to refs needing browser download
+    # Filter to refs needing browser download as they stream in, so only
+    # the survivors are ever held in memory. With prioritize_depth1 they
+    # are bucketed by (depth, DOI prefix): depth 1 first, then batched by
+    # publisher, keeping bibliography order within each bucket.
     queue_refs = []
-    for r in refs:
+    buckets = defaultdict(list)
+    for r in iter_references(bib_path):
         doi = r.get("doi", "")
         if not doi:
             continue
-        cite_key = r.get("cite_key", "")
-        if (text_dir / f"{cite_key}.txt").exists():
+        if r.get("cite_key", "") in existing:
             continue
         if not _needs_browser(doi):
             continue
-        queue_refs.append(r)
+        if prioritize_depth1:
+            buckets[(r.get("depth", 1), doi.partition("/")[0])].append(r)
+        else:
+            queue_refs.append(r)
 
-    # Sort: depth 1 first, then by DOI prefix (batch by publisher)
     if prioritize_depth1:
-        queue_refs.sort(key=lambda r: (r.get("depth", 1), r.get("doi", "")))
+        queue_refs = [r for key in sorted(buckets) for r in buckets[key]]
 
     if limit > 0:
         queue_refs = queue_refs[:limit]
 
-    # Build queue entries with EZProxy URLs
+    # Build queue entries with EZProxy URLs, tallying depth and publisher
+    # prefix stats in the same pass
     entries = []
+    depth1 = depth2 = 0
+    prefix_counts = Counter()
     for r in queue_refs:
         doi = r["doi"]
         doi_url = f"https://doi.org/{doi}"
+        depth = r.get("depth", 1)
         entries.append({
             "cite_key": r["cite_key"],
             "doi": doi,
             "doi_url": doi_url,
             "ezproxy_url": f"{EZPROXY_PREFIX}{doi_url}",
             "title": r.get("title", "")[:100],
-            "depth": r.get("depth", 1),
+            "depth": depth,
         })
-
-    # Stats by publisher prefix
-    prefix_counts = Counter()
-    for e in entries:
-        prefix = e["doi"].split("/")[0]
-        prefix_counts[prefix] += 1
+        if depth == 1:
+            depth1 += 1
+        elif depth == 2:
+            depth2 += 1
+        prefix_counts[doi.partition("/")[0]] += 1
 
     queue = {
         "total": len(entries),
-        "depth1": sum(1 for e in entries if e["depth"] == 1),
-        "depth2": sum(1 for e in entries if e["depth"] == 2),
+        "depth1": depth1,
+        "depth2": depth2,
         "by_publisher": dict(prefix_counts.most_common(20)),
         "entries": entries,
     }
@@ -113,8 +126,7 @@ def generate_queue(
     if output_path is None:
         output_path = data_dir / "browser_queue.json"
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(queue, f, indent=2, ensure_ascii=False)
+    dump_json(queue, output_path)
 
     return queue
 
@@ -148,8 +160,7 @@ def write_queue(
     """Write a download queue file for browser-automated acquisition."""
     queue = generate_ezproxy_urls(refs, ezproxy_host)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(queue, f, indent=2)
+    dump_json(queue, output_path)
     return len(queue)
 
 
@@ -166,22 +177,25 @@ def process_downloaded_pdfs(
 
     PDF filenames should be {cite_key}.pdf.
 
+    SHA-256 digests of each processed PDF and its text are kept under
+    "hashes" in pdf_manifest.json. A PDF that already has text is skipped
+    unless its content, or its text file, changed since it was recorded;
+    a changed PDF is also re-uploaded.
+
     Args:
         data_dir: Path to literature-data directory
         download_dir: Directory containing downloaded PDFs
         upload_b2: Upload to B2 after text extraction
         verbose: Print progress
     """
-    from .extract_text import extract_text
-
     text_dir = data_dir / "text"
     text_dir.mkdir(parents=True, exist_ok=True)
+    existing = extracted_keys(text_dir)
 
     manifest_path = data_dir / "pdf_manifest.json"
     manifest = {"pdfs": {}}
     if manifest_path.exists():
-        with open(manifest_path) as f:
-            manifest = json.load(f)
+        manifest = load_json(manifest_path)
 
     b2_bucket = None
     if upload_b2:
@@ -196,37 +210,82 @@ def process_downloaded_pdfs(
     uploaded = 0
     failed = 0
 
-    for pdf_path in sorted(download_dir.glob("*.pdf")):
+    hashes = manifest.get("hashes", {})  # cite_key -> {"pdf": sha256, "text": sha256}
+    digests = {}
+    jobs = []
+    for pdf_path in list_pdfs(download_dir):
         cite_key = pdf_path.stem
         text_path = text_dir / f"{cite_key}.txt"
-
-        if text_path.exists():
-            continue
-
-        try:
-            extract_text(pdf_path, text_path)
-            extracted += 1
-            if verbose and extracted % 10 == 0:
-                print(f"  Extracted: {extracted}")
-        except Exception as e:
-            failed += 1
-            if verbose:
-                print(f"  Failed: {pdf_path.name}: {e}")
-            continue
-
-        if b2_bucket and cite_key not in manifest.get("pdfs", {}):
+        if cite_key in existing:
+            # Text with no recorded hashes has nothing to compare against,
+            # so it is skipped without reading the PDF
+            recorded = hashes.get(cite_key)
+            if recorded is None:
+                continue
+            digests[cite_key] = _file_sha256(pdf_path)
+            if (recorded["pdf"] == digests[cite_key]
+                    and recorded["text"] == _file_sha256(text_path)):
+                continue
+        jobs.append((pdf_path, text_path))
+
+    # Extraction runs on a process pool. As each PDF's text comes back it
+    # is queued for upload on a thread pool, or deleted if there is nothing
+    # to upload. Finished uploads are collected between extractions, so
+    # uploaded PDFs are deleted as the run goes; at most UPLOAD_BACKLOG
+    # wait on disk before extraction holds off for the uploader. The
+    # manifest is kept in memory and saved in batches.
+    # A PDF's new hashes are recorded only once its upload succeeds (or
+    # none was needed), so a failed re-upload still reads as changed and
+    # is retried the next time the PDF is processed.
+    manifest.setdefault("pdfs", {})
+    uploads = {}  # future -> (pdf_path, cite_key, new hashes)
+
+    def finish(done):
+        nonlocal uploaded
+        for future in done:
+            pdf_path, cite_key, new_hashes = uploads.pop(future)
             try:
-                from .cloud_store import upload_pdf, update_manifest
-                file_id = upload_pdf(pdf_path, cite_key, bucket=b2_bucket)
-                update_manifest(manifest_path, cite_key, file_id, doi="")
-                with open(manifest_path) as f:
-                    manifest = json.load(f)
+                manifest["pdfs"][cite_key] = {"file_id": future.result(), "doi": ""}
+                hashes[cite_key] = new_hashes
                 uploaded += 1
+                if uploaded % MANIFEST_SAVE_EVERY == 0:
+                    save_manifest(manifest_path, manifest)
             except Exception:
                 pass
+            pdf_path.unlink()
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as uploader:
+        for (pdf_path, text_path), error in zip(jobs, extract_many(jobs)):
+            finish([f for f in uploads if f.done()])
+            cite_key = pdf_path.stem
+            if error is not None:
+                failed += 1
+                if verbose:
+                    print(f"  Failed: {pdf_path.name}: {error}")
+                continue
+            extracted += 1
+            if verbose and extracted % 10 == 0:
+                print(f"  Extracted: {extracted}")
+
+            digest = digests.get(cite_key) or _file_sha256(pdf_path)
+            pdf_changed = cite_key in hashes and hashes[cite_key]["pdf"] != digest
+            new_hashes = {"pdf": digest, "text": _file_sha256(text_path)}
+
+            if b2_bucket and (pdf_changed or cite_key not in manifest["pdfs"]):
+                future = uploader.submit(upload_pdf, pdf_path, cite_key, bucket=b2_bucket)
+                uploads[future] = (pdf_path, cite_key, new_hashes)
+                if len(uploads) >= UPLOAD_BACKLOG:
+                    finish(wait(uploads, return_when=FIRST_COMPLETED).done)
+            else:
+                hashes[cite_key] = new_hashes
+                # Delete local PDF after processing
+                pdf_path.unlink()
 
-        # Delete local PDF after processing
-        pdf_path.unlink()
+        finish(as_completed(list(uploads)))
+
+    if extracted:
+        manifest["hashes"] = hashes
+        save_manifest(manifest_path, manifest)
 
     if verbose:
         print(f"\n  Extracted: {extracted}")
@@ -236,3 +295,12 @@ def process_downloaded_pdfs(
             print(f"  Uploaded to B2: {uploaded}")
 
     return extracted
+
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
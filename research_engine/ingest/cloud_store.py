@@ -1,15 +1,24 @@
 """Cloud storage for PDFs via Backblaze B2."""
 
-import json
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+from ..jsonio import dump_json, load_json
+
+# Authorized bucket handles by (key ID, bucket name). Authorizing costs a
+# round trip to the B2 API, so each process pays it once per bucket.
+_buckets: Dict[Tuple[str, str], object] = {}
+_buckets_lock = threading.Lock()
 
 
 def get_b2_bucket(bucket_name: str = "md3-storage"):
     """Get a B2 bucket handle.
 
-    Requires B2_APPLICATION_KEY_ID and B2_APPLICATION_KEY env vars.
+    Requires B2_APPLICATION_KEY_ID and B2_APPLICATION_KEY env vars. The
+    handle is authorized on first use and reused by later calls, including
+    from other threads.
     """
     try:
         from b2sdk.v2 import InMemoryAccountInfo, B2Api
@@ -24,11 +33,15 @@ def get_b2_bucket(bucket_name: str = "md3-storage"):
             "B2 credentials required. Set B2_APPLICATION_KEY_ID and B2_APPLICATION_KEY env vars."
         )
 
-    info = InMemoryAccountInfo()
-    b2_api = B2Api(info)
-    b2_api.authorize_account("production", key_id, key)
+    with _buckets_lock:
+        bucket = _buckets.get((key_id, bucket_name))
+        if bucket is None:
+            info = InMemoryAccountInfo()
+            b2_api = B2Api(info)
+            b2_api.authorize_account("production", key_id, key)
+            bucket = _buckets[(key_id, bucket_name)] = b2_api.get_bucket_by_name(bucket_name)
 
-    return b2_api.get_bucket_by_name(bucket_name)
+    return bucket
 
 
 def upload_pdf(
@@ -81,8 +94,7 @@ def update_manifest(
 ) -> None:
     """Update the PDF manifest tracking what's in B2."""
     if manifest_path.exists():
-        with open(manifest_path) as f:
-            manifest = json.load(f)
+        manifest = load_json(manifest_path)
     else:
         manifest = {"pdfs": {}}
 
@@ -91,5 +103,13 @@ def update_manifest(
         "doi": doi,
     }
 
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    save_manifest(manifest_path, manifest)
+
+
+def save_manifest(manifest_path: Path, manifest: Dict) -> None:
+    """Write a whole manifest, e.g. after a batch of uploads.
+
+    dump_json() replaces the file atomically, so an interrupted write never
+    leaves a truncated manifest.
+    """
+    dump_json(manifest, manifest_path)
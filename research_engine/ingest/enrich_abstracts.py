@@ -8,7 +8,9 @@ Batch: up to 50 DOIs per request via pipe-delimited filter.
 """
 
 import json
-import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -17,32 +19,53 @@ try:
 except ImportError:
     raise ImportError("'requests' package required.")
 
+from ..bib.cache import ResponseCache, cache_key
+from ..jsonio import dump_json, dumps_line, iter_references, load_json, loads
+from ..net import RateLimiter, get_with_retry, make_session
+
 OPENALEX_API = "https://api.openalex.org/works"
 MAILTO = "itod2305@uni.sydney.edu.au"
 BATCH_SIZE = 50  # Max DOIs per OpenAlex request
 RATE_LIMIT_DELAY = 0.12  # ~8 req/sec, stay in polite pool
+CACHE_FILE = "openalex_cache.sqlite"  # DOIs OpenAlex had no abstract for
+MISS_TTL_DAYS = 30  # OpenAlex backfills abstracts, so retry misses monthly
+MAX_WORKERS = 4  # batch requests in flight, throttled by the shared limiter
+ABSTRACT_JOURNAL = "abstract_journal.jsonl"  # abstracts found but not yet merged
 
 
 def _reconstruct_abstract(inverted_index: dict) -> str:
     """Reconstruct abstract text from OpenAlex inverted index."""
     if not inverted_index:
         return ""
-    words = {}
+    # Place each word at its positions directly: O(n), no dict or sort
+    size = max((max(ps) for ps in inverted_index.values() if ps), default=-1) + 1
+    slots: List[Optional[str]] = [None] * size
     for word, positions in inverted_index.items():
         for pos in positions:
-            words[pos] = word
-    return " ".join(words[i] for i in sorted(words.keys()))
+            slots[pos] = word
+    return " ".join(word for word in slots if word is not None)
+
+
+@lru_cache(maxsize=None)
+def _shared_session() -> requests.Session:
+    """Keep-alive session for fetch_abstracts_batch() calls without one."""
+    return make_session(f"research-engine/0.1.0 (mailto:{MAILTO})", pool_size=MAX_WORKERS)
 
 
 def fetch_abstracts_batch(
     dois: List[str],
-    session: requests.Session,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> Dict[str, str]:
     """Fetch abstracts for a batch of DOIs from OpenAlex.
 
     Args:
         dois: List of DOIs (max 50)
-        session: requests Session
+        session: requests Session (default: a shared keep-alive session)
+        limiter: Shared rate limiter, when called from a thread pool
+        cache: If given, DOIs the response had no abstract for are recorded
+            as misses (see is_known_miss); failed requests record nothing
 
     Returns:
         Dict mapping DOI (lowercase) -> abstract text
@@ -54,8 +77,10 @@ def fetch_abstracts_batch(
     doi_filter = "|".join(dois[:BATCH_SIZE])
 
     try:
-        resp = session.get(
+        resp = get_with_retry(
+            session or _shared_session(),
             OPENALEX_API,
+            limiter=limiter,
             params={
                 "filter": f"doi:{doi_filter}",
                 "select": "doi,abstract_inverted_index",
@@ -65,7 +90,7 @@ def fetch_abstracts_batch(
         )
         if resp.status_code != 200:
             return {}
-        data = resp.json()
+        data = loads(resp.content)
     except (requests.RequestException, json.JSONDecodeError):
         return {}
 
@@ -79,31 +104,64 @@ def fetch_abstracts_batch(
             if abstract:
                 results[doi_clean] = abstract
 
+    if cache:
+        for doi in dois[:BATCH_SIZE]:
+            if doi.lower() not in results:
+                cache.put(_miss_key(doi), True)
+
     return results
 
 
+def _miss_key(doi: str) -> str:
+    return cache_key("openalex-abstract-miss", doi.lower())
+
+
+def is_known_miss(doi: str, cache: ResponseCache) -> bool:
+    """Whether OpenAlex had no abstract for doi within the cache's TTL."""
+    return cache.get(_miss_key(doi)) is not None
+
+
 def enrich_bibliography(
     data_dir: Path,
     limit: int = 0,
     verbose: bool = True,
+    use_cache: bool = True,
 ) -> int:
     """Enrich bibliography.json with abstracts from OpenAlex.
 
     Only processes refs that have DOIs and don't already have abstracts.
 
+    Abstracts are appended to ABSTRACT_JOURNAL as each batch comes back
+    and merged into bibliography.json at the end, so an interrupted run
+    loses nothing and the next run only queries what is still missing.
+    The bibliography is rewritten only when new abstracts were found.
+
+    Unless use_cache is False, DOIs that OpenAlex had no abstract for are
+    remembered in CACHE_FILE for MISS_TTL_DAYS and not re-queried.
+
     Args:
         data_dir: Path to literature-data directory
         limit: Max refs to process (0 = all)
         verbose: Print progress
+        use_cache: Skip and record known misses
     """
     bib_path = data_dir / "bibliography.json"
-    with open(bib_path) as f:
-        data = json.load(f)
-
-    refs = data["references"]
-
-    # Filter to refs needing abstracts
-    need_abstract = [r for r in refs if r.get("doi") and not r.get("abstract")]
+    journal_path = data_dir / ABSTRACT_JOURNAL
+    found_abstracts = _load_journal(journal_path)  # cite_key -> abstract
+    if verbose and found_abstracts:
+        print(f"Resuming: {len(found_abstracts)} abstracts from an interrupted run ({journal_path.name})")
+
+    # Stream just the DOIs that need abstracts; the full bibliography is
+    # loaded only to merge the results back in
+    total_refs = 0
+    had_abstract = 0
+    need_abstract = []  # (cite_key, lowercased doi)
+    for r in iter_references(bib_path):
+        total_refs += 1
+        if r.get("abstract") or r["cite_key"] in found_abstracts:
+            had_abstract += 1
+        elif r.get("doi"):
+            need_abstract.append((r["cite_key"], r["doi"].lower()))
 
     if limit > 0:
         need_abstract = need_abstract[:limit]
@@ -112,73 +170,97 @@ def enrich_bibliography(
         print(f"\n{'='*60}")
         print("Abstract Enrichment via OpenAlex")
         print(f"{'='*60}")
-        print(f"  Total references:          {len(refs)}")
-        print(f"  Already have abstracts:    {sum(1 for r in refs if r.get('abstract'))}")
+        print(f"  Total references:          {total_refs}")
+        print(f"  Already have abstracts:    {had_abstract}")
         print(f"  Need abstracts (with DOI): {len(need_abstract)}")
 
-    session = requests.Session()
-    session.headers["User-Agent"] = f"research-engine/0.1.0 (mailto:{MAILTO})"
+    session = make_session(f"research-engine/0.1.0 (mailto:{MAILTO})", pool_size=MAX_WORKERS)
+    limiter = RateLimiter(1 / RATE_LIMIT_DELAY)
 
-    # Build DOI -> ref index for fast lookup
-    doi_to_refs = {}
-    for r in need_abstract:
-        doi_lower = r["doi"].lower()
-        if doi_lower not in doi_to_refs:
-            doi_to_refs[doi_lower] = []
-        doi_to_refs[doi_lower].append(r)
+    # Group cite keys by DOI, so a DOI shared by several refs is queried once
+    doi_to_keys = defaultdict(list)
+    for cite_key, doi_lower in need_abstract:
+        doi_to_keys[doi_lower].append(cite_key)
 
-    # Process in batches
-    all_dois = list(doi_to_refs.keys())
+    # Process in batches, skipping DOIs OpenAlex recently had nothing for
+    cache = ResponseCache(data_dir / CACHE_FILE, ttl_days=MISS_TTL_DAYS) if use_cache else None
+    all_dois = [d for d in doi_to_keys if not (cache and is_known_miss(d, cache))]
+    if verbose and len(all_dois) < len(doi_to_keys):
+        print(f"  Skipped (known misses):    {len(doi_to_keys) - len(all_dois)}")
     total_found = 0
     total_checked = 0
 
-    for i in range(0, len(all_dois), BATCH_SIZE):
-        batch = all_dois[i:i + BATCH_SIZE]
-        total_checked += len(batch)
-
-        time.sleep(RATE_LIMIT_DELAY)
-        abstracts = fetch_abstracts_batch(batch, session)
-        total_found += len(abstracts)
-
-        # Apply abstracts to refs
-        for doi_lower, abstract in abstracts.items():
-            for ref in doi_to_refs.get(doi_lower, []):
-                ref["abstract"] = abstract
-
-        if verbose and (i // BATCH_SIZE + 1) % 20 == 0:
-            print(f"  [{total_checked}/{len(all_dois)}] found: {total_found}")
+    batches = [all_dois[i:i + BATCH_SIZE] for i in range(0, len(all_dois), BATCH_SIZE)]
 
-    # Save
-    data["references"] = refs
-    data["metadata"]["refs_with_abstracts"] = sum(1 for r in refs if r.get("abstract"))
-
-    with open(bib_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Batches are fetched MAX_WORKERS at a time and journaled in order
+    _end_with_newline(journal_path)
+    with open(journal_path, "ab") as journal, \
+            ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(
+            lambda batch: fetch_abstracts_batch(batch, session, limiter=limiter, cache=cache),
+            batches,
+        )
+        for n, (batch, abstracts) in enumerate(zip(batches, results), 1):
+            total_checked += len(batch)
+            total_found += len(abstracts)
+
+            for doi_lower, abstract in abstracts.items():
+                for cite_key in doi_to_keys.get(doi_lower, []):
+                    found_abstracts[cite_key] = abstract
+                    journal.write(dumps_line({"cite_key": cite_key, "abstract": abstract}))
+            journal.flush()
+
+            if verbose and n % 20 == 0:
+                print(f"  [{total_checked}/{len(all_dois)}] found: {total_found}")
+    session.close()
+    if cache:
+        cache.close()
+
+    # Apply abstracts to refs and save
+    if found_abstracts:
+        data = load_json(bib_path)
+        refs = data["references"]
+        for r in refs:
+            if r["cite_key"] in found_abstracts:
+                r["abstract"] = found_abstracts[r["cite_key"]]
+        with_abstracts = sum(1 for r in refs if r.get("abstract"))
+        data["metadata"]["refs_with_abstracts"] = with_abstracts
+
+        dump_json(data, bib_path)
+        del data
+    else:
+        # Nothing new: leave bibliography.json as is and stream it for SQLite
+        refs = iter_references(bib_path)
+        with_abstracts = had_abstract
+    journal_path.unlink()
 
     if verbose:
         print(f"\n  Checked:    {total_checked}")
         print(f"  Found:      {total_found}")
         print(f"  Hit rate:   {100 * total_found // max(total_checked, 1)}%")
-        print(f"  Total with abstracts now: {data['metadata']['refs_with_abstracts']}")
-        print(f"  Saved to {bib_path}")
+        print(f"  Total with abstracts now: {with_abstracts}")
+        if found_abstracts:
+            print(f"  Saved to {bib_path}")
+        else:
+            print(f"  No new abstracts; {bib_path} unchanged")
 
     # Also update SQLite if it exists
     db_path = data_dir / "literature.db"
     if db_path.exists():
         try:
             import sqlite3
+            rows = [(r["abstract"], r["cite_key"]) for r in refs if r.get("abstract")]
             conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            updated = 0
-            for r in refs:
-                if r.get("abstract"):
-                    cursor.execute(
-                        "UPDATE refs SET abstract = ?, has_abstract = 1 WHERE cite_key = ?",
-                        (r["abstract"], r["cite_key"]),
-                    )
-                    updated += 1
-            conn.commit()
+            # The DB is derived from bibliography.json, so a commit need not
+            # wait for a full fsync
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with conn:  # one transaction for every row
+                conn.executemany(
+                    "UPDATE refs SET abstract = ?, has_abstract = 1 WHERE cite_key = ?",
+                    rows,
+                )
             conn.close()
+            updated = len(rows)
             if verbose:
                 print(f"  Updated {updated} rows in SQLite")
         except Exception as e:
@@ -186,3 +268,27 @@ def enrich_bibliography(
                 print(f"  SQLite update failed: {e}")
 
     return total_found
+
+
+def _load_journal(journal_path: Path) -> Dict[str, str]:
+    """Read abstracts journaled by an earlier run, skipping a torn last line."""
+    abstracts: Dict[str, str] = {}
+    if not journal_path.exists():
+        return abstracts
+    with open(journal_path, "rb") as f:
+        for line in f:
+            try:
+                entry = loads(line)
+            except json.JSONDecodeError:
+                continue
+            abstracts[entry["cite_key"]] = entry["abstract"]
+    return abstracts
+
+
+def _end_with_newline(path: Path) -> None:
+    """Start appends on a fresh line if a crash left a torn final line."""
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb+") as f:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
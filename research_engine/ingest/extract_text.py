@@ -1,18 +1,74 @@
 """PDF text extraction using PyMuPDF."""
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, Iterator, List, Optional, Tuple, Union
 
+PARALLEL_MIN_FILES = 4  # below this, process startup costs more than it saves
 
-def extract_text(pdf_path: Path, output_path: Optional[Path] = None) -> str:
+
+def extracted_keys(text_dir: Path) -> FrozenSet[str]:
+    """Cite keys that already have a .txt file in text_dir.
+
+    One directory scan replaces a stat() per reference. Scans are cached
+    by the directory's mtime, so repeat calls reuse the result until a
+    file is added or removed.
+    """
+    return file_stems(text_dir, ".txt")
+
+
+def file_stems(directory: Path, suffix: str) -> FrozenSet[str]:
+    """Names, minus `suffix`, of the entries in directory ending in it.
+
+    Empty if the directory doesn't exist. Cached like extracted_keys().
+    """
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return frozenset()
+    return _scan_stems(str(directory), suffix, mtime_ns)
+
+
+def list_pdfs(directory: Path) -> List[Path]:
+    """The .pdf files in directory, sorted by name, from one os.scandir."""
+    with os.scandir(directory) as entries:
+        names = [e.name for e in entries if e.name.endswith(".pdf") and e.is_file()]
+    names.sort()
+    return [directory / name for name in names]
+
+
+@lru_cache(maxsize=32)
+def _scan_stems(directory: str, suffix: str, mtime_ns: int) -> FrozenSet[str]:
+    with os.scandir(directory) as entries:
+        return frozenset(
+            e.name[:-len(suffix)] for e in entries if e.name.endswith(suffix)
+        )
+
+
+def _iter_pages(doc) -> Iterator[str]:
+    """Yield "--- Page N ---" blocks for each page that has text."""
+    for page_num in range(doc.page_count):
+        text = doc.load_page(page_num).get_text()
+        if text.strip():
+            yield f"--- Page {page_num + 1} ---\n{text}"
+
+
+def extract_text(pdf_path: Path, output_path: Optional[Path] = None) -> Union[str, Path]:
     """Extract text from a PDF file.
 
+    With output_path, pages are written to disk as they are extracted
+    rather than joined in memory first. The file is written under a
+    temporary name and renamed when complete, so a failed extraction
+    never leaves a partial .txt that looks finished.
+
     Args:
         pdf_path: Path to the PDF file
         output_path: Optional path to save extracted text
 
     Returns:
-        Extracted text as string
+        output_path if given, else the extracted text as a string
     """
     try:
         import fitz  # PyMuPDF
@@ -20,24 +76,57 @@ def extract_text(pdf_path: Path, output_path: Optional[Path] = None) -> str:
         raise ImportError("'PyMuPDF' package required. Install with: pip install PyMuPDF")
 
     doc = fitz.open(str(pdf_path))
+    try:
+        if not output_path:
+            return "\n\n".join(_iter_pages(doc))
 
-    pages = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        if text.strip():
-            pages.append(f"--- Page {page_num + 1} ---\n{text}")
-
-    doc.close()
-
-    full_text = "\n\n".join(pages)
-
-    if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(full_text)
-
-    return full_text
+        part_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.part")
+        try:
+            with open(part_path, "w", encoding="utf-8") as f:
+                for i, block in enumerate(_iter_pages(doc)):
+                    if i:
+                        f.write("\n\n")
+                    f.write(block)
+            os.replace(part_path, output_path)
+        finally:
+            if part_path.exists():
+                part_path.unlink()
+        return output_path
+    finally:
+        doc.close()
+
+
+def extract_job(job: Tuple[Path, Path]) -> Optional[str]:
+    """extract_text() for one (pdf_path, text_path); the error message or None.
+
+    A module-level function, so it can be submitted to a process pool.
+    """
+    pdf_path, text_path = job
+    try:
+        extract_text(pdf_path, text_path)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def extract_many(
+    jobs: List[Tuple[Path, Path]],
+    max_workers: Optional[int] = None,
+) -> Iterator[Optional[str]]:
+    """Extract each (pdf_path, text_path) job, across processes if worth it.
+
+    Parsing a PDF is CPU-bound, so jobs run on a pool of `max_workers`
+    processes (default: one per CPU) rather than threads. Yields, in job
+    order, None for each success or the error message for a failure;
+    callers can act on each result as it arrives.
+    """
+    if len(jobs) < PARALLEL_MIN_FILES or max_workers == 1:
+        yield from map(extract_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunksize = max(1, len(jobs) // (4 * (max_workers or os.cpu_count() or 1)))
+        yield from executor.map(extract_job, jobs, chunksize=chunksize)
 
 
 def extract_batch(
@@ -56,22 +145,21 @@ def extract_batch(
         Number of files processed
     """
     text_dir.mkdir(parents=True, exist_ok=True)
+    existing = extracted_keys(text_dir)
     processed = 0
 
-    for pdf_path in sorted(pdf_dir.glob("*.pdf")):
-        text_path = text_dir / f"{pdf_path.stem}.txt"
-
-        if text_path.exists():
-            continue
-
-        try:
-            extract_text(pdf_path, text_path)
+    jobs = [
+        (pdf_path, text_dir / f"{pdf_path.stem}.txt")
+        for pdf_path in list_pdfs(pdf_dir)
+        if pdf_path.stem not in existing
+    ]
+    for (pdf_path, _), error in zip(jobs, extract_many(jobs)):
+        if error is None:
             processed += 1
             if verbose:
                 print(f"  Extracted: {pdf_path.name}")
-        except Exception as e:
-            if verbose:
-                print(f"  Failed: {pdf_path.name}: {e}")
+        elif verbose:
+            print(f"  Failed: {pdf_path.name}: {error}")
 
     if verbose:
         print(f"\n  Processed {processed} PDFs")
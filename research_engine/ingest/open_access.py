@@ -11,20 +11,75 @@ PDF URLs that bypass Cloudflare/bot detection when accessed directly.
 """
 
 import json
+import os
 import re
-import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 try:
     import requests
 except ImportError:
     raise ImportError("'requests' package required. Install with: pip install requests")
+import urllib3
+
+from ..jsonio import loads
+from ..net import RateLimiter, get_with_retry, http_errors, make_client, make_session
 
 UNPAYWALL_API = "https://api.unpaywall.org/v2"
 NCBI_ID_CONVERTER = "https://www.ncbi.nlm.nih.gov/pmc/utils/idconv/v1.0/"
 MAILTO = "itod2305@uni.sydney.edu.au"
+USER_AGENT = f"research-engine/0.1.0 (mailto:{MAILTO})"
 RATE_LIMIT_DELAY = 0.2  # 5 req/sec for Unpaywall
+DOWNLOAD_DELAY = 0.2  # between PDF requests to one publisher host
+MAX_WORKERS = 16  # lookups and downloads in flight, throttled by the shared limiter
+COPY_BUFFER = 1 << 20  # bytes per read when streaming a PDF to disk
+
+_RE_ARXIV_ID = re.compile(r"arXiv\.(\d+\.\d+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def shared_session() -> requests.Session:
+    """Keep-alive session shared by the ingest stages.
+
+    Pooled for MAX_WORKERS threads, with dropped connections retried (see
+    net.make_session). ingest_main and acquire_oa_pdfs stream their PDF
+    downloads through it, so repeat requests to a publisher host reuse one
+    TLS connection. Unpaywall lookups default to shared_client() instead.
+    """
+    return make_session(USER_AGENT, pool_size=MAX_WORKERS)
+
+
+@lru_cache(maxsize=None)
+def shared_client():
+    """Client for Unpaywall lookups, kept apart from the download session.
+
+    Every lookup goes to one API host, so with HTTP/2 (see net.make_client)
+    the MAX_WORKERS in-flight requests multiplex over a single connection
+    instead of opening one each. PDF downloads stream from the raw urllib3
+    response and stay on shared_session().
+    """
+    return make_client(USER_AGENT, pool_size=MAX_WORKERS, timeout=15)
+
+
+# Process-wide limiters by host, shared by every thread and every call, so
+# concurrent lookups and downloads stay inside each host's limit
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _host_limiter(host: str, delay: float) -> RateLimiter:
+    """The RateLimiter for `host`, allowing one request per `delay` seconds."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter(1 / delay)
+    return limiter
 
 
 # --- Publisher-specific direct PDF URL builders ---
@@ -47,7 +102,7 @@ def _pmc_pdf(doi: str, session: requests.Session) -> Optional[str]:
         )
         if resp.status_code != 200:
             return None
-        data = resp.json()
+        data = loads(resp.content)
         records = data.get("records", [])
         if records and records[0].get("pmcid"):
             pmcid = records[0]["pmcid"]
@@ -59,11 +114,10 @@ def _pmc_pdf(doi: str, session: requests.Session) -> Optional[str]:
 
 def _arxiv_pdf(doi: str) -> Optional[str]:
     """arXiv papers: direct PDF."""
-    if "arxiv" in doi.lower():
-        # DOI format: 10.48550/arXiv.XXXX.XXXXX
-        m = re.search(r"arXiv\.(\d+\.\d+)", doi, re.IGNORECASE)
-        if m:
-            return f"https://arxiv.org/pdf/{m.group(1)}"
+    # DOI format: 10.48550/arXiv.XXXX.XXXXX
+    m = _RE_ARXIV_ID.search(doi)
+    if m:
+        return f"https://arxiv.org/pdf/{m.group(1)}"
     return None
 
 
@@ -112,13 +166,14 @@ def _royal_society_pdf(doi: str) -> Optional[str]:
     return None
 
 
-# Ordered list of publisher-specific strategies
+# Publisher-specific strategies by DOI prefix, so each DOI needs one dict
+# lookup rather than a call per strategy.
 # Only includes publishers confirmed to serve PDFs without Cloudflare gates.
 # bioRxiv, eLife, MDPI, PeerJ, PMC all return 403 from requests.
-PUBLISHER_STRATEGIES = [
-    _arxiv_pdf,
-    _plos_pdf,
-]
+PUBLISHER_STRATEGIES = {
+    "10.48550": _arxiv_pdf,
+    "10.1371": _plos_pdf,
+}
 
 
 def find_pdf_url(
@@ -137,10 +192,10 @@ def find_pdf_url(
         (url, source) where source is one of: 'publisher', 'pmc', 'unpaywall', or None if not found.
     """
     # 1. Publisher-specific direct URL (PLOS, arXiv — confirmed working)
-    for strategy in PUBLISHER_STRATEGIES:
-        url = strategy(doi)
-        if url:
-            return url, "publisher"
+    strategy = PUBLISHER_STRATEGIES.get(doi.partition("/")[0])
+    url = strategy(doi) if strategy else None
+    if url:
+        return url, "publisher"
 
     # 2. PMC (usually blocked by Cloudflare, disabled by default)
     if try_pmc:
@@ -150,7 +205,6 @@ def find_pdf_url(
 
     # 3. Unpaywall (URLs usually blocked by Cloudflare, disabled by default)
     if try_unpaywall:
-        time.sleep(RATE_LIMIT_DELAY)
         url = check_unpaywall(doi, session)
         if url:
             return url, "unpaywall"
@@ -158,27 +212,45 @@ def find_pdf_url(
     return None, ""
 
 
-def check_unpaywall(doi: str, session: Optional[requests.Session] = None) -> Optional[str]:
+def check_unpaywall(
+    doi: str,
+    session=None,
+    limiter: Optional[RateLimiter] = None,
+) -> Optional[str]:
     """Check Unpaywall for an open access PDF URL.
 
     Returns the best OA direct PDF URL, or None.
     Only returns url_for_pdf (not landing pages, which can't be downloaded).
+    `session` is an httpx Client or requests Session, by default
+    shared_client().
+    Requests go through `limiter`, by default the process-wide Unpaywall
+    limiter (5 req/sec).
     """
-    s = session or requests.Session()
+    s = session or shared_client()
+    if limiter is None:
+        limiter = _host_limiter(urlsplit(UNPAYWALL_API).netloc, RATE_LIMIT_DELAY)
 
     try:
-        resp = s.get(
+        resp = get_with_retry(
+            s,
             f"{UNPAYWALL_API}/{doi}",
+            limiter=limiter,
             params={"email": MAILTO},
             timeout=15,
         )
         if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-    except (requests.RequestException, json.JSONDecodeError):
+            data = {}
+        else:
+            resp.raise_for_status()
+            data = loads(resp.content)
+    except (*http_errors(), json.JSONDecodeError):
         return None
 
+    return _best_pdf_url(data)
+
+
+def _best_pdf_url(data: dict) -> Optional[str]:
+    """Pick the best url_for_pdf from an Unpaywall record."""
     # Collect all PDF URLs from all OA locations
     pdf_urls = []
 
@@ -208,37 +280,54 @@ def download_pdf(
     """Download a PDF from a URL and verify it's a real PDF.
 
     Returns True if successful, False otherwise. Cleans up on failure.
+    The PDF is written under a per-thread temporary name and renamed into
+    place once verified, so output_path never holds a partial download.
+    Requests to one host are spaced DOWNLOAD_DELAY apart across threads.
     """
+    part_path = output_path.with_name(f"{output_path.name}.{threading.get_ident()}.part")
     try:
-        resp = session.get(url, timeout=60, stream=True, allow_redirects=True)
-        resp.raise_for_status()
-
-        content_type = resp.headers.get("content-type", "")
-        is_pdf = (
-            "pdf" in content_type.lower()
-            or url.endswith(".pdf")
-            or "/pdf/" in url
-            or resp.url.endswith(".pdf")
-        )
-        if not is_pdf:
-            return False
-
-        with open(output_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        # Verify magic bytes
-        with open(output_path, "rb") as f:
-            header = f.read(5)
-        if header != b"%PDF-":
-            output_path.unlink()
-            return False
-
+        limiter = _host_limiter(urlsplit(url).netloc, DOWNLOAD_DELAY)
+        with get_with_retry(
+            session, url, limiter=limiter, timeout=60, stream=True, allow_redirects=True,
+        ) as resp:
+            resp.raise_for_status()
+
+            content_type = resp.headers.get("content-type", "")
+            is_pdf = (
+                "pdf" in content_type.lower()
+                or url.endswith(".pdf")
+                or "/pdf/" in url
+                or resp.url.endswith(".pdf")
+            )
+            if not is_pdf:
+                return False
+
+            # Verify magic bytes before touching the disk, so an HTML page
+            # served as a PDF is rejected without writing anything. The rest
+            # is copied from the raw stream in COPY_BUFFER reads;
+            # decode_content keeps gzip/deflate handled as iter_content() did.
+            resp.raw.decode_content = True
+            header = resp.raw.read(5)
+            if header != b"%PDF-":
+                return False
+
+            # Unbuffered, as in harvest's downloader: copyfileobj already
+            # hands the OS COPY_BUFFER-sized writes, so a file buffer would
+            # only add a copy per block
+            with open(part_path, "wb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                f.write(header)
+                shutil.copyfileobj(resp.raw, f, COPY_BUFFER)
+
+        os.replace(part_path, output_path)
         return True
 
-    except requests.RequestException:
-        if output_path.exists():
-            output_path.unlink()
+    # Reads from resp.raw raise urllib3's errors, which iter_content used
+    # to wrap in requests exceptions
+    except (requests.RequestException, urllib3.exceptions.HTTPError):
+        if part_path.exists():
+            part_path.unlink()
         return False
 
 
@@ -254,51 +343,51 @@ def acquire_oa_pdfs(
     Args:
         refs: List of reference dicts with 'doi' and 'cite_key' fields
         output_dir: Directory to save PDFs
-        session: requests Session
+        session: requests Session for lookups and downloads (default:
+            shared_client() for lookups, shared_session() for downloads)
         limit: Max to process (0 = all)
         verbose: Print progress
 
     Returns:
         Dict mapping cite_key -> local PDF path
     """
-    s = session or requests.Session()
-    s.headers.setdefault("User-Agent", f"research-engine/0.1.0 (mailto:{MAILTO})")
+    s = session or shared_session()
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with_doi = [r for r in refs if r.get("doi")]
-    if limit > 0:
-        with_doi = with_doi[:limit]
+    with_doi = list(islice((r for r in refs if r.get("doi")), limit if limit > 0 else None))
 
     if verbose:
         print(f"Checking Unpaywall for {len(with_doi)} references...")
 
-    acquired = {}
-    checked = 0
-    found = 0
-
-    for ref in with_doi:
-        checked += 1
-        if verbose and checked % 25 == 0:
-            print(f"  [{checked}/{len(with_doi)}] found: {found}")
-
-        time.sleep(RATE_LIMIT_DELAY)
-
-        pdf_url = check_unpaywall(ref["doi"], session=s)
+    def acquire(ref: Dict) -> Tuple[bool, Optional[Path]]:
+        """(found on Unpaywall, local PDF path if we have one)"""
+        pdf_url = check_unpaywall(ref["doi"], session=session)
         if not pdf_url:
-            continue
+            return False, None
 
-        found += 1
-        cite_key = ref["cite_key"]
+        pdf_path = output_dir / f"{ref['cite_key']}.pdf"
+        if pdf_path.exists() or download_pdf(pdf_url, pdf_path, s):
+            return True, pdf_path
+        return True, None
 
-        # Download the PDF
-        pdf_path = output_dir / f"{cite_key}.pdf"
-        if pdf_path.exists():
-            acquired[cite_key] = str(pdf_path)
-            continue
+    acquired = {}
+    checked = 0
+    found = 0
 
-        if download_pdf(pdf_url, pdf_path, s):
-            acquired[cite_key] = str(pdf_path)
+    # Lookups run MAX_WORKERS at a time; the shared per-host limiters keep
+    # the pool as a whole at Unpaywall's 5 req/sec and DOWNLOAD_DELAY per
+    # publisher
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for ref, (has_pdf, pdf_path) in zip(with_doi, executor.map(acquire, with_doi)):
+            checked += 1
+            if verbose and checked % 25 == 0:
+                print(f"  [{checked}/{len(with_doi)}] found: {found}")
+
+            if has_pdf:
+                found += 1
+            if pdf_path:
+                acquired[ref["cite_key"]] = str(pdf_path)
 
     if verbose:
         print(f"\n  Checked: {checked}")
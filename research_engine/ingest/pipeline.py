@@ -1,86 +1,117 @@
 """Ingest pipeline: OA acquisition + text extraction + optional B2 upload.
 
-Processes one reference at a time to keep disk usage minimal:
+Processes references as a stream to keep disk usage minimal:
   check Unpaywall → download PDF → extract text → upload B2 → delete local.
 """
 
-import json
-import time
-from collections import defaultdict
+import os
+import re
+import shutil
+from collections import defaultdict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait,
+)
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
+from ..jsonio import iter_references, load_json
+from .cloud_store import get_b2_bucket, save_manifest, upload_pdf
+from .extract_text import extract_job, extract_many, extracted_keys, file_stems, list_pdfs
+from .open_access import download_pdf, find_pdf_url, shared_session
 
-def _load_bibliography(data_dir: Path) -> list:
-    """Load references from bibliography.json."""
+MAX_WORKERS = 8  # references looked up and downloaded at once
+LOOKAHEAD = 2 * MAX_WORKERS  # downloads, or extractions, allowed to run ahead
+UPLOAD_WORKERS = 4  # concurrent B2 uploads
+UPLOAD_BACKLOG = 16  # uploads in flight before the ingest loop waits
+MANIFEST_SAVE_EVERY = 25  # uploads between manifest saves
+
+# The two path components after "highdimensional/" name the paper folder
+_RE_PAPER_FOLDER = re.compile(r"(?:^|/)highdimensional/([^/]+)/([^/]+)")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _bibliography_path(data_dir: Path) -> Path:
+    """data_dir's bibliography.json; FileNotFoundError if there is none."""
     bib_path = data_dir / "bibliography.json"
     if not bib_path.exists():
         raise FileNotFoundError(f"No bibliography.json found at {bib_path}")
-    with open(bib_path) as f:
-        data = json.load(f)
+    return bib_path
+
+
+def _load_bibliography(data_dir: Path) -> list:
+    """Load references from bibliography.json."""
+    data = load_json(_bibliography_path(data_dir))
     if isinstance(data, dict):
         return data.get("references", [])
     return data
 
 
+def _source_files(ref: dict) -> List[str]:
+    """A reference's source file paths (source_files, else source_file)."""
+    sources = ref.get("source_files")
+    if sources:
+        return sources
+    sf = ref.get("source_file")
+    return [sf] if sf else []
+
+
 def _filter_by_paper(refs: list, paper_filter: str) -> list:
     """Filter references to those from a specific paper folder."""
-    filtered = []
-    for r in refs:
-        sources = r.get("source_files", [])
-        if not sources:
-            sf = r.get("source_file", "")
-            if sf:
-                sources = [sf]
-        for sf in sources:
-            if paper_filter in sf:
-                filtered.append(r)
-                break
-    return filtered
+    return [r for r in refs if any(paper_filter in sf for sf in _source_files(r))]
 
 
 def _paper_folder(ref: dict) -> str:
     """Extract paper folder from a reference's source file path."""
-    sources = ref.get("source_files", [])
-    if not sources:
-        sf = ref.get("source_file", "")
-        if sf:
-            sources = [sf]
-    for sf in sources:
-        parts = sf.split("/")
-        for i, p in enumerate(parts):
-            if p == "highdimensional" and i + 2 < len(parts):
-                return parts[i + 1] + "/" + parts[i + 2]
+    for sf in _source_files(ref):
+        m = _RE_PAPER_FOLDER.search(sf)
+        if m:
+            return f"{m.group(1)}/{m.group(2)}"
     return "unknown"
 
 
-def _process_one_ref(
+def _map_ahead(fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+    """Run fn over items on a thread pool, yielding results in input order.
+
+    At most LOOKAHEAD calls are queued or finished ahead of the consumer,
+    so a slow consumer holds the workers back instead of letting their
+    results (downloaded PDFs) pile up on disk.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = deque(executor.submit(fn, item) for item in islice(items, LOOKAHEAD))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, 1):
+                pending.append(executor.submit(fn, item))
+            yield result
+
+
+def _download_one_ref(
     ref: dict,
     pdf_dir: Path,
     text_dir: Path,
-    manifest_path: Path,
-    manifest: dict,
     session,
-    b2_bucket,
 ) -> dict:
-    """Process a single reference: find PDF → download → extract → upload → delete.
+    """Network half of one reference: find PDF → download.
 
     Tries multiple sources: publisher-specific URLs, PMC, then Unpaywall.
-    Returns a stats dict.
+    Returns a stats dict; "pdf_path" is set when a PDF was downloaded.
+    Safe to run from several threads with one shared session.
     """
-    from .open_access import find_pdf_url, download_pdf
-
     stats = {
         "checked": 1, "found": 0, "downloaded": 0,
         "extracted": 0, "uploaded": 0, "failed": 0, "skipped_done": 0,
-        "source": "",
+        "source": "", "pdf_path": None,
     }
 
     cite_key = ref["cite_key"]
     doi = ref["doi"]
     text_path = text_dir / f"{cite_key}.txt"
 
-    # Already have text — skip entirely
+    # Already have text (e.g. a cite key listed twice) — skip entirely
     if text_path.exists():
         stats["skipped_done"] = 1
         return stats
@@ -99,34 +130,124 @@ def _process_one_ref(
         return stats
 
     stats["downloaded"] = 1
+    stats["pdf_path"] = pdf_path
+    return stats
 
-    # Step 3: Extract text
-    try:
-        from .extract_text import extract_text
-        extract_text(pdf_path, text_path)
-        stats["extracted"] = 1
-    except Exception as e:
+
+def _extract_ahead(
+    downloads: Iterable[Tuple[dict, dict]],
+    text_dir: Path,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[dict, dict, Optional[str]]]:
+    """Extract downloaded PDFs on a process pool, yielding in input order.
+
+    Takes (ref, stats) pairs from _download_one_ref and yields (ref, stats,
+    error), where error is extract_job()'s result: None on success, or when
+    no PDF was downloaded. Parsing is CPU-bound, so it runs in up to
+    `max_workers` processes (default: one per CPU) while later PDFs
+    download; up to LOOKAHEAD extractions run ahead of the consumer.
+    """
+    pending = deque()  # (ref, stats, future or None)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for ref, stats in downloads:
+            future = None
+            if stats["pdf_path"] is not None:
+                job = (stats["pdf_path"], text_dir / f"{ref['cite_key']}.txt")
+                future = executor.submit(extract_job, job)
+            pending.append((ref, stats, future))
+            while pending and (
+                len(pending) > LOOKAHEAD or pending[0][2] is None or pending[0][2].done()
+            ):
+                ref, stats, future = pending.popleft()
+                yield ref, stats, future.result() if future else None
+        for ref, stats, future in pending:
+            yield ref, stats, future.result() if future else None
+
+
+def _link_text(text_dir: Path, src_key: str, cite_keys: Iterable[str]) -> int:
+    """Give each of cite_keys that has no text the text of src_key.
+
+    Hard links, so a DOI cited under several keys is stored once; copies on
+    filesystems without them. Returns the number of files created.
+    """
+    src = text_dir / f"{src_key}.txt"
+    linked = 0
+    for key in cite_keys:
+        dst = text_dir / f"{key}.txt"
+        if dst.exists():
+            continue
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+        linked += 1
+    return linked
+
+
+def _keep_extracted_pdf(ref: dict, stats: dict, error: Optional[str]) -> Optional[Path]:
+    """Record one reference's extraction result (from _extract_ahead) in stats.
+
+    Returns the downloaded PDF if its text was extracted, for the caller to
+    upload or delete. A PDF whose extraction failed is deleted here.
+    """
+    pdf_path = stats["pdf_path"]
+    if pdf_path is None:
+        return None
+    if error is not None:
         stats["failed"] = 1
-        print(f"    extract failed: {cite_key}: {e}")
+        print(f"    extract failed: {ref['cite_key']}: {error}")
         if pdf_path.exists():
             pdf_path.unlink()
-        return stats
+        return None
+    stats["extracted"] = 1
+    return pdf_path
 
-    # Step 4: Upload to B2 (if configured)
-    if b2_bucket and cite_key not in manifest.get("pdfs", {}):
-        try:
-            from .cloud_store import upload_pdf, update_manifest
-            file_id = upload_pdf(pdf_path, cite_key, bucket=b2_bucket)
-            update_manifest(manifest_path, cite_key, file_id, doi=doi)
-            stats["uploaded"] = 1
-        except Exception:
-            pass
 
-    # Step 5: Delete local PDF (text is saved, PDF is in B2 or not needed locally)
-    if pdf_path.exists():
-        pdf_path.unlink()
+class _Uploads:
+    """B2 uploads on a thread pool, recorded in an in-memory manifest.
 
-    return stats
+    Each local PDF is deleted once its upload has finished, whether or not
+    it succeeded. At most UPLOAD_BACKLOG uploads are in flight; submit()
+    waits for one to finish beyond that. The manifest is saved every
+    MANIFEST_SAVE_EVERY uploads and by close(), rather than rewritten and
+    re-read after each one.
+    """
+
+    def __init__(self, bucket, manifest: dict, manifest_path: Path):
+        self.bucket = bucket
+        self.manifest = manifest
+        self.manifest_path = manifest_path
+        self.uploaded = 0
+        self._executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+        self._pending = {}  # future -> (pdf_path, cite_key, doi)
+        manifest.setdefault("pdfs", {})
+
+    def submit(self, pdf_path: Path, cite_key: str, doi: str) -> None:
+        self._collect([f for f in self._pending if f.done()])
+        future = self._executor.submit(upload_pdf, pdf_path, cite_key, bucket=self.bucket)
+        self._pending[future] = (pdf_path, cite_key, doi)
+        if len(self._pending) >= UPLOAD_BACKLOG:
+            self._collect(wait(self._pending, return_when=FIRST_COMPLETED).done)
+
+    def close(self) -> None:
+        """Wait for uploads still in flight and save the manifest."""
+        self._collect(as_completed(list(self._pending)))
+        self._executor.shutdown()
+        if self.uploaded:
+            save_manifest(self.manifest_path, self.manifest)
+
+    def _collect(self, done: Iterable[Future]) -> None:
+        for future in done:
+            pdf_path, cite_key, doi = self._pending.pop(future)
+            try:
+                self.manifest["pdfs"][cite_key] = {"file_id": future.result(), "doi": doi}
+                self.uploaded += 1
+                if self.uploaded % MANIFEST_SAVE_EVERY == 0:
+                    save_manifest(self.manifest_path, self.manifest)
+            except Exception:
+                pass
+            if pdf_path.exists():
+                pdf_path.unlink()
 
 
 def ingest_main(
@@ -135,11 +256,15 @@ def ingest_main(
     paper_filter: Optional[str] = None,
     skip_download: bool = False,
     upload_b2: bool = False,
+    workers: Optional[int] = None,
 ) -> int:
     """Run the ingest pipeline: per-ref OA acquisition + text extraction + B2.
 
-    Processes one reference at a time to keep disk usage minimal.
     For each DOI: check Unpaywall → download PDF → extract text → upload B2 → delete local.
+    Lookups and downloads for up to MAX_WORKERS references run at once on
+    a thread pool, and downloaded PDFs are extracted on a process pool
+    meanwhile; each is then handed to a pool of B2 uploads, or deleted, in
+    reference order, so only a few PDFs are on disk at a time.
 
     Args:
         data_dir: Path to literature-data directory
@@ -147,9 +272,8 @@ def ingest_main(
         paper_filter: Only process refs from this paper folder
         skip_download: Skip OA download, only extract text from existing PDFs
         upload_b2: Upload acquired PDFs to B2 after download (and delete local)
+        workers: Text extraction processes (default: one per CPU)
     """
-    import requests
-
     refs = _load_bibliography(data_dir)
     total = len(refs)
 
@@ -161,11 +285,18 @@ def ingest_main(
         print(f"Processing all {total} references")
 
     # Filter to refs with DOIs
-    with_doi = [r for r in refs if r.get("doi")]
-    print(f"  With DOIs: {len(with_doi)}")
+    # With a limit only the first `limit` matches are kept; the rest are
+    # counted for the summary line without building a second list
+    dois = (r for r in refs if r.get("doi"))
+    if limit > 0:
+        with_doi = list(islice(dois, limit))
+        n_doi = len(with_doi) + sum(1 for _ in dois)
+    else:
+        with_doi = list(dois)
+        n_doi = len(with_doi)
+    print(f"  With DOIs: {n_doi}")
 
     if limit > 0:
-        with_doi = with_doi[:limit]
         print(f"  Limited to: {limit}")
 
     pdf_dir = data_dir / "pdfs"
@@ -177,15 +308,14 @@ def ingest_main(
     manifest_path = data_dir / "pdf_manifest.json"
     manifest = {"pdfs": {}}
     if manifest_path.exists():
-        with open(manifest_path) as f:
-            manifest = json.load(f)
+        manifest = load_json(manifest_path)
 
     # Set up B2 if requested
-    b2_bucket = None
+    b2_bucket = uploads = None
     if upload_b2:
         try:
-            from .cloud_store import get_b2_bucket
             b2_bucket = get_b2_bucket()
+            uploads = _Uploads(b2_bucket, manifest, manifest_path)
             print(f"  B2 bucket connected: md3-storage")
         except Exception as e:
             print(f"  B2 setup failed: {e}")
@@ -194,37 +324,40 @@ def ingest_main(
 
     # Handle skip_download: just extract text from existing PDFs
     if skip_download:
-        existing_pdfs = list(pdf_dir.glob("*.pdf"))
+        existing_pdfs = list_pdfs(pdf_dir)
         print(f"\nSkipping download. Processing {len(existing_pdfs)} existing PDFs.")
         extracted = 0
-        for pdf_path in sorted(existing_pdfs):
+        # PDFs without text are extracted on a process pool, in order, as
+        # the loop reaches them
+        done = extracted_keys(text_dir)
+        jobs = [
+            (pdf_path, text_dir / f"{pdf_path.stem}.txt")
+            for pdf_path in existing_pdfs
+            if pdf_path.stem not in done
+        ]
+        needs_text = {pdf_path for pdf_path, _ in jobs}
+        results = extract_many(jobs, max_workers=workers)
+        doi_of = {r.get("cite_key"): r.get("doi", "") for r in refs}
+        for pdf_path in existing_pdfs:
             cite_key = pdf_path.stem
-            text_path = text_dir / f"{cite_key}.txt"
-            if not text_path.exists():
-                try:
-                    from .extract_text import extract_text
-                    extract_text(pdf_path, text_path)
+            if pdf_path in needs_text:
+                error = next(results)
+                if error is None:
                     extracted += 1
-                except Exception as e:
-                    print(f"  Failed: {pdf_path.name}: {e}")
-            if b2_bucket:
-                if cite_key not in manifest.get("pdfs", {}):
-                    try:
-                        from .cloud_store import upload_pdf, update_manifest
-                        file_id = upload_pdf(pdf_path, cite_key, bucket=b2_bucket)
-                        ref = next((r for r in refs if r.get("cite_key") == cite_key), {})
-                        update_manifest(manifest_path, cite_key, file_id, doi=ref.get("doi", ""))
-                        with open(manifest_path) as f:
-                            manifest = json.load(f)
-                    except Exception:
-                        pass
-                pdf_path.unlink()
+                else:
+                    print(f"  Failed: {pdf_path.name}: {error}")
+            if uploads:
+                if cite_key not in manifest["pdfs"]:
+                    uploads.submit(pdf_path, cite_key, doi_of.get(cite_key, ""))
+                else:
+                    pdf_path.unlink()
+        if uploads:
+            uploads.close()
         print(f"  Extracted: {extracted}")
         return 0
 
     # Main per-reference loop
-    session = requests.Session()
-    session.headers["User-Agent"] = "research-engine/0.1.0 (mailto:itod2305@uni.sydney.edu.au)"
+    session = shared_session()
 
     print(f"\n{'='*60}")
     print("Per-PDF Ingest: Unpaywall → Download → Extract → B2 → Delete")
@@ -232,28 +365,58 @@ def ingest_main(
 
     totals = {
         "checked": 0, "found": 0, "downloaded": 0,
-        "extracted": 0, "uploaded": 0, "failed": 0, "skipped_done": 0,
+        "extracted": 0, "uploaded": 0, "failed": 0, "skipped_done": 0, "linked": 0,
     }
     sources = {"publisher": 0, "pmc": 0, "unpaywall": 0}
 
-    for i, ref in enumerate(with_doi):
-        result = _process_one_ref(
-            ref, pdf_dir, text_dir, manifest_path, manifest, session, b2_bucket,
-        )
+    # Refs that already have text are counted here from one directory scan
+    # and never reach the worker pool. A DOI cited under several cite keys
+    # is looked up and downloaded once, for its first ref; the other keys
+    # are given hard links to its text.
+    done = extracted_keys(text_dir)
+    by_doi: Dict[str, List[dict]] = defaultdict(list)
+    for r in with_doi:
+        by_doi[r["doi"].lower()].append(r)
+    todo = []
+    for group in by_doi.values():
+        have = next((r["cite_key"] for r in group if r["cite_key"] in done), None)
+        if have is None:
+            todo.append(group[0])
+        else:
+            totals["linked"] += _link_text(text_dir, have, (r["cite_key"] for r in group))
+    totals["skipped_done"] = sum(r["cite_key"] in done for r in with_doi)
+    totals["checked"] = len(with_doi) - len(todo)
+    print(f"  Already have text: {totals['skipped_done']}")
+
+    downloads = _map_ahead(
+        lambda ref: _download_one_ref(ref, pdf_dir, text_dir, session), todo
+    )
+    extracted = _extract_ahead(zip(todo, downloads), text_dir, max_workers=workers)
+    for i, (ref, result, error) in enumerate(extracted):
+        pdf_path = _keep_extracted_pdf(ref, result, error)
+        if result.get("extracted"):
+            totals["linked"] += _link_text(
+                text_dir, ref["cite_key"], (r["cite_key"] for r in by_doi[ref["doi"].lower()])
+            )
+
+        # Upload to B2 (if configured), then delete the local PDF: text is
+        # saved, and the PDF is in B2 or not needed locally
+        if pdf_path is not None:
+            if uploads and ref["cite_key"] not in manifest["pdfs"]:
+                uploads.submit(pdf_path, ref["cite_key"], ref["doi"])
+            elif pdf_path.exists():
+                pdf_path.unlink()
 
         for k in totals:
             totals[k] += result.get(k, 0)
+        if uploads:
+            totals["uploaded"] = uploads.uploaded
         if result.get("source"):
             sources[result["source"]] = sources.get(result["source"], 0) + 1
 
-        # Reload manifest periodically (after uploads)
-        if result.get("uploaded") and manifest_path.exists():
-            with open(manifest_path) as f:
-                manifest = json.load(f)
-
         # Progress every 50 refs
         if (i + 1) % 50 == 0:
-            print(f"  [{i+1}/{len(with_doi)}] "
+            print(f"  [{i+1}/{len(todo)}] "
                   f"found:{totals['found']} "
                   f"dl:{totals['downloaded']} "
                   f"txt:{totals['extracted']} "
@@ -261,9 +424,13 @@ def ingest_main(
                   f"skip:{totals['skipped_done']} "
                   f"(pub:{sources['publisher']} pmc:{sources['pmc']} unp:{sources['unpaywall']})")
 
+    if uploads:
+        uploads.close()
+        totals["uploaded"] = uploads.uploaded
+
     # Summary
     total_pdfs_b2 = len(manifest.get("pdfs", {}))
-    total_text = len(list(text_dir.glob("*.txt")))
+    total_text = len(extracted_keys(text_dir))
     print(f"\n{'='*60}")
     print("Ingest Summary")
     print(f"{'='*60}")
@@ -275,6 +442,8 @@ def ingest_main(
     print(f"    via Unpaywall:      {sources['unpaywall']}")
     print(f"  Downloaded:           {totals['downloaded']}")
     print(f"  Text extracted:       {totals['extracted']}")
+    if totals['linked']:
+        print(f"  Linked duplicates:    {totals['linked']}")
     if totals['failed']:
         print(f"  Failed:               {totals['failed']}")
     print(f"  Uploaded to B2:       {totals['uploaded']}")
@@ -286,24 +455,50 @@ def ingest_main(
 
 
 def status_main(data_dir: Path, by_paper: bool = False) -> int:
-    """Show pipeline status."""
-    refs = _load_bibliography(data_dir)
-
-    depth1 = [r for r in refs if r.get("depth", 1) == 1]
-    depth2 = [r for r in refs if r.get("depth") == 2]
+    """Show pipeline status.
 
-    with_doi = [r for r in refs if r.get("doi")]
-    d1_doi = [r for r in depth1 if r.get("doi")]
-    d2_doi = [r for r in depth2 if r.get("doi")]
+    References are streamed from bibliography.json (see
+    jsonio.iter_references) and counted in one pass, so the bibliography
+    is never held in memory as a whole.
+    """
+    bib_path = _bibliography_path(data_dir)
 
     pdf_dir = data_dir / "pdfs"
     text_dir = data_dir / "text"
     readings_dir = data_dir / "readings"
     embed_dir = data_dir / "embeddings"
 
-    total_pdfs = len(list(pdf_dir.glob("*.pdf"))) if pdf_dir.exists() else 0
-    total_text = len(list(text_dir.glob("*.txt"))) if text_dir.exists() else 0
-    total_readings = len(list(readings_dir.glob("*.json"))) if readings_dir.exists() else 0
+    # One os.scandir per directory; the key sets are reused by --by-paper
+    pdf_keys = file_stems(pdf_dir, ".pdf")
+    text_keys = extracted_keys(text_dir)
+    total_pdfs = len(pdf_keys)
+    total_text = len(text_keys)
+    total_readings = len(file_stems(readings_dir, ".json"))
+
+    # Depth and DOI counts, and the depth-1 breakdown by paper when asked
+    # for, in one pass over the references
+    total_refs = depth1 = depth2 = with_doi = d1_doi = d2_doi = 0
+    paper_stats = defaultdict(lambda: {"total": 0, "doi": 0, "pdf": 0, "text": 0})
+    for r in iter_references(bib_path):
+        depth = r.get("depth", 1)
+        has_doi = bool(r.get("doi"))
+        total_refs += 1
+        with_doi += has_doi
+        if depth == 1:
+            depth1 += 1
+            d1_doi += has_doi
+            if by_paper:
+                stats = paper_stats[_paper_folder(r)]
+                cite_key = r["cite_key"]
+                stats["total"] += 1
+                stats["doi"] += has_doi
+                if cite_key in pdf_keys:
+                    stats["pdf"] += 1
+                if cite_key in text_keys:
+                    stats["text"] += 1
+        elif depth == 2:
+            depth2 += 1
+            d2_doi += has_doi
 
     has_embeddings = (embed_dir / "claims.npy").exists() if embed_dir.exists() else False
 
@@ -311,13 +506,13 @@ def status_main(data_dir: Path, by_paper: bool = False) -> int:
     print("Research Engine — Pipeline Status")
     print(f"{'='*60}")
 
-    print(f"\n  Depth-1 references:   {len(depth1)}")
-    print(f"    With DOIs:          {len(d1_doi)} ({100*len(d1_doi)//max(len(depth1),1)}%)")
+    print(f"\n  Depth-1 references:   {depth1}")
+    print(f"    With DOIs:          {d1_doi} ({100*d1_doi//max(depth1,1)}%)")
     if depth2:
-        print(f"  Depth-2 references:   {len(depth2)}")
-        print(f"    With DOIs:          {len(d2_doi)} ({100*len(d2_doi)//max(len(depth2),1)}%)")
-    print(f"  Total references:     {len(refs)}")
-    print(f"  Total with DOIs:      {len(with_doi)}")
+        print(f"  Depth-2 references:   {depth2}")
+        print(f"    With DOIs:          {d2_doi} ({100*d2_doi//max(depth2,1)}%)")
+    print(f"  Total references:     {total_refs}")
+    print(f"  Total with DOIs:      {with_doi}")
     print()
     print(f"  PDFs acquired:        {total_pdfs}")
     print(f"  Text extracted:       {total_text}")
@@ -325,8 +520,8 @@ def status_main(data_dir: Path, by_paper: bool = False) -> int:
     print(f"  Embeddings:           {'yes' if has_embeddings else 'no'}")
 
     # Coverage percentages
-    if len(with_doi) > 0:
-        print(f"\n  PDF coverage:         {total_pdfs}/{len(with_doi)} DOI refs ({100*total_pdfs//len(with_doi)}%)")
+    if with_doi > 0:
+        print(f"\n  PDF coverage:         {total_pdfs}/{with_doi} DOI refs ({100*total_pdfs//with_doi}%)")
     if total_pdfs > 0:
         print(f"  Text coverage:        {total_text}/{total_pdfs} PDFs ({100*total_text//max(total_pdfs,1)}%)")
 
@@ -335,25 +530,6 @@ def status_main(data_dir: Path, by_paper: bool = False) -> int:
         print("Breakdown by Paper (depth-1 only)")
         print(f"{'='*60}")
 
-        paper_stats = defaultdict(lambda: {"total": 0, "doi": 0, "pdf": 0, "text": 0})
-
-        pdf_keys = set()
-        if pdf_dir.exists():
-            pdf_keys = {p.stem for p in pdf_dir.glob("*.pdf")}
-        text_keys = set()
-        if text_dir.exists():
-            text_keys = {p.stem for p in text_dir.glob("*.txt")}
-
-        for r in depth1:
-            folder = _paper_folder(r)
-            paper_stats[folder]["total"] += 1
-            if r.get("doi"):
-                paper_stats[folder]["doi"] += 1
-            if r["cite_key"] in pdf_keys:
-                paper_stats[folder]["pdf"] += 1
-            if r["cite_key"] in text_keys:
-                paper_stats[folder]["text"] += 1
-
         # Filter out _archive papers and sort by total refs descending
         active_papers = {k: v for k, v in paper_stats.items() if not k.startswith("_archive")}
 
@@ -0,0 +1,112 @@
+"""JSON helpers for the bibliography database.
+
+bibliography.json can run to tens of MB once depth-2 references are
+harvested. load_json()/dump_json() use orjson when installed (several
+times faster, same indent=2 UTF-8 output) and fall back to the stdlib.
+Stages that only need to scan the file use iter_references(), which
+streams with ijson when installed; iter_items() does the same for any
+binary stream, such as an HTTP response body.
+
+dump_json() writes to a temporary file and renames it over the target, so
+a crash or Ctrl-C mid-write leaves the previous file intact rather than a
+truncated one that the next run can't parse.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize obj as one compact UTF-8 JSON line (for .jsonl files)."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_json(obj: Any, path: Path, indent: bool = True) -> None:
+    """Atomically write obj as UTF-8 JSON, indented by 2 spaces unless indent=False."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        data = json.dumps(
+            obj, indent=2 if indent else None, ensure_ascii=False
+        ).encode("utf-8")
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def iter_items(f: BinaryIO, prefix: str) -> Iterator[Any]:
+    """Yield the elements of the array at `prefix` in a JSON stream.
+
+    `prefix` uses ijson syntax: "results.item" is each element of the
+    top-level "results" array. Streams with ijson when installed, else
+    reads and parses the whole stream. Malformed JSON raises ValueError.
+    """
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is None:
+        data = loads(f.read())
+        for key in prefix.split(".")[:-1]:
+            data = data.get(key, []) if isinstance(data, dict) else []
+        yield from data
+        return
+
+    try:
+        yield from ijson.items(f, prefix, use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"invalid JSON: {e}") from e
+
+
+def iter_references(bib_path: Path) -> Iterator[dict]:
+    """Yield reference dicts from bibliography.json one at a time.
+
+    Accepts both the {"metadata": ..., "references": [...]} layout and a
+    bare list of references.
+    """
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is None:
+        data = load_json(bib_path)
+        refs = data.get("references", []) if isinstance(data, dict) else data
+        yield from refs
+        return
+
+    with open(bib_path, "rb") as f:
+        first = f.read(1 << 10).lstrip()[:1]
+        f.seek(0)
+        prefix = "item" if first == b"[" else "references.item"
+        yield from ijson.items(f, prefix, use_float=True)
@@ -0,0 +1,205 @@
+"""Shared HTTP plumbing: pooled sessions and a thread-safe rate limiter.
+
+Network-bound stages (depth-2 harvesting, DOI resolution, OA acquisition)
+run requests from a small thread pool. They share one session so
+connections are kept alive, and one RateLimiter so the pool as a whole
+stays inside each API's polite-pool limits.
+
+make_client() returns an httpx client (HTTP/2 when h2 is installed, so the
+pool's in-flight requests multiplex over one connection) and falls back to
+a requests Session. Both expose the get()/status_code/content/headers
+subset used here; catch http_errors() rather than either library's base
+exception.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Mapping, Optional, Tuple, Type
+
+USER_AGENT = "research-engine/0.1.0 (mailto:itod2305@uni.sydney.edu.au)"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CONNECT_RETRIES = 3  # transport-level retries on connection failures
+
+
+class RateLimiter:
+    """Token bucket shared across threads.
+
+    Args:
+        rate: Sustained requests per second
+        burst: Max requests allowed back-to-back after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold off every worker for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Slow down to the server-advertised rate, if it is below ours.
+
+        Reads CrossRef-style X-Rate-Limit-Limit / X-Rate-Limit-Interval
+        (e.g. "50" per "1s"). Never raises the rate above the configured one.
+        """
+        limit = headers.get("X-Rate-Limit-Limit")
+        interval = headers.get("X-Rate-Limit-Interval", "1s")
+        try:
+            advertised = int(limit) / float(interval.rstrip("s"))
+        except (TypeError, ValueError, ZeroDivisionError):
+            return
+        if 0 < advertised < self.rate:
+            with self._lock:
+                self.rate = advertised
+
+
+def _retry_delay(resp, attempt: int) -> float:
+    """Seconds to wait before retrying, plus up to 50% random jitter.
+
+    Uses Retry-After (delta-seconds or an HTTP-date) if given, else 1s, 2s,
+    4s... The jitter keeps clients that were throttled together from all
+    retrying at the same instant.
+    """
+    delay = float(2 ** attempt)
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    delay = max(delay, 0.0)
+    return delay + random.uniform(0, 0.5 * delay)
+
+
+def get_with_retry(
+    session,
+    url: str,
+    limiter: Optional[RateLimiter] = None,
+    retries: int = 3,
+    **kwargs,
+):
+    """GET with rate limiting and backoff on 429/5xx.
+
+    Retries up to `retries` attempts on RETRY_STATUSES, honouring
+    Retry-After. Returns the last response (the caller still checks the
+    status); network exceptions propagate to the caller.
+    """
+    for attempt in range(retries):
+        if limiter:
+            limiter.acquire()
+        resp = session.get(url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES or attempt == retries - 1:
+            if limiter:
+                limiter.update_from_headers(resp.headers)
+            return resp
+        delay = _retry_delay(resp, attempt)
+        resp.close()  # hand a streamed response's connection back to the pool
+        if limiter:
+            limiter.pause(delay)
+        else:
+            time.sleep(delay)
+    return resp
+
+
+def make_session(user_agent: str = USER_AGENT, pool_size: int = 8):
+    """Create a requests Session sized for `pool_size` concurrent workers.
+
+    Dropped or refused connections are retried with a short backoff; HTTP
+    status retries are left to get_with_retry(), which shares the limiter.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except ImportError:
+        raise ImportError("'requests' package required. Install with: pip install requests")
+
+    session = requests.Session()
+    session.headers["User-Agent"] = user_agent
+    retry = Retry(total=CONNECT_RETRIES, backoff_factor=0.3, status_forcelist=())
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def make_client(user_agent: str = USER_AGENT, pool_size: int = 8, timeout: float = 30.0):
+    """Create an httpx Client for `pool_size` workers, or a requests Session.
+
+    HTTP/2 is enabled when the h2 package is available (pip install
+    'httpx[http2]'); otherwise httpx speaks HTTP/1.1 with a keep-alive pool.
+    Failed connection attempts are retried by the transport.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return make_session(user_agent, pool_size=pool_size)
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    # Pool and protocol settings go on the transport; a Client given a
+    # transport ignores its own http2/limits arguments
+    transport = httpx.HTTPTransport(
+        http2=http2,
+        retries=CONNECT_RETRIES,
+        limits=httpx.Limits(
+            max_keepalive_connections=pool_size, max_connections=pool_size * 2
+        ),
+    )
+    return httpx.Client(
+        transport=transport,
+        headers={"User-Agent": user_agent},
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def http_errors() -> Tuple[Type[Exception], ...]:
+    """Base exception classes of whichever HTTP clients are installed."""
+    errors = []
+    try:
+        import httpx
+        errors.append(httpx.HTTPError)
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors.append(requests.RequestException)
+    except ImportError:
+        pass
+    if not errors:
+        raise ImportError("'httpx' package required. Install with: pip install httpx")
+    return tuple(errors)
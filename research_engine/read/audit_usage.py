@@ -1,9 +1,10 @@
 """Audit citation usage: compare what a paper is cited for vs what it actually says."""
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..jsonio import dump_json
+
 
 def audit_citation(
     cite_key: str,
@@ -44,5 +45,4 @@ Paper text:
 def save_audit_report(audits: List[Dict], output_path: Path) -> None:
     """Save audit results."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(audits, f, indent=2, ensure_ascii=False)
+    dump_json(audits, output_path)
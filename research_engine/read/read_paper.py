@@ -9,10 +9,11 @@ readings of papers from extracted text. The output format captures:
 - Relevance to the research program
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..jsonio import dump_json, load_json
+
 
 def create_reading_prompt(text: str, context: str = "") -> str:
     """Create a prompt for structured reading of a paper.
@@ -46,13 +47,11 @@ Paper text:
 def save_reading(reading: Dict, output_path: Path) -> None:
     """Save a structured reading to JSON."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(reading, f, indent=2, ensure_ascii=False)
+    dump_json(reading, output_path)
 
 
 def load_reading(reading_path: Path) -> Optional[Dict]:
     """Load a structured reading from JSON."""
     if not reading_path.exists():
         return None
-    with open(reading_path) as f:
-        return json.load(f)
+    return load_json(reading_path)
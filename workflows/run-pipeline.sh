@@ -46,12 +46,7 @@ run_depth2() {
         python3 -m research_engine depth2 "$DATA_DIR" --limit "$BATCH_SIZE"
 
         # Check if there are more to harvest
-        HARVESTED=$(python3 -c "
-import json
-with open('$DATA_DIR/depth2_harvest_log.json') as f:
-    log = json.load(f)
-print(len(log['harvested_dois']))
-")
+        HARVESTED=$(sort -u "$DATA_DIR/depth2_harvested.txt" | wc -l)
         echo ""
         echo "Papers harvested so far: $HARVESTED"
 
@@ -71,13 +66,22 @@ print(sum(1 for r in refs if r.get('doi') and r.get('depth', 1) == 1))
         echo "Continuing... ($HARVESTED / $TOTAL)"
         echo ""
 
-        # Commit progress after each batch
+        # Commit progress after each batch (new refs are in the sidecar)
         cd "$DATA_DIR"
-        git add bibliography.json depth2_harvest_log.json
+        git add depth2_refs.jsonl depth2_harvested.txt depth2_stats.json
+        git rm -q --cached --ignore-unmatch depth2_harvest_log.json
         git commit -m "Depth-2 batch: $HARVESTED/$TOTAL papers harvested" || true
         git push origin main || true
         cd -
     done
+
+    # Merge the sidecar into bibliography.json once, at the end
+    python3 -m research_engine depth2 "$DATA_DIR" --finalize
+    cd "$DATA_DIR"
+    git add -A bibliography.json depth2_refs.jsonl depth2_harvested.txt depth2_stats.json
+    git commit -m "Depth-2: finalize harvested refs into bibliography" || true
+    git push origin main || true
+    cd -
 }
 
 run_ingest() {
@@ -86,7 +90,7 @@ run_ingest() {
 
     # Commit results (text files + manifest, PDFs are in B2)
     cd "$DATA_DIR"
-    git add bibliography.json text/ depth2_harvest_log.json pdf_manifest.json
+    git add bibliography.json text/ depth2_harvested.txt depth2_stats.json pdf_manifest.json
     git commit -m "Ingest: $(ls text/ | wc -l) text files, PDFs in B2" || true
     git push origin main || true
     cd -